@@ -0,0 +1,109 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+
+import generate_dir
+
+# Throughput cost of each durability mode of generate_dir.create_structure. The
+# project is emitted `--copies` times side by side into a fresh directory per run,
+# once per mode, and the median run is reported with its cost relative to the
+# first mode (none, by default). fsync costs depend entirely on the filesystem and
+# disk, so run it with --dir on the disk the builds use (on tmpfs every mode costs
+# the same).
+
+DEFAULT_OUTPUT = 'bench_durability.json'
+
+# The project structure repeated under copy0/, copy1/, ... so runs write enough
+# files to time reliably
+def scaled_structure(copies):
+    structure = generate_dir.build_project_structure(generate_dir.load_templates())
+    return {f"copy{i}": structure for i in range(copies)}
+
+def count_files(structure):
+    files = 0
+    size = 0
+    for kind, _, value in generate_dir.walk_structure(structure):
+        if kind == 'file':
+            files += 1
+            size += len(generate_dir.encode_content(value))
+    return files, size
+
+# Wall time of one fresh, non-incremental emit into a new directory under parent
+def time_run(parent, structure, mode, workers):
+    path = tempfile.mkdtemp(prefix='bench-', dir=parent)
+    try:
+        # Keep the per-file 'Created:' lines out of the timing and the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            generate_dir.create_structure(path, structure, workers=workers, durability=mode)
+            return time.perf_counter() - start
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the durability modes of the project generator.')
+    parser.add_argument('--dir', help='directory to emit into (default: the system temp directory)')
+    parser.add_argument('--copies', type=int, default=20,
+                        help='copies of the project emitted per run (default: 20)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per mode, median is kept (default: 5)')
+    parser.add_argument('--workers', type=int, default=generate_dir.DEFAULT_WORKERS,
+                        help=f"threads writing files (default: {generate_dir.DEFAULT_WORKERS})")
+    parser.add_argument('--modes', nargs='+', choices=generate_dir.DURABILITY_MODES,
+                        default=list(generate_dir.DURABILITY_MODES), help='modes to run (default: all)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help=f"JSON results file (default: {DEFAULT_OUTPUT})")
+    args = parser.parse_args(argv)
+
+    structure = scaled_structure(args.copies)
+    files, size = count_files(structure)
+    print(f"{files} files, {size / 1e6:.1f} MB per run, {args.workers} workers, "
+          f"in {args.dir or tempfile.gettempdir()}")
+
+    results = []
+    baseline = None
+    print(f"{'mode':<7} {'median ms':>10} {'files/s':>10} {'MB/s':>8} {'cost':>7}")
+    for mode in args.modes:
+        # One untimed run warms the page cache and the thread pool
+        time_run(args.dir, structure, mode, args.workers)
+        times = [time_run(args.dir, structure, mode, args.workers) for _ in range(args.repeat)]
+        seconds = statistics.median(times)
+        if baseline is None:
+            baseline = seconds
+        result = {
+            'mode': mode,
+            'seconds': seconds,
+            'runs': times,
+            'files_per_second': files / seconds,
+            'mb_per_second': size / 1e6 / seconds,
+            'relative': seconds / baseline,
+        }
+        results.append(result)
+        print(f"{mode:<7} {seconds * 1000:>10.1f} {result['files_per_second']:>10.0f} "
+              f"{result['mb_per_second']:>8.1f} {result['relative']:>6.1f}x")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'directory': os.path.abspath(args.dir or tempfile.gettempdir()),
+        'files': files,
+        'bytes': size,
+        'workers': args.workers,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"Results: {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+import pattern_engine
+
+# Differential benchmark for pattern generation. For k = 1..10 throws (the first k
+# of THROW_BUTTONS) and each length, it times the original brute-force generator of
+# patternGenerator.ts, ported below, against pattern_engine.generate_patterns, and
+# checks that both return exactly the same patterns. Results are written as JSON so
+# runs can be compared with --baseline.
+
+DEFAULT_OUTPUT = 'bench_results.json'
+# A generator is skipped for cases where it would build more strings than this
+DEFAULT_BUDGET = 2_000_000
+# An engine time this much slower than the baseline counts as a regression, for
+# cases long enough to time reliably
+REGRESSION_RATIO = 1.25
+REGRESSION_MIN_SECONDS = 0.001
+
+# Port of the brute-force PatternGenerator.generatePatterns: build every string of
+# `length` throws recursively, then keep each one unless a rotation of it was kept
+# already, and sort. The original counted length in characters (and never
+# terminated with two-character codes); this counts throws, as the app does now.
+def brute_force_patterns(throws, length):
+    if len(throws) == 0 or length <= 0:
+        return []
+
+    # Generate all possible permutations
+    all_patterns = {}
+
+    def generate_pattern(current_pattern, current_length):
+        if current_length == length:
+            all_patterns[current_pattern] = None
+            return
+        for throw_type in throws:
+            generate_pattern(current_pattern + throw_type, current_length + 1)
+
+    generate_pattern('', 0)
+
+    # Filter unique patterns (remove rotations)
+    unique_patterns = {}
+    for pattern in all_patterns:
+        rotations = (pattern[i:] + pattern[:i] for i in range(len(pattern)))
+        if not any(rotation in unique_patterns for rotation in rotations):
+            unique_patterns[pattern] = None
+
+    return sorted(unique_patterns)
+
+GENERATORS = {
+    'reference': brute_force_patterns,
+    'engine': pattern_engine.generate_patterns,
+}
+
+# Best wall time of `repeat` runs, and the output of the last run
+def time_generator(generate, throws, length, repeat):
+    best = None
+    patterns = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        patterns = generate(throws, length)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, patterns
+
+def run_case(k, length, budget, repeat):
+    throws = pattern_engine.THROW_CODES[:k]
+    cost = pattern_engine.estimate_cost(throws, length)
+    case = {
+        'throws': k,
+        'length': length,
+        'patterns': cost['patterns'],
+        'candidates': cost['candidates'],
+    }
+
+    outputs = {}
+    for name, generate in GENERATORS.items():
+        # The brute force visits every candidate; the engine only the patterns
+        work = cost['candidates'] if name == 'reference' else cost['patterns']
+        if work > budget:
+            case[name] = {'status': 'skipped'}
+            continue
+        seconds, patterns = time_generator(generate, throws, length, repeat)
+        outputs[name] = patterns
+        case[name] = {'status': 'ok', 'seconds': seconds}
+
+    if 'engine' in outputs and len(outputs['engine']) != cost['patterns']:
+        case['match'] = False
+    elif len(outputs) == len(GENERATORS):
+        case['match'] = outputs['reference'] == outputs['engine']
+        if case['engine']['seconds'] > 0:
+            case['speedup'] = case['reference']['seconds'] / case['engine']['seconds']
+    return case
+
+# Cases whose engine time grew by more than REGRESSION_RATIO since a baseline run
+def find_regressions(results, baseline):
+    previous = {(case['throws'], case['length']): case for case in baseline['results']}
+    regressions = []
+    for case in results:
+        before = previous.get((case['throws'], case['length']), {}).get('engine', {})
+        after = case['engine']
+        if (before.get('status') == 'ok' and after['status'] == 'ok'
+                and max(before['seconds'], after['seconds']) >= REGRESSION_MIN_SECONDS):
+            ratio = after['seconds'] / before['seconds']
+            if ratio > REGRESSION_RATIO:
+                regressions.append((case['throws'], case['length'], ratio))
+    return regressions
+
+def format_seconds(result):
+    return f"{result['seconds'] * 1000:.2f}" if result['status'] == 'ok' else '-'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark pattern generation against the brute-force reference.')
+    parser.add_argument('--max-throws', type=int, default=len(pattern_engine.THROW_CODES),
+                        help=f"largest throw count k (default: {len(pattern_engine.THROW_CODES)})")
+    parser.add_argument('--max-length', type=int, default=10, help='longest pattern length (default: 10)')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET,
+                        help=f"skip a generator when it would visit more strings than this "
+                             f"(default: {DEFAULT_BUDGET})")
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case, best is kept (default: 3)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help=f"JSON results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--baseline', help='earlier results file to check for regressions')
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'k':>2} {'n':>2} {'patterns':>12} {'reference ms':>13} {'engine ms':>10} {'speedup':>8}  match")
+    for k in range(1, args.max_throws + 1):
+        for length in range(1, args.max_length + 1):
+            case = run_case(k, length, args.budget, args.repeat)
+            results.append(case)
+            speedup = f"{case['speedup']:.1f}x" if 'speedup' in case else '-'
+            match = {True: 'yes', False: 'NO'}.get(case.get('match'), '-')
+            print(f"{k:>2} {length:>2} {case['patterns']:>12} {format_seconds(case['reference']):>13} "
+                  f"{format_seconds(case['engine']):>10} {speedup:>8}  {match}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'budget': args.budget,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"Results: {args.output}")
+
+    failed = False
+    mismatches = [(case['throws'], case['length']) for case in results if case.get('match') is False]
+    if mismatches:
+        failed = True
+        print(f"Output mismatch for (k, n): {mismatches}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f))
+        for k, length, ratio in regressions:
+            print(f"Regression: k={k} n={length} engine {ratio:.2f}x slower than {args.baseline}",
+                  file=sys.stderr)
+        failed = failed or bool(regressions)
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
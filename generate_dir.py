@@ -1,1403 +1,1771 @@
+import argparse
+import ctypes
+import errno
+import gzip
+import hashlib
+import io
 import os
 import json
+import re
+import mmap
+import select
+import shutil
+import struct
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from collections.abc import Mapping
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 
-# Define the project structure
-project_structure = {
-    "src": {
-        "app.css": """
-:root {
-  --primary-color: #3498db;
-  --primary-dark: #2980b9;
-  --text-color: #333;
-  --text-light: #7f8c8d;
-  --header-color: #2c3e50;
-  --background-color: #f5f5f5;
-  --card-background: #fff;
-  --completed-color: rgba(144, 238, 144, 0.5);
-  --border-color: #ddd;
-  --stripe-color: #f9f9f9;
-  
-  /* Spacing */
-  --spacing-xs: 0.25rem;
-  --spacing-sm: 0.5rem;
-  --spacing-md: 1rem;
-  --spacing-lg: 1.5rem;
-  --spacing-xl: 2rem;
-  
-  /* Font sizes */
-  --font-size-sm: 0.9rem;
-  --font-size-base: 1rem;
-  --font-size-md: 1.1rem;
-  --font-size-lg: 1.25rem;
-  --font-size-xl: 1.5rem;
-  --font-size-xxl: 2rem;
-  --font-size-xxxl: 3rem;
-  
-  /* Border radius */
-  --border-radius-sm: 0.25rem;
-  --border-radius-md: 0.5rem;
-  
-  /* Shadows */
-  --shadow-sm: 0 2px 4px rgba(0, 0, 0, 0.1);
-  --shadow-md: 0 4px 6px rgba(0, 0, 0, 0.1);
-}
+import pattern_engine
 
-* {
-  box-sizing: border-box;
-}
+# Template sources live in templates/, one file per emitted path. They are compiled
+# into a single pack file (a JSON offset table followed by the concatenated template
+# bytes) that is memory-mapped, so emitting a template only reads its own bytes and
+# importing this module does not build the whole project structure.
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+PACK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates.pack')
+PACK_MAGIC = b'JLTPACK1'
+# Overlays replace or add template files for optional project variants. Each is a
+# directory shaped like templates/ with a pack of its own next to it.
+OVERLAYS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template-overlays')
 
-html, body {
-  margin: 0;
-  padding: 0;
-  font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen,
-    Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
-  font-size: 16px;
-  line-height: 1.6;
-  color: var(--text-color);
-  background-color: var(--background-color);
-  -webkit-font-smoothing: antialiased;
-  -moz-osx-font-smoothing: grayscale;
-}
+# Specs next to the template sources run with the repository's vitest; generated
+# projects have no test runner, so they are not templates
+def is_template_source(name):
+    return not name.endswith(('.test.ts', '.spec.ts'))
 
-h1, h2, h3, h4, h5, h6 {
-  margin-top: 0;
-  line-height: 1.2;
-  color: var(--header-color);
-}
+# Packs and their temporary files: an overlay's pack is written inside OVERLAYS_DIR,
+# which watch mode also watches, so these are skipped as build output
+def is_pack_file(name):
+    return name.endswith('.pack') or (name.endswith('.tmp') and '.pack.' in name)
 
-a {
-  color: var(--primary-color);
-  text-decoration: none;
-}
+# Cheap fingerprint of the template sources (paths, sizes and mtimes, no contents)
+# used to tell whether the pack is stale
+def templates_fingerprint(templates_dir):
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(templates_dir):
+        dirnames.sort()
+        for filename in sorted(name for name in filenames
+                               if is_template_source(name) and not is_pack_file(name)):
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            rel_path = os.path.relpath(path, templates_dir).replace(os.sep, '/')
+            digest.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
 
-a:hover {
-  text-decoration: underline;
-}
+# Template paths in emission order: entries of each directory sorted by name
+def list_templates(templates_dir, prefix=''):
+    for name in sorted(os.listdir(templates_dir)):
+        path = os.path.join(templates_dir, name)
+        rel_path = f"{prefix}/{name}" if prefix else name
+        if os.path.isdir(path):
+            yield from list_templates(path, rel_path)
+        elif is_template_source(name):
+            yield rel_path, path
 
-button {
-  cursor: pointer;
-}
+# Compile templates/ into the pack. Contents are stored exactly as they are emitted
+# (stripped, UTF-8), so the pack can be used without the template sources.
+def build_template_pack(templates_dir=TEMPLATES_DIR, pack_path=PACK_PATH):
+    entries = []
+    blobs = []
+    offset = 0
+    for rel_path, path in list_templates(templates_dir):
+        with open(path, encoding='utf-8') as f:
+            data = f.read().strip().encode('utf-8')
+        entries.append([rel_path, offset, len(data)])
+        blobs.append(data)
+        offset += len(data)
 
-/* Mobile-first responsive design */
-@media (min-width: 768px) {
-  html, body {
-    font-size: 18px;
-  }
-}
+    index = json.dumps({
+        'fingerprint': templates_fingerprint(templates_dir),
+        'entries': entries
+    }, separators=(',', ':')).encode('utf-8')
 
-@media (min-width: 1024px) {
-  html, body {
-    font-size: 18px;
-  }
-}
-""",
-        "app.d.ts": """
-// See https://kit.svelte.dev/docs/types#app
-// for information about these interfaces
-declare global {
-	namespace App {
-		// interface Error {}
-		// interface Locals {}
-		// interface PageData {}
-		// interface Platform {}
-	}
-}
+    # Write next to the pack and rename, so a concurrent reader never maps a partial file
+    tmp_path = f"{pack_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PACK_MAGIC)
+        f.write(len(index).to_bytes(8, 'little'))
+        f.write(index)
+        for data in blobs:
+            f.write(data)
+    os.replace(tmp_path, pack_path)
 
-export {};
-""",
-        "app.html": """
-<!DOCTYPE html>
-<html lang="en">
-	<head>
-		<meta charset="utf-8" />
-		<meta name="description" content="JuggleLog - Track your juggling progress" />
-		<link rel="icon" href="%sveltekit.assets%/favicon.png" />
-		<meta name="viewport" content="width=device-width, initial-scale=1" />
-		%sveltekit.head%
-	</head>
-	<body data-sveltekit-preload-data="hover">
-		<div style="display: contents">%sveltekit.body%</div>
-	</body>
-</html>
-""",
-        "main.ts": """
-import './app.css';
-import App from './lib/components/App.svelte';
-
-const app = new App({
-  target: document.getElementById('app') || document.body,
-});
-
-export default app;
-""",
-        "routes": {
-            "+page.svelte": """
-<script lang="ts">
-  import App from '$lib/components/App.svelte';
-</script>
-
-<App />
-"""
-        },
-        "lib": {
-            "components": {
-                "App.svelte": """
-<script lang="ts">
-  import ControlPanel from './ControlPanel/ControlPanel.svelte';
-  import PatternTable from './PatternTable/PatternTable.svelte';
-  import { onMount } from 'svelte';
-  
-  // Track window size for responsive design
-  let windowWidth: number;
-  
-  // Listen for window resize
-  function handleResize() {
-    windowWidth = window.innerWidth;
-  }
-  
-  onMount(() => {
-    // Set initial window width
-    windowWidth = window.innerWidth;
-    
-    // Add resize listener
-    window.addEventListener('resize', handleResize);
-    
-    // Cleanup
-    return () => {
-      window.removeEventListener('resize', handleResize);
-    };
-  });
-</script>
-
-<svelte:window on:resize={handleResize} />
-
-<div class="app-container">
-  <header>
-    <h1>Juggle Log</h1>
-    <p class="subtitle">Track your juggling progress</p>
-  </header>
-  
-  <main>
-    <section class="table-section">
-      <PatternTable />
-    </section>
-    
-    <section class="control-section">
-      <ControlPanel />
-    </section>
-  </main>
-  
-  <footer>
-    <p>JuggleLog &copy; {new Date().getFullYear()}</p>
-  </footer>
-</div>
-
-<style>
-  :global(body) {
-    margin: 0;
-    padding: 0;
-    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen,
-      Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
-    line-height: 1.6;
-    color: #333;
-    background-color: #f5f5f5;
-  }
-  
-  .app-container {
-    max-width: 1200px;
-    margin: 0 auto;
-    padding: 2rem 1rem;
-  }
-  
-  header {
-    text-align: center;
-    margin-bottom: 2rem;
-  }
-  
-  h1 {
-    color: #2c3e50;
-    margin: 0;
-    font-size: 2.5rem;
-  }
-  
-  .subtitle {
-    color: #7f8c8d;
-    margin: 0.5rem 0 0 0;
-    font-size: 1.2rem;
-  }
-  
-  main {
-    display: flex;
-    flex-direction: column;
-    gap: 2rem;
-  }
-  
-  .table-section {
-    order: 2;
-  }
-  
-  .control-section {
-    order: 1;
-  }
-  
-  footer {
-    margin-top: 3rem;
-    text-align: center;
-    color: #7f8c8d;
-    font-size: 0.9rem;
-  }
-  
-  /* Responsive layout for larger screens */
-  @media (min-width: 1024px) {
-    main {
-      flex-direction: row;
-      align-items: flex-start;
-    }
-    
-    .table-section {
-      flex: 3;
-      order: 1;
-    }
-    
-    .control-section {
-      flex: 2;
-      order: 2;
-      position: sticky;
-      top: 2rem;
-    }
-    
-    h1 {
-      font-size: 3rem;
-    }
-    
-    .subtitle {
-      font-size: 1.5rem;
-    }
-  }
-</style>
-""",
-                "ControlPanel": {
-                    "ControlPanel.svelte": """
-<script lang="ts">
-  import ThrowButtons from './ThrowButtons.svelte';
-  import PatternLengthInput from './PatternLengthInput.svelte';
-</script>
-
-<div class="control-panel">
-  <h2>Juggling Controls</h2>
-  
-  <section class="throw-buttons-section">
-    <h3>Select Throw Types</h3>
-    <ThrowButtons />
-  </section>
-  
-  <section class="pattern-length-section">
-    <h3>Pattern Configuration</h3>
-    <PatternLengthInput />
-  </section>
-</div>
-
-<style>
-  .control-panel {
-    background-color: #f9f9f9;
-    border-radius: 0.5rem;
-    padding: 1.5rem;
-    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-  }
-  
-  h2 {
-    margin-top: 0;
-    margin-bottom: 1.5rem;
-    color: #2c3e50;
-    font-size: 1.5rem;
-  }
-  
-  h3 {
-    color: #34495e;
-    font-size: 1.2rem;
-    margin-bottom: 1rem;
-  }
-  
-  section {
-    margin-bottom: 2rem;
-  }
-  
-  section:last-child {
-    margin-bottom: 0;
-  }
-  
-  @media (min-width: 768px) {
-    h2 {
-      font-size: 1.8rem;
-    }
-    
-    h3 {
-      font-size: 1.4rem;
-    }
-  }
-</style>
-""",
-                    "PatternLengthInput.svelte": """
-<script lang="ts">
-  import { patternLength } from '$lib/stores/patternStore';
-  
-  // Minimum and maximum pattern length values
-  const MIN_LENGTH = 1;
-  const MAX_LENGTH = 10;
-  
-  // Handle input change
-  function handleInput(event: Event) {
-    const target = event.target as HTMLInputElement;
-    const value = parseInt(target.value, 10);
-    
-    // Update pattern length if within valid range
-    if (!isNaN(value) && value >= MIN_LENGTH && value <= MAX_LENGTH) {
-      patternLength.set(value);
-    }
-  }
-  
-  // Increment pattern length
-  function increment() {
-    patternLength.update(length => Math.min(length + 1, MAX_LENGTH));
-  }
-  
-  // Decrement pattern length
-  function decrement() {
-    patternLength.update(length => Math.max(length - 1, MIN_LENGTH));
-  }
-</script>
-
-<div class="pattern-length-container">
-  <label for="pattern-length">Pattern Length:</label>
-  <div class="input-group">
-    <button class="decrement" on:click={decrement} aria-label="Decrease pattern length">-</button>
-    <input 
-      id="pattern-length"
-      type="number"
-      min={MIN_LENGTH}
-      max={MAX_LENGTH}
-      bind:value={$patternLength}
-      on:input={handleInput}
-    />
-    <button class="increment" on:click={increment} aria-label="Increase pattern length">+</button>
-  </div>
-</div>
-
-<style>
-  .pattern-length-container {
-    display: flex;
-    align-items: center;
-    margin-bottom: 1rem;
-  }
-  
-  label {
-    font-weight: bold;
-    margin-right: 1rem;
-  }
-  
-  .input-group {
-    display: flex;
-    align-items: center;
-  }
-  
-  input {
-    width: 3rem;
-    text-align: center;
-    padding: 0.5rem;
-    border: 2px solid #ddd;
-    border-radius: 0.25rem;
-    font-size: 1rem;
-    -moz-appearance: textfield; /* Firefox */
-  }
-  
-  /* Remove arrow buttons in Chrome, Safari, Edge, Opera */
-  input::-webkit-outer-spin-button,
-  input::-webkit-inner-spin-button {
-    -webkit-appearance: none;
-    margin: 0;
-  }
-  
-  button {
-    background-color: #3498db;
-    color: white;
-    border: none;
-    border-radius: 0.25rem;
-    width: 2rem;
-    height: 2rem;
-    font-size: 1rem;
-    font-weight: bold;
-    cursor: pointer;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    margin: 0 0.5rem;
-  }
-  
-  button:hover {
-    background-color: #2980b9;
-  }
-  
-  @media (min-width: 768px) {
-    label, input, button {
-      font-size: 1.2rem;
-    }
-    
-    button {
-      width: 2.5rem;
-      height: 2.5rem;
-    }
-  }
-</style>
-""",
-                    "ThrowButtons.svelte": """
-<script lang="ts">
-  import { THROW_BUTTONS } from '$lib/types/types';
-  import { selectedThrows, toggleThrow } from '$lib/stores/patternStore';
-  
-  // Reactive variable to track which buttons are selected
-  $: selectedSet = $selectedThrows;
-  
-  // Handle button click
-  function handleThrowButtonClick(throwCode: string) {
-    toggleThrow(throwCode);
-  }
-</script>
-
-<div class="throw-buttons-container">
-  {#each THROW_BUTTONS as throwButton, i}
-    <button 
-      type="button"
-      class="throw-button" 
-      class:selected={selectedSet.has(throwButton.code)}
-      on:click={() => handleThrowButtonClick(throwButton.code)}
-      title={throwButton.name}
-    >
-      {throwButton.code}
-    </button>
-  {/each}
-</div>
-
-<style>
-  .throw-buttons-container {
-    display: grid;
-    grid-template-columns: repeat(4, 1fr);
-    gap: 0.5rem;
-    margin-bottom: 1rem;
-  }
-  
-  .throw-button {
-    background-color: white;
-    border: 2px solid #ddd;
-    border-radius: 0.25rem;
-    padding: 0.5rem;
-    font-size: 1rem;
-    cursor: pointer;
-    transition: all 0.2s ease;
-    font-weight: bold;
-  }
-  
-  .throw-button:hover {
-    background-color: #f5f5f5;
-    border-color: #aaa;
-  }
-  
-  .throw-button.selected {
-    background-color: #3498db;
-    color: white;
-    border-color: #2980b9;
-  }
-  
-  @media (min-width: 768px) {
-    .throw-button {
-      font-size: 1.2rem;
-      padding: 0.75rem;
-    }
-  }
-</style>
-"""
-                },
-                "PatternTable": {
-                    "PatternRow.svelte": """
-<script lang="ts">
-  import PatternSpinBox from './PatternSpinBox.svelte';
-  import type { PatternData } from '$lib/types/types';
-  
-  export let patternData: PatternData;
-  export let evenRow: boolean = false;
-</script>
-
-<tr class:even-row={evenRow} class:completed-row={patternData.isCompleted}>
-  <td class="pattern-name">{patternData.pattern}</td>
-  <td class="max-catches">
-    <PatternSpinBox pattern={patternData.pattern} />
-  </td>
-  <td class="completion-date">
-    {patternData.dateCompleted || ''}
-  </td>
-</tr>
-
-<style>
-  tr {
-    transition: background-color 0.2s ease;
-  }
-  
-  .even-row {
-    background-color: #f9f9f9;
-  }
-  
-  .completed-row {
-    background-color: rgba(144, 238, 144, 0.5); /* Light green */
-  }
-  
-  .completed-row.even-row {
-    background-color: rgba(144, 238, 144, 0.6); /* Slightly darker green for even rows */
-  }
-  
-  td {
-    padding: 0.75rem 1rem;
-    border-bottom: 1px solid #ddd;
-  }
-  
-  .pattern-name {
-    font-weight: bold;
-    font-family: monospace;
-    font-size: 1.1rem;
-  }
-  
-  .completion-date {
-    text-align: center;
-    color: #666;
-  }
-  
-  @media (max-width: 768px) {
-    td {
-      padding: 0.5rem;
-    }
-    
-    .pattern-name {
-      font-size: 0.9rem;
-    }
-  }
-</style>
-""",
-                    "PatternSpinBox.svelte": """
-<script lang="ts">
-  import { progressStore } from '$lib/stores/progressStore';
-  
-  export let pattern: string;
-  
-  // Get the initial value from the progress store
-  let catches = progressStore.getMaxCatches(pattern);
-  
-  // Define min and max values for catch counter
-  const MIN_CATCHES = 0;
-  const MAX_CATCHES = 100;
-  
-  // Update progress when value changes
-  function updateCatches() {
-    progressStore.setMaxCatches(pattern, catches);
-  }
-  
-  // Increment catches
-  function increment() {
-    if (catches < MAX_CATCHES) {
-      catches++;
-      updateCatches();
-    }
-  }
-  
-  // Decrement catches
-  function decrement() {
-    if (catches > MIN_CATCHES) {
-      catches--;
-      updateCatches();
-    }
-  }
-  
-  // Handle input change
-  function handleInput(event: Event) {
-    const target = event.target as HTMLInputElement;
-    const value = parseInt(target.value, 10);
-    
-    if (!isNaN(value)) {
-      catches = Math.max(MIN_CATCHES, Math.min(value, MAX_CATCHES));
-      updateCatches();
-    }
-  }
-</script>
-
-<div class="pattern-spin-box">
-  <button class="decrement" on:click={decrement} aria-label="Decrease max catches">-</button>
-  <input 
-    type="number"
-    min={MIN_CATCHES}
-    max={MAX_CATCHES}
-    bind:value={catches}
-    on:change={updateCatches}
-    on:input={handleInput}
-  />
-  <button class="increment" on:click={increment} aria-label="Increase max catches">+</button>
-</div>
-
-<style>
-  .pattern-spin-box {
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    width: 100%;
-  }
-  
-  input {
-    width: 3rem;
-    text-align: center;
-    padding: 0.4rem;
-    border: 1px solid #ddd;
-    border-radius: 0.25rem;
-    font-size: 0.9rem;
-    -moz-appearance: textfield; /* Firefox */
-  }
-  
-  /* Remove arrow buttons in Chrome, Safari, Edge, Opera */
-  input::-webkit-outer-spin-button,
-  input::-webkit-inner-spin-button {
-    -webkit-appearance: none;
-    margin: 0;
-  }
-  
-  button {
-    background-color: #3498db;
-    color: white;
-    border: none;
-    border-radius: 0.25rem;
-    width: 1.8rem;
-    height: 1.8rem;
-    font-size: 0.9rem;
-    font-weight: bold;
-    cursor: pointer;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    margin: 0 0.3rem;
-  }
-  
-  button:hover {
-    background-color: #2980b9;
-  }
-  
-  @media (min-width: 768px) {
-    input, button {
-      font-size: 1rem;
-    }
-    
-    input {
-      width: 3.5rem;
-    }
-    
-    button {
-      width: 2rem;
-      height: 2rem;
-    }
-  }
-</style>
-""",
-                    "PatternTable.svelte": """
-<script lang="ts">
-  import { onMount } from 'svelte';
-  import PatternRow from './PatternRow.svelte';
-  import { SortType, SortOrder } from '$lib/types/types';
-  import { patternDataList, sortConfig, updateSort } from '$lib/stores/patternStore';
-  import { derived } from 'svelte/store';
-  
-  // Get sorted pattern data
-  const sortedPatterns = derived(patternDataList, $patternDataList => $patternDataList);
-  
-  // Column headers
-  const columns = [
-    { id: SortType.Pattern, name: 'Pattern' },
-    { id: SortType.MaxCatches, name: 'Max Catches' },
-    { id: SortType.Date, name: 'Date Completed' }
-  ];
-  
-  // Handle header click for sorting
-  function handleHeaderClick(sortType: SortType) {
-    updateSort(sortType);
-  }
-  
-  // Get sort direction indicator
-  function getSortIndicator(columnType: SortType): string {
-    if ($sortConfig.sortType !== columnType) {
-      return '';
-    }
-    return $sortConfig.sortOrder === SortOrder.Ascending ? '↑' : '↓';
-  }
-</script>
-
-<div class="pattern-table-container">
-  <h2>Juggling Patterns</h2>
-  
-  {#if $sortedPatterns.length === 0}
-    <div class="empty-state">
-      <p>Select throw types to generate patterns</p>
-    </div>
-  {:else}
-    <div class="table-wrapper">
-      <table>
-        <thead>
-          <tr>
-            {#each columns as column}
-              <th 
-                class="sortable"
-                on:click={() => handleHeaderClick(column.id)}
-                class:active={$sortConfig.sortType === column.id}
-              >
-                {column.name} 
-                <span class="sort-indicator">{getSortIndicator(column.id)}</span>
-              </th>
-            {/each}
-          </tr>
-        </thead>
-        <tbody>
-          {#each $sortedPatterns as pattern, i (pattern.pattern)}
-            <PatternRow patternData={pattern} evenRow={i % 2 === 0} />
-          {/each}
-        </tbody>
-      </table>
-    </div>
-    
-    <div class="table-summary">
-      <p>Showing {$sortedPatterns.length} patterns</p>
-    </div>
-  {/if}
-</div>
-
-<style>
-  .pattern-table-container {
-    background-color: white;
-    border-radius: 0.5rem;
-    padding: 1.5rem;
-    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-  }
-  
-  h2 {
-    margin-top: 0;
-    margin-bottom: 1.5rem;
-    color: #2c3e50;
-    font-size: 1.5rem;
-  }
-  
-  .table-wrapper {
-    overflow-x: auto;
-    margin-bottom: 1rem;
-  }
-  
-  table {
-    width: 100%;
-    border-collapse: collapse;
-    font-size: 1rem;
-  }
-  
-  th {
-    text-align: left;
-    padding: 1rem;
-    background-color: #34495e;
-    color: white;
-    font-weight: normal;
-    position: sticky;
-    top: 0;
-  }
-  
-  th.sortable {
-    cursor: pointer;
-    user-select: none;
-    transition: background-color 0.2s;
-  }
-  
-  th.sortable:hover {
-    background-color: #2c3e50;
-  }
-  
-  th.active {
-    background-color: #2980b9;
-  }
-  
-  .sort-indicator {
-    display: inline-block;
-    margin-left: 0.5rem;
-    font-weight: bold;
-  }
-  
-  .empty-state {
-    background-color: #f9f9f9;
-    border-radius: 0.25rem;
-    padding: 2rem;
-    text-align: center;
-    color: #666;
-  }
-  
-  .table-summary {
-    text-align: right;
-    color: #666;
-    font-size: 0.9rem;
-  }
-  
-  @media (min-width: 768px) {
-    h2 {
-      font-size: 1.8rem;
-    }
-    
-    table {
-      font-size: 1.1rem;
-    }
-  }
-</style>
-"""
-                }
-            },
-            "stores": {
-                "patternStore.ts": """
-import { writable, derived, get } from 'svelte/store';
-import { PatternGenerator } from '../utils/patternGenerator';
-import { getPatternDataList } from './progressStore';
-import type { PatternData } from '../types/types';
-import { SortOrder, SortType } from '../types/types';
-
-// Store for selected throws
-export const selectedThrows = writable<Set<string>>(new Set());
-
-// Store for pattern length
-export const patternLength = writable<number>(3);
-
-// Derived store for generated patterns
-export const generatedPatterns = derived(
-  [selectedThrows, patternLength],
-  ([$selectedThrows, $patternLength]) => {
-    const throwArray = Array.from($selectedThrows).sort();
-    return PatternGenerator.generatePatterns(throwArray, $patternLength);
-  }
-);
-
-// Current sort config
-export const sortConfig = writable({
-  sortType: SortType.Pattern,
-  sortOrder: SortOrder.Ascending
-});
-
-// Derived store for pattern data with metadata (including sort)
-export const patternDataList = derived(
-  [generatedPatterns, sortConfig],
-  ([$generatedPatterns, $sortConfig]) => {
-    // First get the derived store for patterns with metadata
-    const dataStore = getPatternDataList($generatedPatterns);
-    
-    // Return another derived store that sorts the data
-    return derived(dataStore, ($dataStore) => {
-      const sortedData = [...$dataStore];
-      
-      // Sort data based on current sort configuration
-      sortedData.sort((a, b) => {
-        let comparison = 0;
-        
-        switch ($sortConfig.sortType) {
-          case SortType.Pattern:
-            comparison = a.pattern.localeCompare(b.pattern);
-            break;
-            
-          case SortType.MaxCatches:
-            comparison = a.maxCatches - b.maxCatches;
-            break;
-            
-          case SortType.Date:
-            // Handle null dates (put them at the end)
-            if (a.dateCompleted === null && b.dateCompleted === null) {
-              comparison = 0;
-            } else if (a.dateCompleted === null) {
-              comparison = 1;
-            } else if (b.dateCompleted === null) {
-              comparison = -1;
-            } else {
-              // Parse dates for comparison
-              const dateA = new Date(a.dateCompleted.replace(/-/g, '/'));
-              const dateB = new Date(b.dateCompleted.replace(/-/g, '/'));
-              comparison = dateA.getTime() - dateB.getTime();
-            }
-            break;
-        }
-        
-        // Apply sort order
-        return $sortConfig.sortOrder === SortOrder.Ascending ? 
-          comparison : -comparison;
-      });
-      
-      return sortedData;
-    });
-  }
-);
-
-// Helper functions to toggle throws
-export function toggleThrow(throwCode: string): void {
-  selectedThrows.update(throws => {
-    const newThrows = new Set(throws);
-    if (newThrows.has(throwCode)) {
-      newThrows.delete(throwCode);
-    } else {
-      newThrows.add(throwCode);
-    }
-    return newThrows;
-  });
-}
+class TemplatePack:
+    def __init__(self, pack_path=PACK_PATH):
+        with open(pack_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-// Update sort configuration
-export function updateSort(sortType: SortType): void {
-  sortConfig.update(config => {
-    if (config.sortType === sortType) {
-      // Toggle the order if the same column is clicked
-      return {
-        sortType,
-        sortOrder: config.sortOrder === SortOrder.Ascending 
-          ? SortOrder.Descending 
-          : SortOrder.Ascending
-      };
-    } else {
-      // New column, default to ascending
-      return {
-        sortType,
-        sortOrder: SortOrder.Ascending
-      };
-    }
-  });
-}
-""",
-                "progressStore.ts": """
-import { writable, derived, get } from 'svelte/store';
-import type { ProgressData, PatternData } from '../types/types';
-import { ProgressTracker } from '../utils/progressTracker';
-
-// Initialize progress store with data from localStorage
-const createProgressStore = () => {
-  const initialData = ProgressTracker.loadProgress();
-  const { subscribe, update, set } = writable<ProgressData>(initialData);
-
-  return {
-    subscribe,
-    /**
-     * Set max catches for a pattern and update completion status
-     */
-    setMaxCatches: (pattern: string, catches: number) => {
-      update(data => {
-        const updatedData = { ...data };
-        
-        // Check if this is a repeating pattern and update all related patterns
-        if (ProgressTracker.isRepeatingPattern(pattern)) {
-          const relatedPatterns = ProgressTracker.getRelatedPatterns(pattern);
-          
-          relatedPatterns.forEach(relatedPattern => {
-            // Update max catches
-            updatedData.maxCatches[relatedPattern] = catches;
-            
-            // Update completion status
-            if (catches >= 100) {
-              if (!updatedData.completedPatterns.includes(relatedPattern)) {
-                updatedData.completedPatterns.push(relatedPattern);
-              }
-              // Set completion date if not already set
-              if (!updatedData.completionDates[relatedPattern]) {
-                updatedData.completionDates[relatedPattern] = ProgressTracker.getCurrentDate();
-              }
-            } else {
-              // Remove from completed patterns
-              updatedData.completedPatterns = updatedData.completedPatterns.filter(
-                p => p !== relatedPattern
-              );
-              
-              // Remove completion date if catches is 0
-              if (catches === 0 && updatedData.completionDates[relatedPattern]) {
-                delete updatedData.completionDates[relatedPattern];
-              }
-            }
-          });
-        } else {
-          // Update single pattern
-          updatedData.maxCatches[pattern] = catches;
-          
-          if (catches >= 100) {
-            if (!updatedData.completedPatterns.includes(pattern)) {
-updatedData.completedPatterns.push(pattern);
-            }
-            // Set completion date if not already set
-            if (!updatedData.completionDates[pattern]) {
-              updatedData.completionDates[pattern] = ProgressTracker.getCurrentDate();
-            }
-          } else {
-            // Remove from completed patterns
-            updatedData.completedPatterns = updatedData.completedPatterns.filter(
-              p => p !== pattern
-            );
-            
-            // Remove completion date if catches is 0
-            if (catches === 0 && updatedData.completionDates[pattern]) {
-              delete updatedData.completionDates[pattern];
-            }
-          }
-        }
-        
-        // Save to localStorage
-        ProgressTracker.saveProgress(updatedData);
-        
-        return updatedData;
-      });
-    },
-    
-    /**
-     * Get completion status for a pattern
-     */
-    isCompleted: (pattern: string) => {
-      const data = get({ subscribe });
-      return data.maxCatches[pattern] >= 100;
-    },
-    
-    /**
-     * Get max catches for a pattern
-     */
-    getMaxCatches: (pattern: string) => {
-      const data = get({ subscribe });
-      return data.maxCatches[pattern] || 0;
-    },
-    
-    /**
-     * Get completion date for a pattern
-     */
-    getCompletionDate: (pattern: string) => {
-      const data = get({ subscribe });
-      return data.completionDates[pattern] || null;
+        if self._map[:len(PACK_MAGIC)] != PACK_MAGIC:
+            raise ValueError(f"{pack_path} is not a template pack")
+        index_start = len(PACK_MAGIC) + 8
+        index_length = int.from_bytes(self._map[len(PACK_MAGIC):index_start], 'little')
+        index = json.loads(self._map[index_start:index_start + index_length])
+        data_start = index_start + index_length
+
+        self.fingerprint = index['fingerprint']
+        self._compiled = {}
+        self.entries = {}
+        # Directory path ('' for the root) -> {child name: True if it is a directory}
+        self.children = {'': {}}
+        for rel_path, offset, length in index['entries']:
+            self.entries[rel_path] = (data_start + offset, length)
+            parts = rel_path.split('/')
+            for depth in range(len(parts)):
+                parent = '/'.join(parts[:depth])
+                is_dir = depth < len(parts) - 1
+                self.children.setdefault(parent, {})[parts[depth]] = is_dir
+                if is_dir:
+                    self.children.setdefault('/'.join(parts[:depth + 1]), {})
+
+    def read(self, rel_path):
+        offset, length = self.entries[rel_path]
+        return self._map[offset:offset + length]
+
+    # A template compiled for rendering, or its bytes when it has no placeholders.
+    # Each template is compiled once per pack and reused for every render.
+    def compiled(self, rel_path):
+        template = self._compiled.get(rel_path)
+        if template is None:
+            template = compile_template(rel_path, self.read(rel_path))
+            self._compiled[rel_path] = template
+        return template
+
+    def tree(self, rel_path='', variables=None):
+        return TemplateTree(self, rel_path, variables)
+
+# Read-only nested mapping over a pack with the same shape as a project structure
+# dict: directories map to TemplateTree, files to their bytes (read on access).
+# With `variables` the files are rendered with them (see render_templates).
+class TemplateTree(Mapping):
+    def __init__(self, pack, rel_path='', variables=None):
+        self._pack = pack
+        self._path = rel_path
+        self._variables = variables
+        self._children = pack.children[rel_path]
+
+    def __getitem__(self, name):
+        is_dir = self._children[name]
+        rel_path = f"{self._path}/{name}" if self._path else name
+        if is_dir:
+            return TemplateTree(self._pack, rel_path, self._variables)
+        if self._variables is None:
+            return self._pack.read(rel_path)
+        template = self._pack.compiled(rel_path)
+        return template if isinstance(template, bytes) else template.render(self._variables)
+
+    # The same tree rendered with template variables
+    def render(self, variables):
+        return TemplateTree(self._pack, self._path, variables)
+
+    def __iter__(self):
+        return iter(self._children)
+
+    def __len__(self):
+        return len(self._children)
+
+# Nested mapping that lays `extra` over `base`, merging directories present in both,
+# so generated files can be added to the (read-only) template tree without copying it
+class StructureOverlay(Mapping):
+    def __init__(self, base, extra):
+        self._base = base
+        self._extra = extra
+
+    def __getitem__(self, name):
+        if name not in self._extra:
+            return self._base[name]
+        value = self._extra[name]
+        base = self._base.get(name)
+        if isinstance(value, Mapping) and isinstance(base, Mapping):
+            return StructureOverlay(base, value)
+        return value
+
+    def __iter__(self):
+        yield from self._base
+        for name in self._extra:
+            if name not in self._base:
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+# Pack of a template directory: next to it, named after it (templates/ has
+# PACK_PATH, template-overlays/<name>/ has template-overlays/<name>.pack)
+def pack_path_for(templates_dir):
+    return os.path.normpath(os.path.abspath(templates_dir)) + '.pack'
+
+# Load the project structure from the pack, rebuilding the pack first when the
+# template sources are present and have changed since it was built
+def load_templates(templates_dir=TEMPLATES_DIR, pack_path=PACK_PATH):
+    if os.path.isdir(templates_dir):
+        fingerprint = templates_fingerprint(templates_dir)
+        pack = TemplatePack(pack_path) if os.path.exists(pack_path) else None
+        if pack is None or pack.fingerprint != fingerprint:
+            build_template_pack(templates_dir, pack_path)
+            pack = TemplatePack(pack_path)
+    else:
+        pack = TemplatePack(pack_path)
+    return pack.tree()
+
+# Templates are parameterized with {{ name }} placeholders, so project variants
+# (throw sets, the pattern length limit, the completion threshold, theme colours)
+# come from one template tree. Each template is split into literal chunks and
+# placeholder names once; rendering only joins bytes.
+PLACEHOLDER_RE = re.compile(rb'\{\{\s*([A-Za-z_]\w*)\s*\}\}')
+
+class CompiledTemplate:
+    def __init__(self, rel_path, data):
+        parts = PLACEHOLDER_RE.split(data)
+        self.rel_path = rel_path
+        self.literals = parts[0::2]
+        self.names = [name.decode('ascii') for name in parts[1::2]]
+
+    def render(self, variables):
+        chunks = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            try:
+                chunks.append(variables[name])
+            except KeyError:
+                raise ValueError(f"{self.rel_path}: unknown template parameter {name!r}") from None
+            chunks.append(literal)
+        return b''.join(chunks)
+
+# Templates without placeholders stay plain bytes, so rendering them costs nothing
+def compile_template(rel_path, data):
+    template = CompiledTemplate(rel_path, data)
+    return template if template.names else data
+
+# Parameters of the default project, exactly what the templates used to hard-code
+DEFAULT_PARAMS = {
+    'throw_buttons': [
+        {'code': 'S', 'name': 'Single'},
+        {'code': 'D', 'name': 'Double'},
+        {'code': 'L', 'name': 'Lazy'},
+        {'code': 'F', 'name': 'Flat'},
+        {'code': 'B', 'name': 'Behind the back'},
+        {'code': 'P', 'name': 'Penguin'},
+        {'code': 'O', 'name': 'Over the top'},
+        {'code': 'Od', 'name': 'Over the top double'},
+        {'code': 'Us', 'name': 'Under same leg'},
+        {'code': 'Uo', 'name': 'Under opposite leg'},
+    ],
+    'max_length': 10,
+    'completion_catches': 100,
+    'theme': {
+        'primary_color': '#3498db',
+        'primary_dark': '#2980b9',
+        'header_color': '#2c3e50',
+        'background_color': '#f5f5f5',
     },
-    
-    /**
-     * Reset store to initial state
-     */
-    reset: () => {
-      const emptyData: ProgressData = {
-        completedPatterns: [],
-        maxCatches: {},
-        completionDates: {}
-      };
-      
-      ProgressTracker.saveProgress(emptyData);
-      set(emptyData);
-    }
-  };
-};
-
-// Create and export the progress store
-export const progressStore = createProgressStore();
-
-// Derived store to get pattern data with metadata for a list of patterns
-export const getPatternDataList = (patterns: string[]) => {
-  return derived(progressStore, $progressStore => {
-    return patterns.map(pattern => {
-      const maxCatches = $progressStore.maxCatches[pattern] || 0;
-      const isCompleted = maxCatches >= 100;
-      const dateCompleted = $progressStore.completionDates[pattern] || null;
-      
-      return {
-        pattern,
-        maxCatches,
-        dateCompleted,
-        isCompleted
-      } as PatternData;
-    });
-  });
-};
-"""
-            },
-            "types": {
-                "types.ts": """
-// Define the throw types
-export type ThrowType = {
-  code: string;
-  name: string;
-};
-
-// Progress data structure
-export interface ProgressData {
-  completedPatterns: string[];
-  maxCatches: Record<string, number>;
-  completionDates: Record<string, string>;
+    # Base URL of a pattern_service.py instance; when set, the emitted patternStore.ts
+    # fetches pattern pages from it instead of generating them in the browser
+    'pattern_service_url': None,
 }
 
-// Pattern with metadata
-export interface PatternData {
-  pattern: string;
-  maxCatches: number;
-  dateCompleted: string | null;
-  isCompleted: boolean;
-}
+# Largest integer the app's pattern counts (doubles in patternCount.ts and the
+# rank/unrank code) hold exactly. Counting the patterns of n throws over k codes
+# sums terms up to n * k^n, which must stay within it.
+MAX_EXACT_COUNT = 2 ** 53
 
-// Sort order types
-export enum SortOrder {
-  Ascending = 'ascending',
-  Descending = 'descending'
-}
+# Longest pattern length n with n * k^n within MAX_EXACT_COUNT
+def longest_exact_length(k):
+    if k == 1:
+        return MAX_EXACT_COUNT
+    length = 1
+    while (length + 1) * k ** (length + 1) <= MAX_EXACT_COUNT:
+        length += 1
+    return length
 
-// Sort type for pattern table
-export enum SortType {
-  Pattern = 'pattern',
-  MaxCatches = 'maxCatches',
-  Date = 'date'
-}
+CSS_VALUE_RE = re.compile(r'[#\w(),.%\s-]+')
+SERVICE_URL_RE = re.compile(r'https?://[^\s\'"`\\]+')
 
-// Throw button definition
-export const THROW_BUTTONS: ThrowType[] = [
-  { code: "S", name: "Single" },
-  { code: "D", name: "Double" },
-  { code: "L", name: "Lazy" },
-  { code: "F", name: "Flat" },
-  { code: "B", name: "Behind the back" },
-  { code: "P", name: "Penguin" },
-  { code: "O", name: "Over the top" },
-  { code: "Od", name: "Over the top double" },
-  { code: "Us", name: "Under same leg" },
-  { code: "Uo", name: "Under opposite leg" },
-];
-"""
-            },
-            "utils": {
-                "patternGenerator.ts": """
-/**
- * Generates all unique juggling patterns from a set of throws with a given length
- */
-export class PatternGenerator {
-  /**
-   * Generate patterns from selected throws and desired length
-   * @param throws - Array of selected throw types
-   * @param length - Length of each pattern
-   * @returns Array of unique patterns
-   */
-  public static generatePatterns(throws: string[], length: number): string[] {
-    if (throws.length === 0 || length <= 0) {
-      return [];
-    }
+# True when some run of codes starts with text
+def starts_code_run(text, codes):
+    return any(code.startswith(text) or (text.startswith(code) and starts_code_run(text[len(code):], codes))
+               for code in codes)
 
-    // Generate all possible permutations
-    const allPatterns = new Set<string>();
-    
-    // Helper function to generate patterns recursively
-    const generatePattern = (currentPattern: string) => {
-      if (currentPattern.length === length) {
-        allPatterns.add(currentPattern);
-        return;
-      }
-      
-      for (const throwType of throws) {
-        generatePattern(currentPattern + throwType);
-      }
-    };
-    
-    generatePattern('');
-    
-    // Filter unique patterns (remove rotations)
-    const uniquePatterns = new Set<string>();
-    
-    allPatterns.forEach(pattern => {
-      // Check if any rotation is already in uniquePatterns
-      const isUnique = !Array.from({ length: pattern.length }, (_, i) => 
-        pattern.slice(i) + pattern.slice(0, i)
-      ).some(rotation => uniquePatterns.has(rotation));
-      
-      if (isUnique) {
-        uniquePatterns.add(pattern);
-      }
-    });
-    
-    return Array.from(uniquePatterns).sort();
-  }
-}
-""",
-                "progressTracker.ts": """
-import type { ProgressData } from '../types/types';
-
-export class ProgressTracker {
-  private static readonly MAX_PATTERN_LENGTH = 6;
-  
-  /**
-   * Extract the repeating base of a pattern
-   * For example:
-   * - 'OdOdOd' returns 'Od'
-   * - 'DDD' returns 'D'
-   */
-  public static extractRepeatingBase(pattern: string): string {
-    for (let length = 1; length <= Math.floor(pattern.length / 2); length++) {
-      const base = pattern.substring(0, length);
-      // Check if the pattern is just repetitions of this base
-      if (pattern === base.repeat(Math.floor(pattern.length / length))) {
-        return base;
-      }
-    }
-    return pattern; // If no repeating base is found, return the full pattern
-  }
-  
-  /**
-   * Check if a pattern consists of repeating substrings
-   */
-  public static isRepeatingPattern(pattern: string): boolean {
-    const base = this.extractRepeatingBase(pattern);
-    return pattern.length > base.length && 
-           pattern === base.repeat(Math.floor(pattern.length / base.length));
-  }
-  
-  /**
-   * Get all related patterns with the same base sequence
-   */
-  public static getRelatedPatterns(pattern: string): string[] {
-    const base = this.extractRepeatingBase(pattern);
-    const relatedPatterns: string[] = [];
-    
-    for (let length = 1; length <= this.MAX_PATTERN_LENGTH; length++) {
-      relatedPatterns.push(base.repeat(length));
-    }
-    
-    return relatedPatterns;
-  }
-  
-  /**
-   * Format the current date in M-D-YYYY format
-   */
-  public static getCurrentDate(): string {
-    const now = new Date();
-    const month = (now.getMonth() + 1).toString();
-    const day = now.getDate().toString();
-    const year = now.getFullYear().toString();
-    
-    return `${month}-${day}-${year}`;
-  }
-  
-  /**
-   * Save progress data to local storage
-   */
-  public static saveProgress(data: ProgressData): void {
-    localStorage.setItem('juggleLogProgress', JSON.stringify(data));
-  }
-  
-  /**
-   * Load progress data from local storage
-   */
-  public static loadProgress(): ProgressData {
-    const storedData = localStorage.getItem('juggleLogProgress');
-    
-    if (storedData) {
-      return JSON.parse(storedData) as ProgressData;
-    }
-    
-    // Return default empty data if nothing is stored
-    return {
-      completedPatterns: [],
-      maxCatches: {},
-      completionDates: {}
-    };
-  }
-}
-"""
-            }
-        }
+# A code and a longer code it starts that a pattern can also read as the code
+# followed by other throws (A and AB with B), or None. Patterns are tokenized by
+# longest match, so without such a pair every pattern reads exactly one way; O
+# and Od are fine because no code starts with d.
+def ambiguous_codes(codes):
+    for code in codes:
+        for other in codes:
+            if other != code and other.startswith(code) and starts_code_run(other[len(code):], codes):
+                return code, other
+    return None
+
+# Params from a JSON file (or dict) laid over DEFAULT_PARAMS, checked so that a
+# typo fails here instead of producing a broken project. `overrides` (such as
+# command line options) take precedence over the source.
+def load_params(source=None, overrides=None):
+    if isinstance(source, str):
+        with open(source, encoding='utf-8') as f:
+            source = json.load(f)
+    source = {**(source or {}), **(overrides or {})}
+
+    unknown = set(source) - set(DEFAULT_PARAMS)
+    unknown |= {f"theme.{key}" for key in set(source.get('theme', {})) - set(DEFAULT_PARAMS['theme'])}
+    if unknown:
+        raise ValueError(f"Unknown template parameters: {', '.join(sorted(unknown))}")
+
+    params = {**DEFAULT_PARAMS, **source, 'theme': {**DEFAULT_PARAMS['theme'], **source.get('theme', {})}}
+
+    codes = [button.get('code') for button in params['throw_buttons']]
+    if not codes or not all(isinstance(code, str) and code for code in codes):
+        raise ValueError('throw_buttons must be a non-empty list of {"code", "name"} objects')
+    if len(set(codes)) != len(codes):
+        raise ValueError('throw_buttons codes must be unique')
+    ambiguous = ambiguous_codes(codes)
+    if ambiguous:
+        code, other = ambiguous
+        raise ValueError(f"throw_buttons codes must read one way in a pattern: one starting {other!r} can also be "
+                         f"read as {code!r} followed by other throws")
+    for key in ('max_length', 'completion_catches'):
+        if not isinstance(params[key], int) or isinstance(params[key], bool) or params[key] < 1:
+            raise ValueError(f"{key} must be a positive integer")
+    longest = longest_exact_length(len(codes))
+    if params['max_length'] > longest:
+        raise ValueError(f"max_length {params['max_length']} is too long for {len(codes)} throws: "
+                         f"pattern counts would exceed 2^53, which the app cannot count exactly "
+                         f"(at most {longest})")
+    for key, value in params['theme'].items():
+        if not isinstance(value, str) or not CSS_VALUE_RE.fullmatch(value):
+            raise ValueError(f"theme.{key} must be a CSS colour, got {value!r}")
+    url = params['pattern_service_url']
+    if url is not None:
+        if not isinstance(url, str) or not SERVICE_URL_RE.fullmatch(url):
+            raise ValueError(f"pattern_service_url must be an http(s) URL, got {url!r}")
+        params['pattern_service_url'] = url.rstrip('/')
+    return params
+
+# Bytes substituted for each placeholder
+def template_variables(params):
+    throw_buttons = '\n'.join(
+        f"  {{ code: {json.dumps(button['code'])}, name: {json.dumps(button.get('name', button['code']))} }},"
+        for button in params['throw_buttons']
+    )
+    variables = {
+        'throw_buttons': throw_buttons,
+        'max_length': str(params['max_length']),
+        'completion_catches': str(params['completion_catches']),
+        'pattern_service_url': json.dumps(params['pattern_service_url'] or ''),
+        **params['theme'],
     }
-}
+    return {name: value.encode('utf-8') for name, value in variables.items()}
 
-# Create the root directory for the project
+def render_templates(templates, params=DEFAULT_PARAMS):
+    return templates.render(template_variables(params))
+
+# `project_structure` is still importable from this module, but is only loaded on
+# first access
+def __getattr__(name):
+    if name == 'project_structure':
+        return render_templates(load_templates())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Default root directory for the generated project
 root_dir = 'svelte-app'
-if not os.path.exists(root_dir):
-    os.makedirs(root_dir)
-
-# Function to create directories and files recursively
-def create_structure(base_path, structure):
-    for key, value in structure.items():
-        path = os.path.join(base_path, key)
-        
-        if isinstance(value, dict):
-            # If it's a dictionary, it's a directory
-            if not os.path.exists(path):
-                os.makedirs(path)
-            create_structure(path, value)
+
+# Manifest recording the content hash of every emitted file, relative to the root
+MANIFEST_NAME = '.scaffold-manifest.json'
+
+# Walk the nested structure depth-first, yielding directories before their contents.
+# With sort=True the entries of every directory are visited in name order.
+def walk_structure(structure, prefix='', sort=False):
+    for key in (sorted(structure) if sort else structure):
+        value = structure[key]
+        path = f"{prefix}/{key}" if prefix else key
+
+        if isinstance(value, Mapping):
+            yield 'dir', path, None
+            yield from walk_structure(value, path, sort)
         else:
-            # If it's a string, it's a file
-            with open(path, 'w') as f:
-                f.write(value.strip())
-            print(f"Created: {path}")
-
-# Create the project files
-create_structure(root_dir, project_structure)
-
-# Create the package.json file at the root level
-package_json = """
-{
-  "name": "juggle-log",
-  "version": "1.0.0",
-  "private": true,
-  "type": "module",
-  "scripts": {
-    "dev": "vite dev",
-    "build": "vite build",
-    "preview": "vite preview",
-    "check": "svelte-kit sync && svelte-check --tsconfig ./tsconfig.json",
-    "check:watch": "svelte-kit sync && svelte-check --tsconfig ./tsconfig.json --watch"
-  },
-  "devDependencies": {
-    "@sveltejs/adapter-auto": "^3.0.0",
-    "@sveltejs/kit": "^2.0.0",
-    "@sveltejs/vite-plugin-svelte": "^3.0.0",
-    "svelte": "^4.2.7",
-    "svelte-check": "^3.6.0",
-    "tslib": "^2.6.0",
-    "typescript": "^5.0.0",
-    "vite": "^5.0.3"
-  },
-  "dependencies": {}
-}
-"""
-
-svelte_config = """
-import adapter from '@sveltejs/adapter-auto';
-import { vitePreprocess } from '@sveltejs/vite-plugin-svelte';
-
-/** @type {import('@sveltejs/kit').Config} */
-const config = {
-    // Consult https://kit.svelte.dev/docs/integrations#preprocessors
-    // for more information about preprocessors
-    preprocess: vitePreprocess(),
-
-    kit: {
-        // adapter-auto only supports some environments, see https://kit.svelte.dev/docs/adapter-auto for a list.
-        // If your environment is not supported or you settled on a specific environment, switch out the adapter.
-        // See https://kit.svelte.dev/docs/adapters for more information about adapters.
-        adapter: adapter()
+            yield 'file', path, value
+
+# Bytes that end up on disk for a template; packed templates are already encoded
+def encode_content(value):
+    if isinstance(value, bytes):
+        return value
+    return value.strip().encode('utf-8')
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def load_manifest(base_path):
+    try:
+        with open(os.path.join(base_path, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(base_path, manifest):
+    with open(os.path.join(base_path, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+# Manifest entry of an emitted file: its content hash, and the size and mtime it
+# was left with on disk
+def manifest_record(path, digest):
+    stat = os.stat(path)
+    return {'hash': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+# A file can be skipped when the manifest hash matches and the file on disk still
+# has the size and mtime it was emitted with (a cheap guard against hand edits,
+# including ones that keep the size, and truncation). Entries of older manifests
+# hold only the hash, so their files are rewritten once.
+def is_unchanged(path, digest, previous):
+    if not isinstance(previous, dict) or previous.get('hash') != digest:
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_size == previous['size'] and stat.st_mtime_ns == previous['mtime_ns']
+
+# Default number of threads used to write files; emission is I/O bound, so this
+# follows the concurrent.futures default rather than the CPU count
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Write a file, or hard link it from `source` (an unchanged file in the tree being
+# replaced) so it keeps its inode and mtime. A file hard-linked from a content store
+# is unlinked first, so writing never changes the other trees sharing it.
+def write_file(path, data, source=None):
+    if source is not None:
+        try:
+            os.link(source, path)
+            return path
+        except OSError:
+            pass
+
+    try:
+        if os.lstat(path).st_nlink > 1:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+# Write (path, data, source) jobs, yielding each path in job order as soon as it and
+# all the jobs before it are done, regardless of which worker finished first
+def emit_files(jobs, workers=1, writer=write_file):
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield writer(*job)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(lambda job: writer(*job), jobs)
+
+# How emitted files are made durable against a host crash (a file whose data never
+# reached the disk comes back empty):
+#   none: leave it to the OS writeback (fastest; the default)
+#   batch: write everything, then fsync each file and directory once at the end,
+#     before the manifest, so the manifest never lists content that is not on disk
+#   strict: fsync each file and its directory as soon as it is written
+DURABILITY_MODES = ('none', 'batch', 'strict')
+
+def fsync_file(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return path
+
+# Directories are fsynced so new and renamed entries in them persist; platforms
+# that cannot open a directory (Windows) persist them with the file metadata
+def fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        if e.errno not in (errno.EINVAL, errno.EBADF):
+            raise
+    finally:
+        os.close(fd)
+
+# Wrap a file writer so each file and its directory are fsynced once written
+def durable_writer(writer):
+    def write(path, data, source=None):
+        result = writer(path, data, source)
+        fsync_file(path)
+        fsync_dir(os.path.dirname(path))
+        return result
+    return write
+
+# Content-addressed store shared by the variant trees of a batch run. Each distinct
+# file content is written once, as objects/<sha256[:2]>/<sha256>, and placed into
+# every tree that needs it by reflink or hard link, so disk usage and write time
+# grow with the distinct content rather than the number of variants. Hard links
+# share the inode: the placed files are read-only, and writing to one (after a
+# chmod) changes it in every variant and in the store, so they are only used when
+# asked for. Reflinks (copy-on-write) and copies are independent, writable files.
+STORE_DIR = '.scaffold-store'
+LINK_MODES = ('hardlink', 'reflink', 'copy')
+DEFAULT_LINK_MODE = 'reflink'
+FICLONE = 0x40049409  # ioctl sharing a file's extents with another (copy-on-write)
+
+# Clone src into dst with the FICLONE ioctl (Btrfs, XFS, bcachefs, ...). Returns
+# False when the platform or filesystem cannot.
+def reflink_file(src, dst):
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+            return True
+        except OSError:
+            return False
+
+class ContentStore:
+    # link_mode: 'reflink' (trees stay independent; falling back to copy), 'hardlink'
+    # (trees share read-only inodes; falling back to reflink, then copy) or 'copy'
+    def __init__(self, path, link_mode=DEFAULT_LINK_MODE):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link_mode}")
+        self.path = path
+        self.link_mode = link_mode
+        self.stats = {'stored': 0, 'hardlink': 0, 'reflink': 0, 'copy': 0}
+        self._lock = threading.Lock()
+
+    def object_path(self, digest):
+        return os.path.join(self.path, 'objects', digest[:2], digest)
+
+    # Path of the stored content, writing it if this is its first use
+    def add(self, data, digest):
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # Stored objects are shared by every tree, so they are read-only
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, path)
+        self._count('stored')
+        return path
+
+    # Place the content at `path` (replacing what is there) from the store
+    def place(self, path, data, digest):
+        source = self.add(data, digest)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        method = self._clone(source, tmp_path)
+        os.replace(tmp_path, path)
+        self._count(method)
+        return path
+
+    def _clone(self, source, tmp_path):
+        if self.link_mode == 'hardlink':
+            try:
+                os.link(source, tmp_path)
+                return 'hardlink'
+            except OSError:
+                pass
+        if self.link_mode != 'copy' and reflink_file(source, tmp_path):
+            return 'reflink'
+        shutil.copyfile(source, tmp_path)
+        return 'copy'
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+# Optional instrumentation of a run: one span per directory and per file (plus
+# phases such as rendering and the per-file output), written as a Chrome trace
+# (chrome://tracing, ui.perfetto.dev) and summarized as a table. Untraced runs
+# use NULL_TRACER, so callers record spans unconditionally.
+class Tracer:
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def now(self):
+        return time.perf_counter_ns()
+
+    # Record a complete span that started at `start` (a now() value) and ends now
+    def add(self, category, name, start, **args):
+        end = time.perf_counter_ns()
+        thread = threading.current_thread()
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self.events.append({
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': os.getpid(),
+                'tid': thread.ident,
+                'args': args,
+            })
+
+    # Record the body of a with block as a span. Arguments known only at its end
+    # (a status) are set on the yielded dict; a block that raises is not recorded.
+    @contextmanager
+    def span(self, category, name, **args):
+        start = time.perf_counter_ns()
+        yield args
+        self.add(category, name, start, **args)
+
+    # Wrap a file writer so each (path, data, source) job records a span, named and
+    # labelled from traced: output path -> (status, reported path)
+    def traced_writer(self, writer, traced):
+        def write(path, data, source=None):
+            start = time.perf_counter_ns()
+            result = writer(path, data, source)
+            status, name = traced[path]
+            self.add('file', name, start, bytes=len(data), status=status)
+            return result
+        return write
+
+    def save(self, path):
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': ident,
+             'args': {'name': name}}
+            for ident, name in self._threads.items()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}, f)
+            f.write('\n')
+
+    # Rows of (category, status, count, bytes, total ms, max ms, slowest span)
+    def summary(self):
+        groups = {}
+        for event in self.events:
+            key = (event['cat'], event['args'].get('status', '-'))
+            group = groups.setdefault(key, [0, 0, 0.0, 0.0, ''])
+            group[0] += 1
+            group[1] += event['args'].get('bytes', 0)
+            group[2] += event['dur'] / 1000
+            if event['dur'] / 1000 >= group[3]:
+                group[3] = event['dur'] / 1000
+                group[4] = event['name']
+        return [key + tuple(group) for key, group in sorted(groups.items())]
+
+    def format_summary(self):
+        lines = [f"{'category':<9} {'status':<9} {'count':>6} {'bytes':>10} {'total ms':>10} "
+                 f"{'max ms':>8}  slowest"]
+        for category, status, count, size, total, longest, name in self.summary():
+            lines.append(f"{category:<9} {status:<9} {count:>6} {size:>10} {total:>10.2f} "
+                         f"{longest:>8.2f}  {name}")
+        return '\n'.join(lines)
+
+# Same interface as Tracer, recording nothing
+class NullTracer:
+    events = ()
+
+    def now(self):
+        return 0
+
+    def add(self, category, name, start, **args):
+        pass
+
+    def span(self, category, name, **args):
+        return nullcontext(args)
+
+    def traced_writer(self, writer, traced):
+        return writer
+
+NULL_TRACER = NullTracer()
+
+# Function to create directories and files from the nested structure.
+# Directories are created up front, then files are written by `workers` threads.
+# Returns added/changed/unchanged counts; with incremental=True unchanged files
+# are not rewritten, so their mtimes are left alone.
+# When stage_path is given the tree is built there instead of in base_path, which
+# only supplies the previous manifest and the unchanged files to link.
+# With a ContentStore, files are placed from the store instead of written.
+# With a Tracer, every directory and file is recorded as a span.
+# durability is one of DURABILITY_MODES.
+def create_structure(base_path, structure, incremental=False, workers=1, stage_path=None,
+                     store=None, tracer=NULL_TRACER, durability='none'):
+    if durability not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {durability}")
+    output_path = stage_path or base_path
+    dirs = [output_path]
+    manifest = load_manifest(base_path)
+    new_manifest = {}
+    stats = {'added': 0, 'changed': 0, 'unchanged': 0}
+    jobs = []
+    display = {}
+    # Per job output path: how it is emitted and the path it is reported as
+    traced = {}
+    # Per job output path: its manifest path and content hash
+    emitted = {}
+
+    for kind, rel_path, value in walk_structure(structure):
+        parts = rel_path.split('/')
+        path = os.path.join(base_path, *parts)
+        out = os.path.join(output_path, *parts)
+        start = tracer.now()
+
+        if kind == 'dir':
+            os.makedirs(out, exist_ok=True)
+            dirs.append(out)
+            if durability == 'strict':
+                fsync_dir(os.path.dirname(out))
+            tracer.add('dir', path, start)
+            continue
+
+        data = encode_content(value)
+        digest = content_hash(data)
+        previous = manifest.get(rel_path)
+
+        if is_unchanged(path, digest, previous):
+            stats['unchanged'] += 1
+            if incremental:
+                if out != path:
+                    jobs.append((out, data, digest if store else path))
+                    traced[out] = ('linked', path)
+                    emitted[out] = (rel_path, digest)
+                else:
+                    # The span covers hashing and the stat check that skipped it
+                    new_manifest[rel_path] = previous
+                    tracer.add('file', path, start, bytes=len(data), status='skipped')
+                continue
+        elif previous is None or not os.path.exists(path):
+            stats['added'] += 1
+        else:
+            stats['changed'] += 1
+
+        jobs.append((out, data, digest if store else None))
+        display[out] = path
+        traced[out] = ('written', path)
+        emitted[out] = (rel_path, digest)
+
+    writer = store.place if store else write_file
+    if durability == 'strict':
+        writer = durable_writer(writer)
+    writer = tracer.traced_writer(writer, traced)
+
+    for out in emit_files(jobs, workers, writer):
+        rel_path, digest = emitted[out]
+        new_manifest[rel_path] = manifest_record(out, digest)
+        if out in display:
+            with tracer.span('stdout', display[out]):
+                print(f"Created: {display[out]}")
+
+    if durability == 'batch':
+        with tracer.span('phase', f"fsync {base_path}", status='batch'):
+            for _ in emit_files([(job[0],) for job in jobs], workers, fsync_file):
+                pass
+            for path in reversed(dirs):
+                fsync_dir(path)
+
+    with tracer.span('manifest', os.path.join(base_path, MANIFEST_NAME), entries=len(new_manifest)):
+        save_manifest(output_path, new_manifest)
+        if durability != 'none':
+            fsync_file(os.path.join(output_path, MANIFEST_NAME))
+            fsync_dir(output_path)
+            # The entry of the output directory itself, when this run created it
+            fsync_dir(os.path.dirname(os.path.abspath(output_path)))
+    return stats
+
+# Atomically exchange two paths with renameat2(RENAME_EXCHANGE). Returns False when
+# the platform, libc or filesystem cannot do it, so the caller can fall back.
+def exchange_paths(a, b):
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False
+
+    AT_FDCWD = -100
+    RENAME_EXCHANGE = 2
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    if renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0:
+        return True
+
+    err = ctypes.get_errno()
+    if err in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+        return False
+    raise OSError(err, os.strerror(err), b)
+
+# Move entries the scaffold does not own (node_modules, .svelte-kit, hand-added
+# files) from the live tree into the staged one, recursing only into directories
+# the structure defines. `owned` holds the relative paths of the previous emit's
+# manifest: files the structure no longer defines are left behind with the old
+# tree, not resurrected. Returns the (source, destination) moves performed.
+def carry_over_entries(live_path, stage_path, structure, owned=frozenset(), prefix=''):
+    moves = []
+    for name in sorted(os.listdir(live_path)):
+        src = os.path.join(live_path, name)
+        dst = os.path.join(stage_path, name)
+        rel_path = prefix + name
+        value = structure.get(name)
+        is_dir = os.path.isdir(src) and not os.path.islink(src)
+
+        if isinstance(value, Mapping) and is_dir:
+            moves.extend(carry_over_entries(src, dst, value, owned, f"{rel_path}/"))
+        elif (value is None and name != MANIFEST_NAME and rel_path not in owned
+              and not os.path.lexists(dst)):
+            if is_dir and any(path.startswith(f"{rel_path}/") for path in owned):
+                # A directory the structure dropped: carry over only what it did not own
+                os.mkdir(dst)
+                carried = carry_over_entries(src, dst, {}, owned, f"{rel_path}/")
+                if carried:
+                    moves.extend(carried)
+                else:
+                    os.rmdir(dst)
+            else:
+                os.rename(src, dst)
+                moves.append((src, dst))
+    return moves
+
+def current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Build the whole tree in a sibling staging directory and swap it in with a single
+# rename, so watchers see one change and readers never observe a partial project.
+# An interrupted run only leaves (and then removes) the staging directory.
+def create_structure_staged(base_path, structure, incremental=False, workers=1, store=None,
+                            tracer=NULL_TRACER, durability='none'):
+    parent, name = os.path.split(os.path.abspath(base_path))
+    os.makedirs(parent, exist_ok=True)
+    stage_path = tempfile.mkdtemp(prefix=f".{name}.", suffix='.staging', dir=parent)
+    moves = []
+
+    try:
+        # mkdtemp creates the directory private to the user; give it normal permissions
+        if os.path.isdir(base_path):
+            os.chmod(stage_path, os.stat(base_path).st_mode & 0o7777)
+        else:
+            os.chmod(stage_path, 0o777 & ~current_umask())
+
+        stats = create_structure(base_path, structure, incremental=incremental,
+                                 workers=workers, stage_path=stage_path, store=store,
+                                 tracer=tracer, durability=durability)
+
+        with tracer.span('phase', f"swap {base_path}") as span:
+            if not os.path.isdir(base_path):
+                os.rename(stage_path, base_path)
+                if durability != 'none':
+                    fsync_dir(parent)
+                span['status'] = 'renamed'
+                return stats
+
+            moves = carry_over_entries(base_path, stage_path, structure, frozenset(load_manifest(base_path)))
+            if durability != 'none':
+                for path in {os.path.dirname(dst) for _, dst in moves}:
+                    fsync_dir(path)
+            if exchange_paths(stage_path, base_path):
+                old_path = stage_path
+                span['status'] = 'exchanged'
+            else:
+                # Fallback: two renames, leaving a brief window with no tree at base_path
+                old_path = f"{stage_path}.old"
+                os.rename(base_path, old_path)
+                os.rename(stage_path, base_path)
+                span['status'] = 'renamed'
+            if durability != 'none':
+                fsync_dir(parent)
+    except BaseException:
+        for src, dst in reversed(moves):
+            os.rename(dst, src)
+        shutil.rmtree(stage_path, ignore_errors=True)
+        raise
+
+    with tracer.span('phase', f"remove {old_path}"):
+        shutil.rmtree(old_path, ignore_errors=True)
+    return stats
+
+# Archives use a fixed timestamp (SOURCE_DATE_EPOCH when set) so that identical
+# templates produce byte-identical archives; the default is the earliest time a zip
+# entry can represent
+ARCHIVE_FORMATS = ('tar.gz', 'zip')
+DEFAULT_ARCHIVE_MTIME = 315532800  # 1980-01-01T00:00:00Z
+
+def archive_mtime():
+    return int(os.environ.get('SOURCE_DATE_EPOCH', DEFAULT_ARCHIVE_MTIME))
+
+def archive_format_for(path):
+    return 'zip' if path.endswith('.zip') else 'tar.gz'
+
+# Write-only view of a file object. zipfile lays entries out differently depending on
+# whether it can seek back, so it is always given this to keep the output identical
+# whether it goes to a file or a pipe.
+class StreamWriter:
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def write(self, data):
+        return self._fileobj.write(data)
+
+    def flush(self):
+        self._fileobj.flush()
+
+    def seekable(self):
+        return False
+
+    def tell(self):
+        raise OSError('stream is not seekable')
+
+# Stream the structure into a tar.gz or zip on fileobj without touching the disk.
+# Entries are sorted and carry fixed ownership, modes and mtimes; `prefix` is the
+# top-level directory the project is archived under. Returns the number of files.
+def write_archive(fileobj, structure, archive_format='tar.gz', prefix=root_dir, mtime=None):
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format: {archive_format}")
+    mtime = archive_mtime() if mtime is None else mtime
+    entries = walk_structure(structure, sort=True)
+    count = 0
+
+    if archive_format == 'zip':
+        date_time = time.gmtime(max(mtime, DEFAULT_ARCHIVE_MTIME))[:6]
+        with zipfile.ZipFile(StreamWriter(fileobj), 'w', zipfile.ZIP_DEFLATED) as archive:
+            for kind, rel_path, value in entries:
+                name = f"{prefix}/{rel_path}" if prefix else rel_path
+                if kind == 'dir':
+                    info = zipfile.ZipInfo(f"{name}/", date_time)
+                    info.external_attr = (0o40755 << 16) | 0x10
+                    data = b''
+                else:
+                    info = zipfile.ZipInfo(name, date_time)
+                    info.external_attr = 0o100644 << 16
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    data = encode_content(value)
+                    count += 1
+                info.create_system = 3
+                archive.writestr(info, data)
+        return count
+
+    with gzip.GzipFile(filename='', mode='wb', fileobj=fileobj, mtime=mtime) as compressed:
+        with tarfile.open(fileobj=compressed, mode='w|', format=tarfile.GNU_FORMAT) as archive:
+            for kind, rel_path, value in entries:
+                info = tarfile.TarInfo(f"{prefix}/{rel_path}" if prefix else rel_path)
+                info.mtime = mtime
+                info.uid = info.gid = 0
+                info.uname = info.gname = ''
+                if kind == 'dir':
+                    info.type = tarfile.DIRTYPE
+                    info.mode = 0o755
+                    archive.addfile(info)
+                else:
+                    data = encode_content(value)
+                    info.mode = 0o644
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+                    count += 1
+    return count
+
+# Canonical patterns are precomputed at scaffold time into static/pattern-catalog.bin
+# (read by utils/patternCatalog.ts), so the browser only slices them. Layout, all
+# integers little-endian:
+#   'JLPC', u8 version, u8 token count, u8 max length, u8 reserved
+#   per token (sorted by code): u8 byte length, UTF-8 code
+#   per length 1..max: u32 group count, then per group u32 throw-usage mask,
+#     u32 data offset, u32 pattern count
+#   data: one u8 token id per throw, patterns of a group back to back
+# A group holds the patterns using exactly the throws in its mask, in necklace order.
+CATALOG_MAGIC = b'JLPC'
+CATALOG_VERSION = 1
+CATALOG_PATH = 'static/pattern-catalog.bin'
+DEFAULT_CATALOG_MAX_LENGTH = 5
+
+def build_pattern_catalog(codes, max_length=DEFAULT_CATALOG_MAX_LENGTH):
+    tokens = sorted(set(codes))
+    if len(tokens) > 32:
+        raise ValueError('The pattern catalog supports at most 32 throw codes')
+
+    header = bytearray(CATALOG_MAGIC)
+    header += bytes([CATALOG_VERSION, len(tokens), max_length, 0])
+    for token in tokens:
+        encoded = token.encode('utf-8')
+        header.append(len(encoded))
+        header += encoded
+
+    data = bytearray()
+    for length in range(1, max_length + 1):
+        groups = {}
+        for necklace in pattern_engine.iter_necklaces(len(tokens), length):
+            mask = 0
+            for index in necklace:
+                mask |= 1 << index
+            groups.setdefault(mask, bytearray()).extend(necklace)
+
+        header += len(groups).to_bytes(4, 'little')
+        for mask in sorted(groups):
+            header += mask.to_bytes(4, 'little')
+            header += len(data).to_bytes(4, 'little')
+            header += (len(groups[mask]) // length).to_bytes(4, 'little')
+            data += groups[mask]
+
+    return bytes(header + data)
+
+# The template tree rendered with `params`, plus the files generated from it. The
+# pack caches compiled templates, so rendering many variants from one loaded tree
+# never re-parses them.
+def build_project_structure(templates, catalog_max_length=DEFAULT_CATALOG_MAX_LENGTH,
+                            params=DEFAULT_PARAMS):
+    structure = render_templates(templates, params)
+    if params['pattern_service_url']:
+        structure = StructureOverlay(structure, render_templates(load_overlay('pattern-service'), params))
+    if catalog_max_length <= 0:
+        return structure
+
+    directory, name = CATALOG_PATH.split('/')
+    codes = tuple(button['code'] for button in params['throw_buttons'])
+    catalog = cached_pattern_catalog(codes, catalog_max_length)
+    return StructureOverlay(structure, {directory: {name: catalog}})
+
+def load_overlay(name):
+    overlay_dir = os.path.join(OVERLAYS_DIR, name)
+    return load_templates(overlay_dir, pack_path_for(overlay_dir))
+
+# Variants mostly share throw sets, so a batch builds each catalog once
+@lru_cache(maxsize=32)
+def cached_pattern_catalog(codes, max_length):
+    return build_pattern_catalog(codes, max_length)
+
+# Variant configs for a batch run: a JSON object mapping each variant name (its
+# directory under the root) to its template parameters
+def load_variants(path, overrides=None):
+    with open(path, encoding='utf-8') as f:
+        variants = json.load(f)
+    if not isinstance(variants, dict) or not variants:
+        raise ValueError(f"{path} must map variant names to template parameters")
+
+    for name in variants:
+        if not name or name.startswith('.') or '/' in name or os.sep in name:
+            raise ValueError(f"Invalid variant name: {name!r}")
+    return {name: load_params(params, overrides) for name, params in variants.items()}
+
+# Emit every variant into base_path/<name>, placing files from one content store
+# under base_path. Returns the stats of each variant and the store's counts.
+def create_variants(base_path, variants, templates, catalog_max_length=DEFAULT_CATALOG_MAX_LENGTH,
+                    incremental=False, workers=1, staged=False, link_mode=DEFAULT_LINK_MODE,
+                    tracer=NULL_TRACER, durability='none'):
+    os.makedirs(base_path, exist_ok=True)
+    store = ContentStore(os.path.join(base_path, STORE_DIR), link_mode)
+    results = {}
+
+    for name, params in variants.items():
+        with tracer.span('phase', f"render {name}"):
+            structure = build_project_structure(templates, catalog_max_length, params)
+        variant_path = os.path.join(base_path, name)
+        if staged:
+            results[name] = create_structure_staged(variant_path, structure, incremental=incremental,
+                                                    workers=workers, store=store, tracer=tracer,
+                                                    durability=durability)
+        else:
+            os.makedirs(variant_path, exist_ok=True)
+            results[name] = create_structure(variant_path, structure, incremental=incremental,
+                                             workers=workers, store=store, tracer=tracer,
+                                             durability=durability)
+    return results, store.stats
+
+# Optional local cache of installed dependencies, so a scaffold whose dependency set
+# was installed before gets a ready node_modules offline instead of a fresh
+# `npm install`. Entries are keyed by the hashes of package.json and the lockfile:
+#   entries/<key>/node_modules, entries/<key>/package-lock.json
+#   packages/<package.json sha256>: key of the latest entry for that package.json,
+#     used by fresh scaffolds that have no lockfile yet
+# Files are hard linked both ways (copied across filesystems), so saving and
+# restoring take seconds and the cache costs no extra space on the same disk.
+NODE_MODULES = 'node_modules'
+LOCKFILE = 'package-lock.json'
+
+def dependency_key(package_json, lockfile=None):
+    digest = hashlib.sha256(hashlib.sha256(package_json).digest())
+    if lockfile is not None:
+        digest.update(hashlib.sha256(lockfile).digest())
+    return digest.hexdigest()
+
+# Recreate the tree at src under dst with hard links (copies when linking fails),
+# keeping symlinks such as node_modules/.bin entries as symlinks. Returns the
+# number of files.
+def link_tree(src, dst):
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(src):
+        target_dir = os.path.join(dst, os.path.relpath(dirpath, src))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in list(dirnames):
+            if os.path.islink(os.path.join(dirpath, name)):
+                dirnames.remove(name)
+                filenames.append(name)
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            target = os.path.join(target_dir, name)
+            if os.path.islink(path):
+                os.symlink(os.readlink(path), target)
+                continue
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+            count += 1
+    return count
+
+def read_optional(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+class NodeModulesCache:
+    def __init__(self, path):
+        self.path = path
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, 'entries', key)
+
+    def _package_pointer(self, package_json):
+        return os.path.join(self.path, 'packages', hashlib.sha256(package_json).hexdigest())
+
+    # Key of the entry matching the project: its package.json and lockfile, or the
+    # latest entry for its package.json when it has no lockfile
+    def find(self, project_path):
+        package_json = read_optional(os.path.join(project_path, 'package.json'))
+        if package_json is None:
+            return None
+        lockfile = read_optional(os.path.join(project_path, LOCKFILE))
+        if lockfile is None:
+            key = (read_optional(self._package_pointer(package_json)) or b'').decode('ascii').strip()
+        else:
+            key = dependency_key(package_json, lockfile)
+        return key if key and os.path.isdir(self._entry_path(key)) else None
+
+    # Link a cached node_modules (and its lockfile, if the project has none) into
+    # the project. Returns the number of files, or None without a matching entry or
+    # when the project already has a node_modules.
+    def restore(self, project_path):
+        if os.path.lexists(os.path.join(project_path, NODE_MODULES)):
+            return None
+        key = self.find(project_path)
+        if key is None:
+            return None
+
+        entry = self._entry_path(key)
+        if not os.path.exists(os.path.join(project_path, LOCKFILE)):
+            shutil.copyfile(os.path.join(entry, LOCKFILE), os.path.join(project_path, LOCKFILE))
+
+        # Link into a temporary sibling and rename, so an interrupted restore never
+        # leaves a partial node_modules behind
+        tmp_path = tempfile.mkdtemp(prefix=f".{NODE_MODULES}.", dir=project_path)
+        try:
+            os.chmod(tmp_path, 0o777 & ~current_umask())
+            count = link_tree(os.path.join(entry, NODE_MODULES), tmp_path)
+            os.rename(tmp_path, os.path.join(project_path, NODE_MODULES))
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        return count
+
+    # Add the project's installed node_modules to the cache. Returns the number of
+    # files, or None when it has no node_modules or lockfile, or is cached already.
+    def save(self, project_path):
+        package_json = read_optional(os.path.join(project_path, 'package.json'))
+        lockfile = read_optional(os.path.join(project_path, LOCKFILE))
+        node_modules = os.path.join(project_path, NODE_MODULES)
+        if package_json is None or lockfile is None or not os.path.isdir(node_modules):
+            return None
+
+        key = dependency_key(package_json, lockfile)
+        entry = self._entry_path(key)
+        count = None
+        if not os.path.isdir(entry):
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            tmp_path = tempfile.mkdtemp(prefix=f".{key}.", dir=os.path.dirname(entry))
+            try:
+                count = link_tree(node_modules, os.path.join(tmp_path, NODE_MODULES))
+                with open(os.path.join(tmp_path, LOCKFILE), 'wb') as f:
+                    f.write(lockfile)
+                os.rename(tmp_path, entry)
+            except BaseException:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+
+        pointer = self._package_pointer(package_json)
+        os.makedirs(os.path.dirname(pointer), exist_ok=True)
+        with open(pointer, 'w') as f:
+            f.write(key)
+        return count
+
+# Restore node_modules from the cache, or save it there when the project has one
+# installed that is not cached yet; prints what happened
+def sync_node_modules(cache, project_path):
+    restored = cache.restore(project_path)
+    if restored is not None:
+        print(f"node_modules: linked {restored} files from {cache.path}")
+        return
+    saved = cache.save(project_path)
+    if saved is not None:
+        print(f"node_modules: cached {saved} files in {cache.path}")
+    elif not os.path.isdir(os.path.join(project_path, NODE_MODULES)):
+        print(f"node_modules: not cached for this package.json; run npm install in "
+              f"{project_path}, then rerun with --node-modules-cache to cache it")
+
+def trace_node_modules(cache, project_path, tracer):
+    with tracer.span('phase', f"node_modules {project_path}"):
+        sync_node_modules(cache, project_path)
+
+def run_precompress(project_path, directories, tracer):
+    with tracer.span('phase', f"precompress {project_path}"):
+        manifest = precompress_assets(project_path, directories or PRECOMPRESS_DIRS)
+    print(f"Precompressed: {format_precompress(manifest)}")
+
+def write_trace(tracer, path):
+    tracer.save(path)
+    print(tracer.format_summary())
+    print(f"Trace: {path} ({len(tracer.events)} spans)")
+
+# Post-emit precompression: every compressible asset under the static and build
+# output directories gets .gz (and .br, when a brotli module is installed) siblings
+# at maximum compression, so hosting can serve them as they are instead of
+# compressing per request. Files are compressed in a process pool. A format is
+# skipped when its sibling is newer than the source, or when the manifest records
+# that it did not pay off for this exact source, so reruns only touch new and
+# changed assets. PRECOMPRESS_MANIFEST records the sizes and savings.
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Relative to the project: static assets, adapter-static/node builds and the
+# client output of other adapters
+PRECOMPRESS_DIRS = ('static', 'build', '.svelte-kit/output/client')
+PRECOMPRESS_MANIFEST = '.precompress-manifest.json'
+COMPRESSIBLE_EXTENSIONS = frozenset({
+    '.html', '.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.xml', '.ico',
+    '.wasm', '.webmanifest', '.bin',
+})
+# Smaller files save too little to be worth a sibling
+MIN_COMPRESS_SIZE = 256
+# A compressed sibling is only kept when it is at most this fraction of the source
+MAX_COMPRESS_RATIO = 0.9
+
+def precompress_formats():
+    return ('gz', 'br') if brotli is not None else ('gz',)
+
+def compress_data(data, compression):
+    if compression == 'gz':
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+# Compress one file into each of `formats` (runs in a worker process). Returns the
+# source size and mtime it compressed, and per format the compressed size, or None
+# when the saving was too small to keep a sibling.
+def precompress_file(path, formats):
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = f.read()
+
+    sizes = {}
+    for compression in formats:
+        target = f"{path}.{compression}"
+        compressed = compress_data(data, compression)
+        if len(compressed) > len(data) * MAX_COMPRESS_RATIO:
+            try:
+                os.unlink(target)
+            except FileNotFoundError:
+                pass
+            sizes[compression] = None
+            continue
+
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_path, target)
+        sizes[compression] = len(compressed)
+    return len(data), stat.st_mtime_ns, sizes
+
+# Whether the `compression` sibling of a source is current: it is newer than the
+# source, or the manifest says this exact source did not compress well enough
+def is_precompressed(path, compression, stat, previous):
+    try:
+        if os.stat(f"{path}.{compression}").st_mtime_ns >= stat.st_mtime_ns:
+            return True
+    except FileNotFoundError:
+        pass
+    return (previous is not None and compression in previous and previous[compression] is None
+            and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns)
+
+def list_compressible(base_path, directories):
+    for directory in directories:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(base_path, directory)):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                    path = os.path.join(dirpath, name)
+                    yield os.path.relpath(path, base_path).replace(os.sep, '/'), path
+
+# Precompress the assets of a generated (and possibly built) project. Returns the
+# manifest: per file its size and compressed sizes, plus totals per format.
+def precompress_assets(base_path, directories=PRECOMPRESS_DIRS, workers=None):
+    formats = precompress_formats()
+    manifest_path = os.path.join(base_path, PRECOMPRESS_MANIFEST)
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            previous_files = json.load(f).get('files', {})
+    except (OSError, ValueError):
+        previous_files = {}
+
+    files = {}
+    jobs = []
+    up_to_date = 0
+    for rel_path, path in list_compressible(base_path, directories):
+        stat = os.stat(path)
+        if stat.st_size < MIN_COMPRESS_SIZE:
+            continue
+        previous = previous_files.get(rel_path)
+        pending = [compression for compression in formats
+                   if not is_precompressed(path, compression, stat, previous)]
+        if pending:
+            jobs.append((rel_path, path, pending))
+            continue
+
+        # Up to date: describe the siblings as they are on disk
+        up_to_date += 1
+        entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        for compression in formats:
+            target = f"{path}.{compression}"
+            entry[compression] = os.path.getsize(target) if os.path.exists(target) else None
+        files[rel_path] = entry
+
+    paths = [path for _, path, _ in jobs]
+    pending = [pending for _, _, pending in jobs]
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(precompress_file, paths, pending, chunksize=4))
+    else:
+        results = [precompress_file(path, formats) for path, formats in zip(paths, pending)]
+
+    for (rel_path, path, _), (size, mtime_ns, sizes) in zip(jobs, results):
+        entry = {'size': size, 'mtime_ns': mtime_ns}
+        for compression in formats:
+            if compression in sizes:
+                entry[compression] = sizes[compression]
+            else:
+                target = f"{path}.{compression}"
+                entry[compression] = os.path.getsize(target) if os.path.exists(target) else None
+        files[rel_path] = entry
+
+    # Entries outside the directories of this run stay, while their sources exist
+    prefixes = tuple(f"{directory.strip('/')}/" for directory in directories)
+    for rel_path, entry in previous_files.items():
+        if (rel_path not in files and not rel_path.startswith(prefixes)
+                and os.path.exists(os.path.join(base_path, *rel_path.split('/')))):
+            files[rel_path] = entry
+
+    totals = {}
+    for compression in formats:
+        kept = [entry for entry in files.values() if entry.get(compression) is not None]
+        original = sum(entry['size'] for entry in kept)
+        compressed = sum(entry[compression] for entry in kept)
+        totals[compression] = {
+            'files': len(kept),
+            'size': original,
+            'compressed': compressed,
+            'saved': original - compressed,
+        }
+
+    manifest = {
+        'formats': list(formats),
+        'compressed': len(jobs),
+        'up_to_date': up_to_date,
+        'totals': totals,
+        'files': dict(sorted(files.items())),
     }
-};
-
-export default config;
-"""
-
-tsconfig = """
-{
-  "extends": "./.svelte-kit/tsconfig.json",
-  "compilerOptions": {
-    "allowJs": true,
-    "checkJs": true,
-    "esModuleInterop": true,
-    "forceConsistentCasingInFileNames": true,
-    "resolveJsonModule": true,
-    "skipLibCheck": true,
-    "sourceMap": true,
-    "strict": true,
-    "moduleResolution": "bundler"
-  }
-}
-"""
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return manifest
+
+def format_precompress(manifest):
+    parts = [f"{manifest['compressed']} compressed, {manifest['up_to_date']} up to date"]
+    for compression, total in manifest['totals'].items():
+        ratio = total['compressed'] / total['size'] if total['size'] else 1
+        parts.append(f"{compression}: {total['files']} files, {total['size']} -> "
+                     f"{total['compressed']} bytes ({(1 - ratio) * 100:.0f}% saved)")
+    if brotli is None:
+        parts.append('br: skipped, install the brotli module to enable it')
+    return '; '.join(parts)
+
+# Watch mode: after the first emit, rebuild the structure whenever the template
+# sources (or the params file) change, diff it with the previous one by path and
+# rewrite only the files whose content changed, so a dev server's HMR swaps the one
+# edited component instead of reloading everything. Changes are picked up with
+# inotify on Linux and by polling the templates fingerprint elsewhere.
+WATCH_DEBOUNCE = 0.05  # seconds without events before rebuilding (editors save in bursts)
+POLL_INTERVAL = 0.5
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+# Watch directory trees (recursively, including directories created later) and
+# single files through the inotify syscalls
+class InotifyWatcher:
+    def __init__(self, directories, files=()):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        # Watch descriptor -> (directory, whether everything in it is watched)
+        self._watches = {}
+        self._files = {os.path.abspath(path) for path in files}
+        try:
+            for directory in directories:
+                self._watch_tree(directory)
+            for directory in {os.path.dirname(path) for path in self._files}:
+                self._watch(directory, False)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, path, recursive):
+        wd = self._add_watch(self.fd, os.fsencode(path), INOTIFY_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch {path}")
+        self._watches[wd] = (path, recursive or self._watches.get(wd, (None, False))[1])
+
+    def _watch_tree(self, root):
+        for dirpath, _, _ in os.walk(root):
+            self._watch(dirpath, True)
+
+    # Block until something watched changes (True) or `timeout` seconds pass (False)
+    def wait(self, timeout=None):
+        while True:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                return False
+            data = os.read(self.fd, 65536)
+            changed = False
+
+            for wd, mask, name in self._events(data):
+                if mask & IN_Q_OVERFLOW:
+                    changed = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                directory, recursive = self._watches.get(wd, (None, False))
+                if directory is None:
+                    continue
+                path = os.path.join(directory, name) if name else directory
+                if recursive:
+                    if is_pack_file(name):
+                        continue
+                    changed = True
+                    if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                        try:
+                            self._watch_tree(path)
+                        except OSError:
+                            pass
+                elif path in self._files:
+                    changed = True
+            if changed:
+                return True
+
+    @staticmethod
+    def _events(data):
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            yield wd, mask, name
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+# Same interface, comparing the templates fingerprint and file stats every interval
+class PollingWatcher:
+    def __init__(self, directories, files=(), interval=POLL_INTERVAL):
+        self.directories = list(directories)
+        self.files = list(files)
+        self.interval = interval
+        self._state = self._snapshot()
+
+    def _snapshot(self):
+        state = [templates_fingerprint(directory) for directory in self.directories]
+        for path in self.files:
+            try:
+                stat = os.stat(path)
+                state.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                state.append(None)
+        return state
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self._snapshot()
+            if state != self._state:
+                self._state = state
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            delay = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(delay, 0))
+
+    def close(self):
+        pass
+
+def open_watcher(directories, files=()):
+    try:
+        return InotifyWatcher(directories, files)
+    except (OSError, AttributeError) as e:
+        print(f"Watch: inotify unavailable ({e}), polling every {POLL_INTERVAL}s", file=sys.stderr)
+        return PollingWatcher(directories, files)
+
+# Encoded content of every file of a structure, by relative path
+def flatten_structure(structure):
+    return {rel_path: encode_content(value)
+            for kind, rel_path, value in walk_structure(structure) if kind == 'file'}
+
+# Replace a file through a temporary sibling, so a dev server watching it never
+# reads a half-written component
+def replace_file(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# Bring base_path from the `previous` flattened structure to `structure`: write the
+# added and changed files, remove the deleted ones (and directories left empty) and
+# update the manifest. Returns the new flattened structure and the changed and
+# removed paths.
+def apply_structure_diff(base_path, previous, structure):
+    files = flatten_structure(structure)
+    changed = [rel_path for rel_path, data in files.items() if previous.get(rel_path) != data]
+    changed_paths = set(changed)
+    removed = [rel_path for rel_path in previous if rel_path not in files]
+
+    for rel_path in changed:
+        path = os.path.join(base_path, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        replace_file(path, files[rel_path])
+    for rel_path in removed:
+        path = os.path.join(base_path, *rel_path.split('/'))
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        directory = os.path.dirname(rel_path)
+        while directory:
+            try:
+                os.rmdir(os.path.join(base_path, *directory.split('/')))
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+
+    if changed or removed:
+        # Files this diff did not write keep their entries
+        manifest = load_manifest(base_path)
+        new_manifest = {}
+        for rel_path, data in files.items():
+            digest = content_hash(data)
+            record = manifest.get(rel_path)
+            if (rel_path in changed_paths or not isinstance(record, dict)
+                    or record.get('hash') != digest):
+                record = manifest_record(os.path.join(base_path, *rel_path.split('/')), digest)
+            new_manifest[rel_path] = record
+        save_manifest(base_path, new_manifest)
+    return files, changed, removed
+
+# Rebuild and re-emit on every template change until interrupted. `structure` is
+# what base_path currently holds.
+def watch_templates(base_path, structure, params_source=None,
+                    catalog_max_length=DEFAULT_CATALOG_MAX_LENGTH, templates_dir=TEMPLATES_DIR,
+                    overrides=None):
+    files = flatten_structure(structure)
+    directories = [templates_dir] + ([OVERLAYS_DIR] if os.path.isdir(OVERLAYS_DIR) else [])
+    watcher = open_watcher(directories, [params_source] if params_source else [])
+    print(f"Watching {templates_dir} (Ctrl-C to stop)")
+
+    try:
+        while True:
+            watcher.wait()
+            while watcher.wait(WATCH_DEBOUNCE):
+                pass
+
+            start = time.perf_counter()
+            try:
+                templates = load_templates(templates_dir, pack_path_for(templates_dir))
+                structure = build_project_structure(templates, catalog_max_length,
+                                                    load_params(params_source, overrides))
+                files, changed, removed = apply_structure_diff(base_path, files, structure)
+            except (OSError, ValueError) as e:
+                print(f"Watch: not updated: {e}", file=sys.stderr)
+                continue
+
+            elapsed = (time.perf_counter() - start) * 1000
+            for rel_path in changed:
+                print(f"Updated: {os.path.join(base_path, rel_path)}")
+            for rel_path in removed:
+                print(f"Removed: {os.path.join(base_path, rel_path)}")
+            print(f"Rebuilt in {elapsed:.1f} ms: {len(changed)} updated, {len(removed)} removed")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+def format_stats(stats):
+    return f"{stats['added']} added, {stats['changed']} changed, {stats['unchanged']} unchanged"
+
+readme = """"""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the JuggleLog Svelte project.')
+    parser.add_argument('root_dir', nargs='?', default=root_dir,
+                        help=f"directory to generate the project into (default: {root_dir})")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"only write files whose content differs from {MANIFEST_NAME}")
+    parser.add_argument('--staged', action='store_true',
+                        help='build in a sibling temporary directory and swap it in atomically')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"number of threads writing files (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="stream the project into a tar.gz or zip at PATH ('-' for stdout) "
+                             "instead of writing the tree")
+    parser.add_argument('--archive-format', choices=ARCHIVE_FORMATS,
+                        help='archive format (default: from the PATH extension, else tar.gz)')
+    parser.add_argument('--catalog-max-length', type=int, default=DEFAULT_CATALOG_MAX_LENGTH,
+                        help=f"longest pattern length precomputed into {CATALOG_PATH}, 0 to skip it "
+                             f"(default: {DEFAULT_CATALOG_MAX_LENGTH})")
+    parser.add_argument('--params', metavar='JSON',
+                        help='JSON file of template parameters (throw_buttons, max_length, '
+                             'completion_catches, theme, pattern_service_url) overriding the defaults')
+    parser.add_argument('--pattern-service', metavar='URL',
+                        help='emit a patternStore.ts that fetches pattern pages from the '
+                             'pattern_service.py instance at URL (overrides pattern_service_url)')
+    parser.add_argument('--batch', metavar='JSON',
+                        help='JSON file mapping variant names to template parameters; each '
+                             'variant is generated into ROOT_DIR/<name> from a shared content store')
+    parser.add_argument('--link-mode', choices=LINK_MODES, default=DEFAULT_LINK_MODE,
+                        help='how batch variants share stored files: reflink (copy-on-write, '
+                             'falling back to copy), copy, or hardlink, which saves the most but '
+                             'leaves every file read-only and shared, so editing one (after a '
+                             f"chmod) changes it in every variant and the store (default: {DEFAULT_LINK_MODE})")
+    parser.add_argument('--node-modules-cache', metavar='DIR',
+                        help='dependency cache: link a cached node_modules into the project when '
+                             'its package.json and lockfile match, or cache an installed one')
+    parser.add_argument('--durability', choices=DURABILITY_MODES, default='none',
+                        help='fsync policy for emitted files: none, batch (fsync everything once '
+                             'at the end) or strict (fsync each file as written); default: none')
+    parser.add_argument('--precompress', nargs='*', metavar='DIR',
+                        help='after emitting, write .gz and .br siblings of compressible assets '
+                             f"under these project directories (default: {', '.join(PRECOMPRESS_DIRS)})")
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and re-emit only the files whose content changes '
+                             'when the templates or the --params file change')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='record a span per directory and file into a Chrome trace JSON at '
+                             'PATH (open in ui.perfetto.dev) and print a summary table')
+    args = parser.parse_args(argv)
+
+    cache = NodeModulesCache(args.node_modules_cache) if args.node_modules_cache else None
+    overrides = {'pattern_service_url': args.pattern_service} if args.pattern_service else None
+    tracer = NULL_TRACER
+    if args.trace:
+        if args.archive:
+            parser.error('--trace cannot be combined with --archive')
+        tracer = Tracer()
+
+    if args.watch and (args.archive or args.batch):
+        parser.error('--watch cannot be combined with --archive or --batch')
+
+    if args.batch:
+        if args.archive or args.params:
+            parser.error('--batch cannot be combined with --archive or --params')
+        results, store_stats = create_variants(
+            args.root_dir, load_variants(args.batch, overrides), load_templates(), args.catalog_max_length,
+            incremental=args.incremental, workers=args.workers, staged=args.staged,
+            link_mode=args.link_mode, tracer=tracer, durability=args.durability)
+        for name, stats in results.items():
+            print(f"Variant {name}: {format_stats(stats)}")
+            if cache:
+                trace_node_modules(cache, os.path.join(args.root_dir, name), tracer)
+            if args.precompress is not None:
+                run_precompress(os.path.join(args.root_dir, name), args.precompress, tracer)
+        print(f"Store: {store_stats['stored']} new files; placed {store_stats['hardlink']} hard links, "
+              f"{store_stats['reflink']} reflinks, {store_stats['copy']} copies")
+        if args.trace:
+            write_trace(tracer, args.trace)
+        return
+
+    with tracer.span('phase', 'render'):
+        project_structure = build_project_structure(load_templates(), args.catalog_max_length,
+                                                    load_params(args.params, overrides))
+
+    if args.archive:
+        archive_format = args.archive_format or archive_format_for(args.archive)
+        prefix = os.path.basename(os.path.normpath(args.root_dir))
+        if args.archive == '-':
+            count = write_archive(sys.stdout.buffer, project_structure, archive_format, prefix)
+            sys.stdout.buffer.flush()
+        else:
+            with open(args.archive, 'wb') as f:
+                count = write_archive(f, project_structure, archive_format, prefix)
+        # Progress goes to stderr so it never mixes with an archive on stdout
+        print(f"Archived: {count} files ({archive_format})", file=sys.stderr)
+        return
+
+    # Create the project files
+    if args.staged:
+        stats = create_structure_staged(args.root_dir, project_structure,
+                                        incremental=args.incremental, workers=args.workers,
+                                        tracer=tracer, durability=args.durability)
+    else:
+        os.makedirs(args.root_dir, exist_ok=True)
+        stats = create_structure(args.root_dir, project_structure,
+                                 incremental=args.incremental, workers=args.workers,
+                                 tracer=tracer, durability=args.durability)
+    print(f"Done: {format_stats(stats)}")
 
-vite_config = """
-import { sveltekit } from '@sveltejs/kit/vite';
-import { defineConfig } from 'vite';
+    if cache:
+        trace_node_modules(cache, args.root_dir, tracer)
+    if args.precompress is not None:
+        run_precompress(args.root_dir, args.precompress, tracer)
+    if args.trace:
+        write_trace(tracer, args.trace)
 
-export default defineConfig({
-  plugins: [sveltekit()]
-});
-"""
+    if args.watch:
+        watch_templates(args.root_dir, project_structure, args.params, args.catalog_max_length,
+                        overrides=overrides)
 
-readme = """"""
\ No newline at end of file
+if __name__ == '__main__':
+    main()
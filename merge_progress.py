@@ -0,0 +1,311 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from json.decoder import scanstring
+
+# Merge exported juggleLogProgress files (the ProgressData shape in types.ts:
+# completedPatterns, maxCatches, completionDates) into one compacted file. Inputs
+# are parsed as a stream of JSON tokens and merged into a temporary SQLite table,
+# so memory stays bounded however large the exports are. For each pattern the
+# merge keeps the highest max catches and the earliest completion date.
+
+# Max catches at which a pattern counts as completed, as in progressModel.ts (the
+# scaffold's completion_catches parameter; use --completion-catches to match a
+# project generated with another value)
+DEFAULT_COMPLETION_CATCHES = 100
+
+CHUNK_SIZE = 1 << 16
+BATCH_SIZE = 10000
+
+WHITESPACE = ' \t\n\r'
+LITERALS = {'true': True, 'false': False, 'null': None}
+# A number or literal, which must end at a delimiter or the end of the input
+SCALAR_RE = re.compile(r'(?:-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null)(?=[\s,:\]}]|$)')
+MAX_SCALAR_LENGTH = 64
+
+# Yield the JSON tokens of a text file as (kind, value) events: ('start', '{'),
+# ('end', '}'), ('start', '['), ('end', ']'), ('key', name) and ('value', value).
+# Only a chunk plus the token being read are held in memory.
+def iter_json_events(f, chunk_size=CHUNK_SIZE):
+    buffer = ''
+    pos = 0
+    eof = False
+    # Per open container: '{' or '[', and for objects whether a key comes next
+    stack = []
+
+    def refill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in WHITESPACE:
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                break
+            refill()
+            continue
+
+        char = buffer[pos]
+        if char in '{[':
+            stack.append([char, char == '{'])
+            pos += 1
+            yield 'start', char
+        elif char in '}]':
+            if not stack or stack[-1][0] != ('{' if char == '}' else '['):
+                raise ValueError(f"Unexpected {char!r}")
+            stack.pop()
+            pos += 1
+            yield 'end', char
+        elif char == ',':
+            if stack and stack[-1][0] == '{':
+                stack[-1][1] = True
+            pos += 1
+        elif char == ':':
+            pos += 1
+        elif char == '"':
+            try:
+                value, end = scanstring(buffer, pos + 1)
+            except ValueError:
+                # The string (or an escape in it) continues in the next chunk
+                if eof:
+                    raise
+                refill()
+                continue
+            pos = end
+            if stack and stack[-1][0] == '{' and stack[-1][1]:
+                stack[-1][1] = False
+                yield 'key', value
+            else:
+                yield 'value', value
+        else:
+            # Numbers and literals are short: buffer enough to see where they end
+            if len(buffer) - pos <= MAX_SCALAR_LENGTH and not eof:
+                refill()
+                continue
+            match = SCALAR_RE.match(buffer, pos)
+            if not match:
+                raise ValueError(f"Unexpected {buffer[pos:pos + 20]!r}")
+            token = match.group()
+            pos += len(token)
+            if token in LITERALS:
+                yield 'value', LITERALS[token]
+            else:
+                yield 'value', float(token) if any(c in token for c in '.eE') else int(token)
+
+    if stack:
+        raise ValueError('Unexpected end of input')
+
+# Skip the rest of a value whose first event was just read
+def skip_value(events, first):
+    if first[0] != 'start':
+        return
+    depth = 1
+    for kind, _ in events:
+        if kind == 'start':
+            depth += 1
+        elif kind == 'end':
+            depth -= 1
+            if depth == 0:
+                return
+
+# Yield (section, pattern, value) for every entry of a progress file: ('completed',
+# pattern, None), ('catches', pattern, number) and ('date', pattern, 'M-D-YYYY').
+# Unknown keys are skipped.
+def iter_progress_entries(f):
+    events = iter_json_events(f)
+    if next(events, None) != ('start', '{'):
+        raise ValueError('Progress data must be a JSON object')
+
+    for kind, key in events:
+        if kind == 'end':
+            return
+        event = next(events)
+        if key == 'completedPatterns' and event == ('start', '['):
+            for kind, value in events:
+                if kind == 'end':
+                    break
+                if kind == 'value' and isinstance(value, str):
+                    yield 'completed', value, None
+                else:
+                    skip_value(events, (kind, value))
+        elif key in ('maxCatches', 'completionDates') and event == ('start', '{'):
+            for kind, pattern in events:
+                if kind == 'end':
+                    break
+                kind, value = next(events)
+                if kind != 'value':
+                    skip_value(events, (kind, value))
+                elif key == 'maxCatches' and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield 'catches', pattern, value
+                elif key == 'completionDates' and isinstance(value, str) and value:
+                    yield 'date', pattern, value
+        else:
+            skip_value(events, event)
+
+# Sortable key of an M-D-YYYY date, or None when it does not parse
+def date_key(date):
+    match = re.fullmatch(r'(\d{1,2})-(\d{1,2})-(\d{4})', date)
+    if not match:
+        return None
+    month, day, year = (int(part) for part in match.groups())
+    return year * 10000 + month * 100 + day
+
+def open_merge_store(path):
+    db = sqlite3.connect(path)
+    db.execute('PRAGMA journal_mode = OFF')
+    db.execute('PRAGMA synchronous = OFF')
+    # Bounded page cache (32 MB); the table itself lives on disk
+    db.execute('PRAGMA cache_size = -32768')
+    db.execute(
+        'CREATE TABLE patterns ('
+        ' pattern TEXT PRIMARY KEY,'
+        ' max_catches,'
+        ' date TEXT,'
+        ' date_key INTEGER,'
+        ' listed INTEGER NOT NULL DEFAULT 0'
+        ') WITHOUT ROWID'
+    )
+    return db
+
+# Each upsert keeps the larger max catches, the earlier parseable date (any date
+# over none) and whether any input listed the pattern as completed
+UPSERT_CATCHES = (
+    'INSERT INTO patterns (pattern, max_catches) VALUES (?, ?) '
+    'ON CONFLICT (pattern) DO UPDATE SET max_catches = '
+    'CASE WHEN max_catches IS NULL OR excluded.max_catches > max_catches '
+    'THEN excluded.max_catches ELSE max_catches END'
+)
+UPSERT_DATE = (
+    'INSERT INTO patterns (pattern, date, date_key) VALUES (?, ?, ?) '
+    'ON CONFLICT (pattern) DO UPDATE SET date = excluded.date, date_key = excluded.date_key '
+    'WHERE date IS NULL OR (excluded.date_key IS NOT NULL '
+    'AND (date_key IS NULL OR excluded.date_key < date_key))'
+)
+UPSERT_COMPLETED = (
+    'INSERT INTO patterns (pattern, listed) VALUES (?, 1) '
+    'ON CONFLICT (pattern) DO UPDATE SET listed = 1'
+)
+
+# Merge one progress file into the store, in batches. Returns the number of entries.
+def merge_file(db, f):
+    batches = {'catches': [], 'date': [], 'completed': []}
+    statements = {'catches': UPSERT_CATCHES, 'date': UPSERT_DATE, 'completed': UPSERT_COMPLETED}
+    count = 0
+
+    def flush(section):
+        db.executemany(statements[section], batches[section])
+        batches[section].clear()
+
+    with db:
+        for section, pattern, value in iter_progress_entries(f):
+            if section == 'catches':
+                batches[section].append((pattern, value))
+            elif section == 'date':
+                batches[section].append((pattern, value, date_key(value)))
+            else:
+                batches[section].append((pattern,))
+            count += 1
+            if len(batches[section]) >= BATCH_SIZE:
+                flush(section)
+        for section in batches:
+            flush(section)
+    return count
+
+# Stream a JSON array or object from query rows without building it in memory.
+# Returns the number of items.
+def write_json_items(out, rows, as_object):
+    count = 0
+    out.write('{' if as_object else '[')
+    for row in rows:
+        if count:
+            out.write(',')
+        if as_object:
+            out.write(f"{json.dumps(row[0])}:{json.dumps(row[1])}")
+        else:
+            out.write(json.dumps(row[0]))
+        count += 1
+    out.write('}' if as_object else ']')
+    return count
+
+# Write the merged progress as compact JSON. completedPatterns only lists patterns
+# whose max catches do not already mark them completed, and zero max catches (the
+# default) are left out. Returns the number of entries written per section.
+def write_compacted(db, out, completion_catches=DEFAULT_COMPLETION_CATCHES):
+    counts = {}
+    queries = [
+        ('completedPatterns', False,
+         'SELECT pattern FROM patterns WHERE listed AND '
+         '(max_catches IS NULL OR max_catches < ?) ORDER BY pattern', (completion_catches,)),
+        ('maxCatches', True,
+         'SELECT pattern, max_catches FROM patterns WHERE max_catches > 0 ORDER BY pattern', ()),
+        ('completionDates', True,
+         'SELECT pattern, date FROM patterns WHERE date IS NOT NULL ORDER BY pattern', ()),
+    ]
+
+    out.write('{')
+    for i, (name, as_object, query, params) in enumerate(queries):
+        if i:
+            out.write(',')
+        out.write(f"{json.dumps(name)}:")
+        counts[name] = write_json_items(out, db.execute(query, params), as_object)
+    out.write('}\n')
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Merge exported juggleLogProgress files into one compacted file.')
+    parser.add_argument('inputs', nargs='+', help="progress JSON files ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="output file (default: '-', stdout)")
+    parser.add_argument('--temp-dir', help='directory for the temporary merge database')
+    parser.add_argument('--completion-catches', type=int, default=DEFAULT_COMPLETION_CATCHES,
+                        help='max catches at which a pattern counts as completed, the '
+                             f"project's completion_catches (default: {DEFAULT_COMPLETION_CATCHES})")
+    args = parser.parse_args(argv)
+    if args.completion_catches < 1:
+        parser.error('--completion-catches must be a positive integer')
+
+    with tempfile.TemporaryDirectory(dir=args.temp_dir) as temp_dir:
+        db = open_merge_store(os.path.join(temp_dir, 'merge.sqlite'))
+        try:
+            for path in args.inputs:
+                try:
+                    if path == '-':
+                        count = merge_file(db, sys.stdin)
+                    else:
+                        with open(path, encoding='utf-8') as f:
+                            count = merge_file(db, f)
+                except (OSError, ValueError) as error:
+                    parser.error(f"{path}: {error}")
+                print(f"Read: {count} entries from {path}", file=sys.stderr)
+
+            if args.output == '-':
+                counts = write_compacted(db, sys.stdout, args.completion_catches)
+            else:
+                # Write next to the output and rename, so a failed merge never leaves
+                # a truncated file (the output may also be one of the inputs)
+                directory = os.path.dirname(os.path.abspath(args.output))
+                fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                        counts = write_compacted(db, out, args.completion_catches)
+                    os.replace(temp_path, args.output)
+                except BaseException:
+                    os.unlink(temp_path)
+                    raise
+        finally:
+            db.close()
+
+    summary = ', '.join(f"{count} {name}" for name, count in counts.items())
+    print(f"Wrote: {summary}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+import argparse
+import random
+import re
+from functools import lru_cache
+from itertools import islice
+
+# Reference implementation of the pattern generation used by the emitted
+# utils/patternGenerator.ts. A pattern is a sequence of throw tokens ('S', 'Od', ...)
+# and patterns that are rotations of each other are the same pattern, so the
+# canonical patterns of a length are the necklaces over the selected tokens: the
+# lexicographically smallest rotation of each class, in the order the throws are
+# given. Everything works on token indices, never on characters, so multi-character
+# codes are never split.
+
+# Throw codes offered by the app, mirroring the default THROW_BUTTONS (DEFAULT_PARAMS
+# in generate_dir.py)
+THROW_CODES = ['S', 'D', 'L', 'F', 'B', 'P', 'O', 'Od', 'Us', 'Uo']
+
+# Remove duplicate throws, keeping the first occurrence
+def unique_throws(throws):
+    return list(dict.fromkeys(throws))
+
+# Advance `a` in place to the next prenecklace over k tokens (FKM algorithm).
+# Returns the length of its longest Lyndon prefix, or 0 after the last one.
+def next_prenecklace(a, k):
+    i = len(a) - 1
+    while i >= 0 and a[i] == k - 1:
+        i -= 1
+    if i < 0:
+        return 0
+
+    a[i] += 1
+    for j in range(i + 1, len(a)):
+        a[j] = a[j - i - 1]
+    return i + 1
+
+# Advance `a` in place to the next necklace; False once `a` was the last one.
+# Amortized constant time per necklace.
+def next_necklace(a, k):
+    while True:
+        period = next_prenecklace(a, k)
+        if period == 0:
+            return False
+        if len(a) % period == 0:
+            return True
+
+# Yield every necklace of length n over k tokens as a tuple of token indices, in
+# lexicographic order
+def iter_necklaces(k, n):
+    if k <= 0 or n <= 0:
+        return
+    a = [0] * n
+    yield tuple(a)
+    while next_necklace(a, k):
+        yield tuple(a)
+
+def divisors(n):
+    return [d for d in range(1, n + 1) if n % d == 0]
+
+def euler_phi(n):
+    result = n
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            while n % p == 0:
+                n //= p
+            result -= result // p
+        p += 1
+    if n > 1:
+        result -= result // n
+    return result
+
+# Number of canonical patterns of length n over k throws, by Burnside's lemma over
+# the n rotations: (1/n) * sum over d | n of phi(d) * k^(n/d). No enumeration.
+def count_patterns(k, n):
+    if k <= 0 or n <= 0:
+        return 0
+    return sum(euler_phi(d) * k ** (n // d) for d in divisors(n)) // n
+
+# What generating the patterns for a throw selection would produce: the pattern
+# count, the k^n strings a brute-force generator would visit, and the characters
+# the result holds (estimated from the mean code length)
+def estimate_cost(throws, length):
+    throws = unique_throws(throws)
+    count = count_patterns(len(throws), length)
+    mean_code_length = sum(len(t) for t in throws) / len(throws) if throws else 0
+    return {
+        'patterns': count,
+        'candidates': len(throws) ** length if throws and length > 0 else 0,
+        'characters': round(count * length * mean_code_length)
+    }
+
+def join_tokens(indices, throws):
+    return ''.join(throws[i] for i in indices)
+
+# Canonical patterns of `length` throws, sorted by string like the TS generator (not
+# necklace order; see iter_patterns)
+def generate_patterns(throws, length):
+    throws = unique_throws(throws)
+    return sorted(join_tokens(a, throws) for a in iter_necklaces(len(throws), length))
+
+def mobius(n):
+    result = 1
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            n //= p
+            if n % p == 0:
+                return 0
+            result = -result
+        p += 1
+    return -result if n > 1 else result
+
+# Rank and unrank work by counting the canonical patterns greater than a string
+# alpha without enumerating them (polynomial in the length). A pattern is greater
+# than alpha exactly when every rotation of it is, and by Burnside/Mobius that count
+# reduces to G(t): the number of cyclic strings of length t | n whose periodic
+# extension, read from any position, beats alpha within n tokens. G(t) is the
+# number of closed walks of length t in an automaton that tracks the live matches
+# of alpha's prefixes (KMP style) and rejects any read that falls below alpha or
+# equals it.
+
+def prefix_function(alpha):
+    borders = [0] * len(alpha)
+    for i in range(1, len(alpha)):
+        b = borders[i - 1]
+        while b > 0 and alpha[i] != alpha[b]:
+            b = borders[b - 1]
+        if alpha[i] == alpha[b]:
+            b += 1
+        borders[i] = b
+    return borders
+
+# transitions[state][token]: next state (longest live match length) or -1 on reject
+def beat_automaton(alpha, k):
+    n = len(alpha)
+    borders = prefix_function(alpha)
+    transitions = []
+    for state in range(n):
+        row = []
+        for token in range(k):
+            following = None
+            match = state
+            while True:
+                if token < alpha[match]:
+                    following = -1
+                    break
+                if token == alpha[match] and following is None:
+                    following = match + 1
+                if match == 0:
+                    break
+                match = borders[match - 1]
+            if following is None:
+                following = 0
+            row.append(-1 if following == n else following)
+        transitions.append(row)
+    return transitions
+
+def count_closed_walks(transitions, length):
+    states = len(transitions)
+    total = 0
+    for start in range(states):
+        counts = [0] * states
+        counts[start] = 1
+        for _ in range(length):
+            following = [0] * states
+            for state, count in enumerate(counts):
+                if count:
+                    for target in transitions[state]:
+                        if target >= 0:
+                            following[target] += count
+            counts = following
+        total += counts[start]
+    return total
+
+# Number of canonical patterns (over k tokens) strictly greater than alpha
+def count_greater(alpha, k):
+    n = len(alpha)
+    transitions = beat_automaton(alpha, k)
+    walks = {t: count_closed_walks(transitions, t) for t in divisors(n)}
+    total = 0
+    for t in divisors(n):
+        primitive = sum(mobius(t // s) * walks[s] for s in divisors(t))
+        total += primitive // t
+    return total
+
+# Number of canonical patterns strictly smaller than the token indices alpha
+def count_less(alpha, k):
+    smaller_or_equal = count_patterns(k, len(alpha)) - count_greater(alpha, k)
+    return smaller_or_equal - (1 if is_necklace(alpha) else 0)
+
+# Position of a canonical pattern in necklace order (see iter_patterns)
+def rank_pattern(pattern, throws):
+    throws = unique_throws(throws)
+    indices = tokenize(pattern, throws)
+    if not is_necklace(indices):
+        raise ValueError(f"{pattern!r} is not a canonical pattern")
+    return count_less(indices, len(throws))
+
+# Canonical pattern at a position in necklace order, built token by token: each
+# position takes the largest token that still leaves at most `rank` patterns before
+def unrank_pattern(rank, throws, length):
+    throws = unique_throws(throws)
+    k = len(throws)
+    if not 0 <= rank < count_patterns(k, length):
+        raise IndexError(f"Pattern rank {rank} out of range")
+
+    indices = []
+    for position in range(length):
+        for token in reversed(range(k)):
+            candidate = indices + [token] + [0] * (length - position - 1)
+            if count_less(candidate, k) <= rank:
+                indices.append(token)
+                break
+    return join_tokens(indices, throws)
+
+# Uniformly random canonical pattern
+def random_pattern(throws, length, rng=random):
+    count = count_patterns(len(unique_throws(throws)), length)
+    if count == 0:
+        return None
+    return unrank_pattern(rng.randrange(count), throws, length)
+
+# Regex splitting a pattern into throw codes, longest code first; any other
+# character becomes a token of its own
+@lru_cache(maxsize=None)
+def token_regex(throws):
+    codes = sorted(throws, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(code) for code in codes) + '|.', re.DOTALL)
+
+@lru_cache(maxsize=4096)
+def _primitive_root(pattern, throws):
+    tokens = token_regex(throws).findall(pattern)
+    if not tokens:
+        return pattern, 1
+    period = len(tokens) - prefix_function(tokens)[-1]
+    if len(tokens) % period:
+        return pattern, 1
+    return ''.join(tokens[:period]), len(tokens) // period
+
+# Primitive root of a pattern: the shortest run of throws whose repetition gives
+# the pattern, and how many times it repeats ('OdOdOd' -> ('Od', 3)). The last
+# prefix-function border b gives the smallest period n - b, which divides n
+# exactly when the pattern is a repetition, so this is linear in the length and
+# works on throw tokens, never splitting a code. Memoized per pattern.
+def primitive_root(pattern, throws=THROW_CODES):
+    return _primitive_root(pattern, tuple(throws))
+
+@lru_cache(maxsize=4096)
+def _related_patterns(root, max_repetitions):
+    return tuple(root * repetitions for repetitions in range(1, max_repetitions + 1))
+
+# Patterns with the same primitive root: the root repeated 1..max_repetitions
+# times, like ProgressTracker.getRelatedPatterns. Cached per root.
+def related_patterns(pattern, max_repetitions=6, throws=THROW_CODES):
+    root, _ = primitive_root(pattern, throws)
+    return _related_patterns(root, max_repetitions)
+
+# Split a pattern string into token indices, matching the longest code first
+def tokenize(pattern, throws):
+    by_length = sorted(range(len(throws)), key=lambda i: -len(throws[i]))
+    indices = []
+    position = 0
+    while position < len(pattern):
+        for i in by_length:
+            if pattern.startswith(throws[i], position):
+                indices.append(i)
+                position += len(throws[i])
+                break
+        else:
+            raise ValueError(f"Pattern {pattern!r} contains a throw outside {throws}")
+    return indices
+
+# True when the token indices are the smallest rotation of their pattern, i.e. a
+# prenecklace whose Lyndon prefix length divides the length
+def is_necklace(indices):
+    period = 1
+    for i in range(1, len(indices)):
+        if indices[i] < indices[i - period]:
+            return False
+        if indices[i] > indices[i - period]:
+            period = i + 1
+    return len(indices) % period == 0
+
+# Cursor as token indices, checked to be a canonical pattern of the right length
+def parse_cursor(cursor, throws, length):
+    indices = tokenize(cursor, throws)
+    if len(indices) != length or not is_necklace(indices):
+        raise ValueError(f"{cursor!r} is not a canonical pattern of length {length}")
+    return indices
+
+# Yield canonical patterns in necklace order, starting after the pattern `after`,
+# or at the rank `start` (the first pattern by default). Necklace order compares
+# token by token, so with the throws sorted it matches the string order of
+# generate_patterns when no code is a prefix of another, or when every code
+# that extends a prefix (Od after O, in the default codes) continues with a
+# character sorting after the first character of every code (d sorts after the
+# capitals). With O, Od and z, Oz comes before OdOd here and after it by string.
+def iter_patterns(throws, length, after=None, start=0):
+    throws = unique_throws(throws)
+    k = len(throws)
+    if k == 0 or length <= 0:
+        return
+
+    if after is None:
+        if start >= count_patterns(k, length):
+            return
+        indices = tokenize(unrank_pattern(start, throws, length), throws) if start else [0] * length
+    else:
+        indices = parse_cursor(after, throws, length)
+        if not next_necklace(indices, k):
+            return
+
+    yield join_tokens(indices, throws)
+    while next_necklace(indices, k):
+        yield join_tokens(indices, throws)
+
+# One page of canonical patterns after the cursor `after`, or from the rank `start`
+# (so page N is start=N*limit, without generating the pages before it). Returns the
+# patterns and the cursor for the following page (its last pattern), or None after
+# the last page (and an empty page for limit <= 0). Only the patterns of the page
+# are generated.
+def generate_page(throws, length, after=None, limit=100, start=0):
+    if limit <= 0:
+        return [], None
+    patterns = list(islice(iter_patterns(throws, length, after, start), limit + 1))
+    if len(patterns) > limit:
+        return patterns[:limit], patterns[limit - 1]
+    return patterns, None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Print the canonical juggling patterns for a set of throws.')
+    parser.add_argument('throws', nargs='+', help=f"throw codes, e.g. {' '.join(THROW_CODES[:3])}")
+    parser.add_argument('--length', type=int, default=3, help='number of throws per pattern (default: 3)')
+    parser.add_argument('--count', action='store_true', help='print the cost estimate instead of the patterns')
+    args = parser.parse_args(argv)
+
+    if args.count:
+        for key, value in estimate_cost(args.throws, args.length).items():
+            print(f"{key}: {value}")
+        return
+
+    for pattern in generate_patterns(args.throws, args.length):
+        print(pattern)
+
+if __name__ == '__main__':
+    main()
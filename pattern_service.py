@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import generate_dir
+import pattern_engine
+
+# Local, self-hostable HTTP service serving pages of canonical patterns, for the
+# patternStore.ts variant that generate_dir.py emits with --pattern-service URL, so
+# low-end devices never enumerate patterns themselves. Pages are computed with
+# pattern_engine's rank/unrank (page N costs the same as page 0) in a process pool,
+# kept in an LRU cache as encoded responses, and identical queries that arrive
+# while one is being computed wait for that computation instead of repeating it.
+# Queries are limited to what the emitted app can ask for (the scaffold's
+# throw_buttons and max_length, from --params), pages past the last are refused
+# before reaching the pool, and a page that takes longer than --timeout is answered
+# with 503. No dependencies beyond the standard library.
+#
+#   GET /patterns?throws=S&throws=D&length=5&page=0&limit=100&order=asc
+#     -> {"throws", "length", "order", "page", "limit", "total", "patterns"}
+#   GET /count?throws=S&throws=D&length=5 -> {"throws", "length", "total"}
+#   GET /health -> {"status": "ok", "cache": ..., "requests": ...}
+#
+# Patterns are in necklace order over the throws as given (ascending, or descending
+# with order=desc). With the throws sorted, as the app sends them, that matches the
+# string order of PatternGenerator.generatePatterns for the default codes, but not
+# for every code set (see pattern_engine.iter_patterns).
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Cached pages (encoded responses of at most MAX_LIMIT patterns each)
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+# Seconds a page may take before the request is answered with 503; the page is
+# still computed and cached for the next request
+DEFAULT_TIMEOUT = 10
+ORDERS = ('asc', 'desc')
+
+# Request line plus headers; anything longer is refused
+MAX_REQUEST_BYTES = 16384
+REQUEST_TIMEOUT = 30
+REASONS = {
+    200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 431: 'Request Header Fields Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+# Responses are fetched from the app's own origin, and a page never changes
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+    'Access-Control-Max-Age': '86400',
+}
+PAGE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+class QueryError(ValueError):
+    pass
+
+def query_int(query, name, default=None, minimum=0, maximum=None):
+    values = query.get(name)
+    if not values:
+        if default is None:
+            raise QueryError(f"Missing parameter: {name}")
+        return default
+    try:
+        value = int(values[-1])
+    except ValueError:
+        raise QueryError(f"{name} must be an integer") from None
+    if value < minimum or (maximum is not None and value > maximum):
+        raise QueryError(f"{name} must be between {minimum} and {maximum if maximum is not None else 'any'}")
+    return value
+
+# Throw codes as given, repeated (throws=S&throws=D) or comma-separated (throws=S,D).
+# Only the app's codes are accepted, so responses and cache keys stay as small as
+# the app's own patterns.
+def query_throws(query, codes):
+    throws = []
+    for value in query.get('throws', []):
+        throws.extend(code for code in value.split(',') if code)
+    throws = pattern_engine.unique_throws(throws)
+    if not throws:
+        raise QueryError('Missing parameter: throws')
+    unknown = [code for code in throws if code not in codes]
+    if unknown:
+        raise QueryError(f"Unknown throw {unknown[0][:20]!r}, expected one of {', '.join(codes)}")
+    return tuple(throws)
+
+# Cache key of a page query: (throws, length, page, limit, order)
+def parse_page_query(query, codes, max_length):
+    throws = query_throws(query, codes)
+    length = query_int(query, 'length', minimum=1, maximum=max_length)
+    page = query_int(query, 'page', default=0)
+    limit = query_int(query, 'limit', default=DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
+    order = query.get('order', ['asc'])[-1]
+    if order not in ORDERS:
+        raise QueryError(f"order must be one of {', '.join(ORDERS)}")
+    total = pattern_engine.count_patterns(len(throws), length)
+    if page * limit >= total:
+        raise QueryError(f"page must be less than {-(-total // limit)} for {total} patterns")
+    return throws, length, page, limit, order
+
+def encode_json(value):
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+# Encoded response for one page (runs in a worker process). A descending page is
+# the matching ascending range, reversed.
+def render_page(throws, length, page, limit, order):
+    total = pattern_engine.count_patterns(len(throws), length)
+    if order == 'asc':
+        start = page * limit
+        count = min(limit, total - start)
+    else:
+        end = total - page * limit
+        start = max(0, end - limit)
+        count = end - start
+
+    patterns = []
+    if count > 0:
+        patterns, _ = pattern_engine.generate_page(throws, length, start=start, limit=count)
+        if order == 'desc':
+            patterns.reverse()
+
+    return encode_json({
+        'throws': list(throws),
+        'length': length,
+        'order': order,
+        'page': page,
+        'limit': limit,
+        'total': total,
+        'patterns': patterns,
+    })
+
+class PatternService:
+    def __init__(self, executor=None, cache_size=DEFAULT_CACHE_SIZE, params=None, timeout=DEFAULT_TIMEOUT):
+        params = params or generate_dir.DEFAULT_PARAMS
+        self.executor = executor
+        self.cache_size = cache_size
+        self.codes = [button['code'] for button in params['throw_buttons']]
+        self.max_length = params['max_length']
+        self.timeout = timeout
+        self._cache = OrderedDict()
+        # Query key -> task computing it, shared by every request for that key
+        self._pending = {}
+        self.stats = {'requests': 0, 'hits': 0, 'coalesced': 0, 'computed': 0}
+
+    async def page(self, key):
+        self.stats['requests'] += 1
+        body = self._cache.get(key)
+        if body is not None:
+            self._cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return body
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key))
+            self._pending[key] = task
+        else:
+            self.stats['coalesced'] += 1
+        # A client that disconnects cancels only its own wait, not the computation
+        return await asyncio.shield(task)
+
+    async def _compute(self, key):
+        loop = asyncio.get_running_loop()
+        try:
+            body = await loop.run_in_executor(self.executor, render_page, *key)
+        finally:
+            del self._pending[key]
+
+        self.stats['computed'] += 1
+        self._cache[key] = body
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return body
+
+    def health(self):
+        return encode_json({
+            'status': 'ok',
+            'cache': {'pages': len(self._cache), 'capacity': self.cache_size},
+            'pending': len(self._pending),
+            **self.stats,
+        })
+
+    # (status, body, extra headers) for a GET request
+    async def route(self, target):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        try:
+            if url.path == '/patterns':
+                key = parse_page_query(query, self.codes, self.max_length)
+                try:
+                    body = await asyncio.wait_for(self.page(key), self.timeout)
+                except asyncio.TimeoutError:
+                    return 503, encode_json({'error': 'Page took too long, try again later'}), {
+                        'Retry-After': str(math.ceil(self.timeout)), 'Cache-Control': 'no-store'}
+                return 200, body, {'Cache-Control': PAGE_CACHE_CONTROL}
+            if url.path == '/count':
+                throws = query_throws(query, self.codes)
+                length = query_int(query, 'length', minimum=1, maximum=self.max_length)
+                total = pattern_engine.count_patterns(len(throws), length)
+                body = encode_json({'throws': list(throws), 'length': length, 'total': total})
+                return 200, body, {'Cache-Control': PAGE_CACHE_CONTROL}
+            if url.path == '/health':
+                return 200, self.health(), {'Cache-Control': 'no-store'}
+        except QueryError as e:
+            return 400, encode_json({'error': str(e)}), {}
+        return 404, encode_json({'error': f"Not found: {url.path}"}), {}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), REQUEST_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await send_response(writer, 431, encode_json({'error': 'Request too large'}),
+                                        keep_alive=False)
+                    return
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                except ValueError:
+                    await send_response(writer, 400, encode_json({'error': 'Bad request line'}),
+                                        keep_alive=False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                              else connection == 'keep-alive')
+                # GET and OPTIONS bodies carry nothing we use
+                length = headers.get('content-length', '0')
+                if not length.isdigit() or int(length) > MAX_REQUEST_BYTES:
+                    await send_response(writer, 400, encode_json({'error': 'Bad Content-Length'}),
+                                        keep_alive=False)
+                    return
+                if int(length):
+                    await reader.readexactly(int(length))
+
+                if method == 'OPTIONS':
+                    await send_response(writer, 204, b'', keep_alive=keep_alive)
+                elif method in ('GET', 'HEAD'):
+                    try:
+                        status, body, extra = await self.route(target)
+                    except Exception as e:
+                        print(f"Error serving {target}: {e!r}", file=sys.stderr)
+                        status, body, extra = 500, encode_json({'error': 'Internal error'}), {}
+                    await send_response(writer, status, body, extra, keep_alive=keep_alive,
+                                        head=method == 'HEAD')
+                else:
+                    await send_response(writer, 405, encode_json({'error': f"Method {method} not allowed"}),
+                                        {'Allow': 'GET, HEAD, OPTIONS'}, keep_alive=keep_alive)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def send_response(writer, status, body, extra_headers=None, keep_alive=True, head=False):
+    headers = {
+        'Content-Type': 'application/json',
+        'Content-Length': str(len(body)),
+        'Connection': 'keep-alive' if keep_alive else 'close',
+        **CORS_HEADERS,
+        **(extra_headers or {}),
+    }
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    if not head:
+        writer.write(body)
+    await writer.drain()
+
+async def serve(host, port, workers, cache_size, params, timeout):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        service = PatternService(executor, cache_size, params, timeout)
+        server = await asyncio.start_server(service.handle_connection, host, port,
+                                            limit=MAX_REQUEST_BYTES)
+        addresses = ', '.join(f"http://{address[0]}:{address[1]}"
+                              for address in (sock.getsockname() for sock in server.sockets))
+        print(f"Serving patterns on {addresses}")
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve pages of canonical juggling patterns over HTTP.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='processes computing pages (default: the CPU count)')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"pages kept in the LRU cache (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds a page may take before answering 503 (default: {DEFAULT_TIMEOUT})")
+    parser.add_argument('--params', metavar='JSON',
+                        help='JSON file of template parameters of the emitted app; its throw_buttons '
+                             'and max_length limit the queries served (default: the scaffold defaults)')
+    args = parser.parse_args(argv)
+
+    try:
+        params = generate_dir.load_params(args.params)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size, params, args.timeout))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import { writable, derived, readable, get } from 'svelte/store';
+import { PatternGenerator } from '../utils/patternGenerator';
+import { admitPatterns, DEFAULT_PATTERN_BUDGET } from '../utils/patternCount';
+import type { PatternBudget } from '../utils/patternCount';
+import { PatternPages, patternServiceView } from '../utils/patternService';
+import type { KnownPattern } from '../utils/patternService';
+import type { SortConfig, SortedPatternView } from '../utils/patternRows';
+import { progressStore, toPatternData } from './progressStore';
+import { SortOrder, SortType } from '../types/types';
+
+// Pattern store backed by the pattern service: the table's rows are fetched a page
+// at a time from pattern_service.py instead of generating every pattern here, so
+// large selections stay responsive on slow devices. Counts, ranks and random
+// patterns are computed locally; they need no enumeration.
+
+// Store for selected throws
+export const selectedThrows = writable<Set<string>>(new Set());
+
+// Store for pattern length
+export const patternLength = writable<number>(3);
+
+// Limits on how many patterns one selection may show
+export const patternBudget = writable<PatternBudget>(DEFAULT_PATTERN_BUDGET);
+
+// Pattern count for the current selection, known before anything is fetched
+export const patternAdmission = derived(
+  [selectedThrows, patternLength, patternBudget],
+  ([$selectedThrows, $patternLength, $patternBudget]) =>
+    admitPatterns($selectedThrows.size, $patternLength, $patternBudget)
+);
+
+// Selected throws in the order patterns are ranked by
+function sortedSelection(): string[] {
+  return Array.from(get(selectedThrows)).sort();
+}
+
+// Uniformly random pattern from the current selection, or null when there is none
+export function samplePattern(): string | null {
+  return PatternGenerator.randomPattern(sortedSelection(), get(patternLength));
+}
+
+// Current sort config
+export const sortConfig = writable<SortConfig>({
+  sortType: SortType.Pattern,
+  sortOrder: SortOrder.Ascending
+});
+
+// Sorted pattern data with metadata. Pages are fetched as the table shows them;
+// the patterns of the selection that have progress are kept here so the progress
+// sorts can place them without fetching every page (see patternServiceView).
+export const patternDataList = readable<SortedPatternView>(
+  patternServiceView(new PatternPages([], 0, () => {}), new Map(), get(sortConfig), pattern =>
+    toPatternData(pattern, get(progressStore))
+  ),
+  set => {
+    let config = get(sortConfig);
+    let pages = new PatternPages([], 0, () => {});
+    let known = new Map<string, KnownPattern>();
+    const toRow = (pattern: string) => toPatternData(pattern, get(progressStore));
+    const publish = () => set(patternServiceView(pages, known, config, toRow));
+
+    const updateKnown = (pattern: string) => {
+      const rank = pages.rank(pattern);
+      if (rank < 0) {
+        known.delete(pattern);
+      } else {
+        known.set(pattern, { row: toRow(pattern), rank });
+      }
+    };
+
+    const buildKnown = () => {
+      known = new Map();
+      get(progressStore).toRecords().forEach(record => updateKnown(record.pattern));
+    };
+
+    const unsubscribeSelection = derived(
+      [selectedThrows, patternLength, patternAdmission],
+      values => values
+    ).subscribe(([$selectedThrows, $patternLength, $patternAdmission]) => {
+      const throws = $patternAdmission.status === 'refuse' ? [] : Array.from($selectedThrows).sort();
+      const current = new PatternPages(throws, $patternLength, () => {
+        // Pages of an earlier selection may still arrive
+        if (pages === current) {
+          publish();
+        }
+      });
+      pages = current;
+      buildKnown();
+      publish();
+    });
+
+    const unsubscribeSort = sortConfig.subscribe(newConfig => {
+      config = newConfig;
+      publish();
+    });
+
+    const stopListening = progressStore.onPatternsChanged(changedPatterns => {
+      if (changedPatterns === null) {
+        buildKnown();
+      } else {
+        changedPatterns.forEach(updateKnown);
+      }
+      publish();
+    });
+
+    return () => {
+      unsubscribeSelection();
+      unsubscribeSort();
+      stopListening();
+    };
+  }
+);
+
+// Helper functions to toggle throws
+export function toggleThrow(throwCode: string): void {
+  selectedThrows.update(throws => {
+    const newThrows = new Set(throws);
+    if (newThrows.has(throwCode)) {
+      newThrows.delete(throwCode);
+    } else {
+      newThrows.add(throwCode);
+    }
+    return newThrows;
+  });
+}
+
+// Update sort configuration
+export function updateSort(sortType: SortType): void {
+  sortConfig.update(config => {
+    if (config.sortType === sortType) {
+      // Toggle the order if the same column is clicked
+      return {
+        sortType,
+        sortOrder: config.sortOrder === SortOrder.Ascending
+          ? SortOrder.Descending
+          : SortOrder.Ascending
+      };
+    } else {
+      // New column, default to ascending
+      return {
+        sortType,
+        sortOrder: SortOrder.Ascending
+      };
+    }
+  });
+}
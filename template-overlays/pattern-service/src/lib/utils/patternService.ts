@@ -0,0 +1,247 @@
+import { PatternGenerator } from './patternGenerator';
+import { countPatterns } from './patternCount';
+import { SortOrder, SortType } from '../types/types';
+import type { PatternData } from '../types/types';
+import type { SortConfig, SortedPatternView } from './patternRows';
+
+// Base URL of the pattern service (pattern_service.py)
+export const PATTERN_SERVICE_URL = {{ pattern_service_url }};
+
+// Patterns per fetched page
+const PAGE_SIZE = 200;
+
+// Delay before a failed page is requested again, doubling per failure up to the max
+const RETRY_DELAY_MS = 1000;
+const MAX_RETRY_DELAY_MS = 30000;
+
+type PageOrder = 'asc' | 'desc';
+
+// A pattern of the selection that has progress, with its position in pattern order
+export interface KnownPattern {
+  row: PatternData;
+  rank: number;
+}
+
+const PENDING_ROW: PatternData = {
+  pattern: '',
+  maxCatches: 0,
+  dateCompleted: null,
+  isCompleted: false,
+  pending: true
+};
+
+// Row values of a pattern without progress
+const EMPTY_ROW: PatternData = { ...PENDING_ROW, pending: false };
+
+// Parse an M-D-YYYY completion date into a sortable number (NaN when missing)
+function dateKey(date: string | null): number {
+  return date === null ? NaN : new Date(date.replace(/-/g, '/')).getTime();
+}
+
+/**
+ * Pages of one selection's patterns, fetched from the pattern service on first use
+ * and kept. Each page is requested once, however often it is read while loading;
+ * a failed page is requested again after a backoff, and onLoad runs then too so the
+ * rows still showing it are read (and requested) again.
+ */
+export class PatternPages {
+  public readonly total: number;
+  private readonly pages = new Map<string, string[]>();
+  private readonly requests = new Set<string>();
+  private readonly failures = new Map<string, number>();
+
+  constructor(
+    private readonly throws: string[],
+    private readonly length: number,
+    private readonly onLoad: () => void
+  ) {
+    this.total = countPatterns(new Set(throws).size, length);
+  }
+
+  /**
+   * Pattern at a position in ascending or descending pattern order, or null while
+   * its page is loading
+   */
+  public patternAt(position: number, order: PageOrder): string | null {
+    const page = Math.floor(position / PAGE_SIZE);
+    const patterns = this.pages.get(`${order}:${page}`);
+    if (!patterns) {
+      this.request(order, page);
+      return null;
+    }
+    return patterns[position - page * PAGE_SIZE] ?? null;
+  }
+
+  /**
+   * Position of a pattern in ascending pattern order, computed locally, or -1 when
+   * it is not one of the selection's patterns
+   */
+  public rank(pattern: string): number {
+    if (!PatternGenerator.isPattern(pattern, this.throws, this.length)) {
+      return -1;
+    }
+    return PatternGenerator.rankPattern(pattern, this.throws);
+  }
+
+  private request(order: PageOrder, page: number): void {
+    const key = `${order}:${page}`;
+    if (this.requests.has(key)) {
+      return;
+    }
+    this.requests.add(key);
+
+    const params = new URLSearchParams({
+      length: String(this.length),
+      page: String(page),
+      limit: String(PAGE_SIZE),
+      order
+    });
+    this.throws.forEach(code => params.append('throws', code));
+
+    fetch(`${PATTERN_SERVICE_URL}/patterns?${params}`)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Pattern service returned ${response.status}`);
+        }
+        return response.json() as Promise<{ patterns: string[] }>;
+      })
+      .then(data => {
+        this.pages.set(key, data.patterns);
+        this.failures.delete(key);
+        this.requests.delete(key);
+        this.onLoad();
+      })
+      .catch(error => {
+        console.error('Failed to fetch patterns', error);
+        const failures = (this.failures.get(key) ?? 0) + 1;
+        this.failures.set(key, failures);
+        // The page stays requested until the retry, so reads meanwhile do not refetch
+        setTimeout(() => {
+          this.requests.delete(key);
+          this.onLoad();
+        }, Math.min(RETRY_DELAY_MS * 2 ** (failures - 1), MAX_RETRY_DELAY_MS));
+      });
+  }
+}
+
+/**
+ * Sorted view over fetched pages. Sorting by pattern reads the pages in the
+ * requested order. The other sorts only need local data: rows without progress
+ * all tie (and ties keep pattern order), so the patterns with progress that sort
+ * before or after them are placed locally and the rows in between are read from the
+ * ascending pages, skipping those patterns.
+ */
+export function patternServiceView(
+  pages: PatternPages,
+  known: ReadonlyMap<string, KnownPattern>,
+  config: SortConfig,
+  toRow: (pattern: string) => PatternData
+): SortedPatternView {
+  const total = pages.total;
+
+  if (config.sortType === SortType.Pattern) {
+    const order: PageOrder = config.sortOrder === SortOrder.Ascending ? 'asc' : 'desc';
+    return {
+      length: total,
+      slice: (start, end) => {
+        const slice: PatternData[] = [];
+        for (let position = Math.max(0, start); position < Math.min(end, total); position++) {
+          const pattern = pages.patternAt(position, order);
+          slice.push(pattern === null ? PENDING_ROW : toRow(pattern));
+        }
+        return slice;
+      },
+      indexOf: pattern => {
+        const entry = known.get(pattern);
+        const rank = entry ? entry.rank : pages.rank(pattern);
+        if (rank < 0) {
+          return -1;
+        }
+        return order === 'asc' ? rank : total - 1 - rank;
+      }
+    };
+  }
+
+  const compare = comparator(config);
+  const byRank = (a: KnownPattern, b: KnownPattern) => compare(a.row, b.row) || a.rank - b.rank;
+  const before: KnownPattern[] = [];
+  const after: KnownPattern[] = [];
+  for (const entry of known.values()) {
+    const comparison = compare(entry.row, EMPTY_ROW);
+    if (comparison < 0) {
+      before.push(entry);
+    } else if (comparison > 0) {
+      after.push(entry);
+    }
+  }
+  before.sort(byRank);
+  after.sort(byRank);
+  const skipped = [...before, ...after].map(entry => entry.rank).sort((a, b) => a - b);
+  const middle = total - before.length - after.length;
+
+  return {
+    length: total,
+    slice: (start, end) => {
+      const slice: PatternData[] = [];
+      for (let position = Math.max(0, start); position < Math.min(end, total); position++) {
+        if (position < before.length) {
+          slice.push(before[position].row);
+        } else if (position < before.length + middle) {
+          // The rank whose count of ranks not skipped up to it is the offset
+          let rank = position - before.length;
+          for (const skippedRank of skipped) {
+            if (skippedRank > rank) {
+              break;
+            }
+            rank++;
+          }
+          const pattern = pages.patternAt(rank, 'asc');
+          slice.push(pattern === null ? PENDING_ROW : toRow(pattern));
+        } else {
+          slice.push(after[position - before.length - middle].row);
+        }
+      }
+      return slice;
+    },
+    indexOf: pattern => {
+      const beforeIndex = before.findIndex(entry => entry.row.pattern === pattern);
+      if (beforeIndex >= 0) {
+        return beforeIndex;
+      }
+      const afterIndex = after.findIndex(entry => entry.row.pattern === pattern);
+      if (afterIndex >= 0) {
+        return before.length + middle + afterIndex;
+      }
+      const rank = pages.rank(pattern);
+      if (rank < 0) {
+        return -1;
+      }
+      return before.length + rank - skipped.filter(skippedRank => skippedRank < rank).length;
+    }
+  };
+}
+
+// Row order of a sort configuration, without the pattern-order tie break
+function comparator(config: SortConfig): (a: PatternData, b: PatternData) => number {
+  const direction = config.sortOrder === SortOrder.Ascending ? 1 : -1;
+
+  if (config.sortType === SortType.MaxCatches) {
+    return (a, b) => direction * (a.maxCatches - b.maxCatches);
+  }
+
+  // Dates: missing dates sort after all others when ascending
+  return (a, b) => {
+    const dateA = dateKey(a.dateCompleted);
+    const dateB = dateKey(b.dateCompleted);
+    if (isNaN(dateA) && isNaN(dateB)) {
+      return 0;
+    }
+    if (isNaN(dateA)) {
+      return direction;
+    }
+    if (isNaN(dateB)) {
+      return -direction;
+    }
+    return direction * (dateA - dateB);
+  };
+}
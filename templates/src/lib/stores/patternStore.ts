@@ -0,0 +1,150 @@
+import { writable, derived, readable, get } from 'svelte/store';
+import { PatternGenerator } from '../utils/patternGenerator';
+import { patternCatalog } from '../utils/patternCatalog';
+import type { PatternCatalog } from '../utils/patternCatalog';
+import { admitPatterns, DEFAULT_PATTERN_BUDGET } from '../utils/patternCount';
+import type { PatternBudget } from '../utils/patternCount';
+import { PatternRows, patternOrderView } from '../utils/patternRows';
+import type { SortConfig, SortedPatternView } from '../utils/patternRows';
+import { progressStore, toPatternData } from './progressStore';
+import { SortOrder, SortType } from '../types/types';
+
+// Store for selected throws
+export const selectedThrows = writable<Set<string>>(new Set());
+
+// Store for pattern length
+export const patternLength = writable<number>(3);
+
+// Limits on how many patterns one selection may generate
+export const patternBudget = writable<PatternBudget>(DEFAULT_PATTERN_BUDGET);
+
+// Pattern count for the current selection, known before anything is generated
+export const patternAdmission = derived(
+  [selectedThrows, patternLength, patternBudget],
+  ([$selectedThrows, $patternLength, $patternBudget]) =>
+    admitPatterns($selectedThrows.size, $patternLength, $patternBudget)
+);
+
+// Every pattern of a selection, sliced from the prebuilt catalog when it covers
+// the selection and generated otherwise
+function allPatterns(catalog: PatternCatalog | null, throws: string[], length: number): string[] {
+  const cataloged = catalog?.getPatterns(throws, length);
+  return cataloged ?? PatternGenerator.generatePatterns(throws, length);
+}
+
+// Selected throws in the order patterns are ranked by
+function sortedSelection(): string[] {
+  return Array.from(get(selectedThrows)).sort();
+}
+
+// Uniformly random pattern from the current selection, or null when there is none
+export function samplePattern(): string | null {
+  return PatternGenerator.randomPattern(sortedSelection(), get(patternLength));
+}
+
+// Current sort config
+export const sortConfig = writable<SortConfig>({
+  sortType: SortType.Pattern,
+  sortOrder: SortOrder.Ascending
+});
+
+// Sorted pattern data with metadata. Sorting by pattern generates only the rows
+// the table shows (see patternOrderView). The progress sorts need every row: they
+// are built the first time one is shown for a selection, and a progress update
+// then only moves the affected rows within the sort indexes (see PatternRows)
+// instead of re-sorting the whole list. Rows generated before the catalog loaded
+// are dropped when it does, and rebuilt from it when next needed. Selections over
+// the budget are refused instead of freezing the tab.
+export const patternDataList = readable<SortedPatternView>(
+  patternOrderView([], 0, SortOrder.Ascending, pattern => toPatternData(pattern, get(progressStore))),
+  set => {
+    let throws: string[] = [];
+    let length = 0;
+    let catalog: PatternCatalog | null = null;
+    let rows: PatternRows | null = null;
+    let config = get(sortConfig);
+    const toRow = (pattern: string) => toPatternData(pattern, get(progressStore));
+
+    const buildRows = (): PatternRows => {
+      const progress = get(progressStore);
+      return new PatternRows(allPatterns(catalog, throws, length).map(pattern => toPatternData(pattern, progress)));
+    };
+
+    const publish = () => {
+      if (config.sortType === SortType.Pattern) {
+        set(patternOrderView(throws, length, config.sortOrder, toRow));
+      } else {
+        rows = rows ?? buildRows();
+        set(rows.view(config));
+      }
+    };
+
+    const unsubscribeSelection = derived(
+      [selectedThrows, patternLength, patternAdmission, patternCatalog],
+      values => values
+    ).subscribe(([$selectedThrows, $patternLength, $patternAdmission, $patternCatalog]) => {
+      throws = $patternAdmission.status === 'refuse' ? [] : Array.from($selectedThrows).sort();
+      length = $patternLength;
+      catalog = $patternCatalog;
+      rows = null;
+      publish();
+    });
+    
+    const unsubscribeSort = sortConfig.subscribe(newConfig => {
+      config = newConfig;
+      publish();
+    });
+    
+    const stopListening = progressStore.onPatternsChanged(changedPatterns => {
+      // Rows not built yet read the progress when they are
+      if (rows && changedPatterns === null) {
+        rows = buildRows();
+      } else if (rows && changedPatterns) {
+        const progress = get(progressStore);
+        const current = rows;
+        changedPatterns.forEach(pattern => current.update(toPatternData(pattern, progress)));
+      }
+      publish();
+    });
+    
+    return () => {
+      unsubscribeSelection();
+      unsubscribeSort();
+      stopListening();
+    };
+  }
+);
+
+// Helper functions to toggle throws
+export function toggleThrow(throwCode: string): void {
+  selectedThrows.update(throws => {
+    const newThrows = new Set(throws);
+    if (newThrows.has(throwCode)) {
+      newThrows.delete(throwCode);
+    } else {
+      newThrows.add(throwCode);
+    }
+    return newThrows;
+  });
+}
+
+// Update sort configuration
+export function updateSort(sortType: SortType): void {
+  sortConfig.update(config => {
+    if (config.sortType === sortType) {
+      // Toggle the order if the same column is clicked
+      return {
+        sortType,
+        sortOrder: config.sortOrder === SortOrder.Ascending 
+          ? SortOrder.Descending 
+          : SortOrder.Ascending
+      };
+    } else {
+      // New column, default to ascending
+      return {
+        sortType,
+        sortOrder: SortOrder.Ascending
+      };
+    }
+  });
+}
@@ -0,0 +1,111 @@
+import { writable, get } from 'svelte/store';
+import type { PatternData } from '../types/types';
+import { ProgressModel } from '../utils/progressModel';
+import { ProgressPersistence } from '../utils/progressPersistence';
+import { ProgressTracker } from '../utils/progressTracker';
+
+// Called with the patterns whose progress changed, or null when all of it did
+export type ProgressChangeListener = (patterns: readonly string[] | null) => void;
+
+// Progress store, empty until load() reads the saved progress. The store holds a
+// ProgressModel that is updated in place, and each update queues only the records
+// of its patterns for saving.
+const createProgressStore = () => {
+  const persistence = new ProgressPersistence();
+  const { subscribe, update, set } = writable<ProgressModel>(new ProgressModel());
+  const changeListeners = new Set<ProgressChangeListener>();
+  
+  const notifyChanged = (patterns: readonly string[] | null) => {
+    changeListeners.forEach(listener => listener(patterns));
+  };
+
+  return {
+    subscribe,
+    
+    /**
+     * Listen for which patterns change, so views can update only those rows.
+     * Returns a function that stops listening.
+     */
+    onPatternsChanged: (listener: ProgressChangeListener) => {
+      changeListeners.add(listener);
+      return () => {
+        changeListeners.delete(listener);
+      };
+    },
+    
+    /**
+     * Load the saved progress (from IndexedDB, migrating localStorage progress)
+     */
+    load: async () => {
+      set(await persistence.load());
+      notifyChanged(null);
+    },
+    
+    /**
+     * Set max catches for a pattern and update completion status
+     */
+    setMaxCatches: (pattern: string, catches: number) => {
+      // A repeating pattern updates all related patterns
+      const changedPatterns = ProgressTracker.isRepeatingPattern(pattern)
+        ? ProgressTracker.getRelatedPatterns(pattern)
+        : [pattern];
+      const today = ProgressTracker.getCurrentDate();
+      
+      update(model => {
+        changedPatterns.forEach(changedPattern => {
+          model.setMaxCatches(changedPattern, catches, today);
+        });
+        
+        // Queue the changed records to be saved in the background
+        persistence.save(changedPatterns.map(changedPattern => model.toRecord(changedPattern)));
+        
+        return model;
+      });
+      
+      notifyChanged(changedPatterns);
+    },
+    
+    /**
+     * Get completion status for a pattern
+     */
+    isCompleted: (pattern: string) => {
+      return get({ subscribe }).isCompleted(pattern);
+    },
+    
+    /**
+     * Get max catches for a pattern
+     */
+    getMaxCatches: (pattern: string) => {
+      return get({ subscribe }).getMaxCatches(pattern);
+    },
+    
+    /**
+     * Get completion date for a pattern
+     */
+    getCompletionDate: (pattern: string) => {
+      return get({ subscribe }).getCompletionDate(pattern);
+    },
+    
+    /**
+     * Reset store to initial state
+     */
+    reset: () => {
+      persistence.clear();
+      set(new ProgressModel());
+      notifyChanged(null);
+    }
+  };
+};
+
+// Create and export the progress store
+export const progressStore = createProgressStore();
+
+// Pattern with its metadata from a progress snapshot
+export const toPatternData = (pattern: string, progress: ProgressModel): PatternData => {
+  return {
+    pattern,
+    maxCatches: progress.getMaxCatches(pattern),
+    dateCompleted: progress.getCompletionDate(pattern),
+    isCompleted: progress.isCompleted(pattern)
+  };
+};
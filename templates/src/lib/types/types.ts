@@ -0,0 +1,48 @@
+// Define the throw types
+export type ThrowType = {
+  code: string;
+  name: string;
+};
+
+// Progress data structure
+export interface ProgressData {
+  completedPatterns: string[];
+  maxCatches: Record<string, number>;
+  completionDates: Record<string, string>;
+}
+
+// Stored progress of one pattern (one IndexedDB record)
+export interface ProgressRecord {
+  pattern: string;
+  maxCatches: number;
+  dateCompleted: string | null;
+  completed: boolean;
+}
+
+// Pattern with metadata
+export interface PatternData {
+  pattern: string;
+  maxCatches: number;
+  dateCompleted: string | null;
+  isCompleted: boolean;
+  // Placeholder for a row whose pattern is still being fetched
+  pending?: boolean;
+}
+
+// Sort order types
+export enum SortOrder {
+  Ascending = 'ascending',
+  Descending = 'descending'
+}
+
+// Sort type for pattern table
+export enum SortType {
+  Pattern = 'pattern',
+  MaxCatches = 'maxCatches',
+  Date = 'date'
+}
+
+// Throw button definition
+export const THROW_BUTTONS: ThrowType[] = [
+{{ throw_buttons }}
+];
@@ -0,0 +1,133 @@
+import { writable } from 'svelte/store';
+
+// URL of the catalog generate_dir.py precomputes into static/
+export const PATTERN_CATALOG_URL = '/pattern-catalog.bin';
+
+interface CatalogGroup {
+  mask: number;
+  offset: number;
+  count: number;
+}
+
+/**
+ * Canonical patterns precomputed at scaffold time, stored as token ids grouped by
+ * pattern length and by the exact set of throws each pattern uses (a bitmask over
+ * the sorted throw codes). Looking up a throw selection only decodes the groups
+ * whose throws are all selected.
+ */
+export class PatternCatalog {
+  public readonly tokens: string[];
+  public readonly maxLength: number;
+  private readonly groups: CatalogGroup[][];
+  private readonly data: Uint8Array;
+
+  private constructor(tokens: string[], maxLength: number, groups: CatalogGroup[][], data: Uint8Array) {
+    this.tokens = tokens;
+    this.maxLength = maxLength;
+    this.groups = groups;
+    this.data = data;
+  }
+
+  /**
+   * Parse a catalog from its binary form
+   */
+  public static parse(buffer: ArrayBuffer): PatternCatalog {
+    const view = new DataView(buffer);
+    const bytes = new Uint8Array(buffer);
+    const magic = String.fromCharCode(...bytes.subarray(0, 4));
+
+    if (magic !== 'JLPC' || view.getUint8(4) !== 1) {
+      throw new Error('Unsupported pattern catalog');
+    }
+
+    const tokenCount = view.getUint8(5);
+    const maxLength = view.getUint8(6);
+    const decoder = new TextDecoder();
+    let position = 8;
+
+    const tokens: string[] = [];
+    for (let i = 0; i < tokenCount; i++) {
+      const length = view.getUint8(position);
+      tokens.push(decoder.decode(bytes.subarray(position + 1, position + 1 + length)));
+      position += 1 + length;
+    }
+
+    const groups: CatalogGroup[][] = [[]];
+    for (let length = 1; length <= maxLength; length++) {
+      const groupCount = view.getUint32(position, true);
+      position += 4;
+
+      const lengthGroups: CatalogGroup[] = [];
+      for (let i = 0; i < groupCount; i++) {
+        lengthGroups.push({
+          mask: view.getUint32(position, true),
+          offset: view.getUint32(position + 4, true),
+          count: view.getUint32(position + 8, true)
+        });
+        position += 12;
+      }
+      groups.push(lengthGroups);
+    }
+
+    return new PatternCatalog(tokens, maxLength, groups, bytes.subarray(position));
+  }
+
+  /**
+   * Get the sorted patterns for a throw selection, or null when the catalog does
+   * not cover it (pattern too long or a throw it does not know)
+   */
+  public getPatterns(throws: string[], length: number): string[] | null {
+    if (length <= 0 || throws.length === 0) {
+      return [];
+    }
+    if (length > this.maxLength) {
+      return null;
+    }
+
+    let selected = 0;
+    for (const code of throws) {
+      const index = this.tokens.indexOf(code);
+      if (index < 0) {
+        return null;
+      }
+      selected |= 1 << index;
+    }
+
+    const patterns: string[] = [];
+    for (const group of this.groups[length]) {
+      if ((group.mask & ~selected) !== 0) {
+        continue;
+      }
+
+      for (let i = 0; i < group.count; i++) {
+        const start = group.offset + i * length;
+        let pattern = '';
+        for (let j = start; j < start + length; j++) {
+          pattern += this.tokens[this.data[j]];
+        }
+        patterns.push(pattern);
+      }
+    }
+
+    return patterns.sort();
+  }
+}
+
+// The loaded catalog, null until loadPatternCatalog() finishes (or if it fails)
+export const patternCatalog = writable<PatternCatalog | null>(null);
+
+/**
+ * Fetch and parse the catalog once. Pattern generation falls back to
+ * PatternGenerator while it is loading or when it is missing.
+ */
+export async function loadPatternCatalog(url: string = PATTERN_CATALOG_URL): Promise<void> {
+  try {
+    const response = await fetch(url);
+    if (!response.ok) {
+      return;
+    }
+    patternCatalog.set(PatternCatalog.parse(await response.arrayBuffer()));
+  } catch (error) {
+    console.warn('Pattern catalog unavailable, generating patterns instead', error);
+  }
+}
@@ -0,0 +1,103 @@
+/**
+ * Pattern counts and admission control, computed in closed form so the result size
+ * is known before any enumeration starts. Mirrors count_patterns/estimate_cost in
+ * pattern_engine.py.
+ */
+
+// Limits on the number of patterns generated for one selection
+export interface PatternBudget {
+  warnAbove: number;
+  refuseAbove: number;
+}
+
+export const DEFAULT_PATTERN_BUDGET: PatternBudget = {
+  warnAbove: 20000,
+  refuseAbove: 200000
+};
+
+export type AdmissionStatus = 'ok' | 'warn' | 'refuse';
+
+export interface PatternAdmission {
+  count: number;
+  status: AdmissionStatus;
+}
+
+export interface PatternCost {
+  patterns: number;
+  candidates: number;
+  characters: number;
+}
+
+function eulerPhi(n: number): number {
+  let result = n;
+  for (let p = 2; p * p <= n; p++) {
+    if (n % p === 0) {
+      while (n % p === 0) {
+        n /= p;
+      }
+      result -= result / p;
+    }
+  }
+  if (n > 1) {
+    result -= result / n;
+  }
+  return result;
+}
+
+/**
+ * Number of rotation-distinct patterns of `length` throws chosen from k throw types,
+ * by Burnside's lemma: (1/n) * sum over d | n of phi(d) * k^(n/d).
+ * Exact while k^length stays below 2^53 (10 throws at length 15).
+ */
+export function countPatterns(k: number, length: number): number {
+  if (k <= 0 || length <= 0) {
+    return 0;
+  }
+
+  let total = 0;
+  for (let d = 1; d <= length; d++) {
+    if (length % d === 0) {
+      total += eulerPhi(d) * Math.pow(k, length / d);
+    }
+  }
+  return total / length;
+}
+
+/**
+ * Estimate what generating patterns for a throw selection produces: the pattern
+ * count, the candidates a brute-force generator would visit, and the characters
+ * held by the result
+ */
+export function estimatePatternCost(throws: string[], length: number): PatternCost {
+  const tokens = Array.from(new Set(throws));
+  const patterns = countPatterns(tokens.length, length);
+  const meanCodeLength = tokens.length > 0
+    ? tokens.reduce((sum, token) => sum + token.length, 0) / tokens.length
+    : 0;
+
+  return {
+    patterns,
+    candidates: tokens.length > 0 && length > 0 ? Math.pow(tokens.length, length) : 0,
+    characters: Math.round(patterns * length * meanCodeLength)
+  };
+}
+
+/**
+ * Decide whether a selection may be generated under a budget
+ */
+export function admitPatterns(
+  throwCount: number,
+  length: number,
+  budget: PatternBudget = DEFAULT_PATTERN_BUDGET
+): PatternAdmission {
+  const count = countPatterns(throwCount, length);
+  let status: AdmissionStatus = 'ok';
+
+  if (count > budget.refuseAbove) {
+    status = 'refuse';
+  } else if (count > budget.warnAbove) {
+    status = 'warn';
+  }
+
+  return { count, status };
+}
@@ -0,0 +1,116 @@
+import { describe, it, expect } from 'vitest';
+import { PatternGenerator } from './patternGenerator';
+import { countPatterns } from './patternCount';
+
+// Codes include a multi-character one and are given unsorted, so token order and
+// character order differ
+const CODES = ['S', 'Od', 'D', 'O'];
+
+const CASES: [number, number][] = [];
+for (let k = 1; k <= 4; k++) {
+  for (let n = 1; n <= 7 && k ** n <= 4096; n++) {
+    CASES.push([k, n]);
+  }
+}
+
+function compareIndices(a: number[], b: number[]): number {
+  for (let i = 0; i < a.length; i++) {
+    if (a[i] !== b[i]) {
+      return a[i] - b[i];
+    }
+  }
+  return 0;
+}
+
+/**
+ * Every pattern in necklace order, by enumerating all k^n token sequences and
+ * keeping the smallest rotation of each
+ */
+function bruteForce(k: number, n: number): string[] {
+  const necklaces = new Map<string, number[]>();
+  const sequence = new Array<number>(n).fill(0);
+
+  for (let i = 0; i < k ** n; i++) {
+    let value = i;
+    for (let position = n - 1; position >= 0; position--) {
+      sequence[position] = value % k;
+      value = Math.floor(value / k);
+    }
+    let smallest = sequence.slice();
+    for (let shift = 1; shift < n; shift++) {
+      const rotation = [...sequence.slice(shift), ...sequence.slice(0, shift)];
+      if (compareIndices(rotation, smallest) < 0) {
+        smallest = rotation;
+      }
+    }
+    necklaces.set(smallest.join(','), smallest);
+  }
+
+  return Array.from(necklaces.values())
+    .sort(compareIndices)
+    .map(indices => PatternGenerator.joinTokens(indices, CODES.slice(0, k)));
+}
+
+describe('PatternGenerator against brute force', () => {
+  it('counts the patterns', () => {
+    for (const [k, n] of CASES) {
+      expect(countPatterns(k, n)).toBe(bruteForce(k, n).length);
+    }
+  });
+
+  it('ranks and unranks every pattern', () => {
+    for (const [k, n] of CASES) {
+      const throws = CODES.slice(0, k);
+      bruteForce(k, n).forEach((pattern, rank) => {
+        expect(PatternGenerator.unrankPattern(rank, throws, n)).toBe(pattern);
+        expect(PatternGenerator.rankPattern(pattern, throws)).toBe(rank);
+        expect(PatternGenerator.isPattern(pattern, throws, n)).toBe(true);
+      });
+    }
+  });
+
+  it('rejects patterns that are not canonical', () => {
+    expect(() => PatternGenerator.rankPattern('DS', ['S', 'D'])).toThrow();
+    expect(PatternGenerator.isPattern('DS', ['S', 'D'], 2)).toBe(false);
+    expect(PatternGenerator.isPattern('SD', ['S', 'D'], 3)).toBe(false);
+  });
+
+  it('pages by cursor', () => {
+    for (const [k, n] of CASES) {
+      for (const limit of [1, 3, 7]) {
+        const patterns: string[] = [];
+        let cursor: string | null = null;
+        do {
+          const page = PatternGenerator.generatePage(CODES.slice(0, k), n, cursor, limit);
+          expect(page.patterns.length).toBeLessThanOrEqual(limit);
+          patterns.push(...page.patterns);
+          cursor = page.next;
+        } while (cursor !== null);
+        expect(patterns).toEqual(bruteForce(k, n));
+      }
+    }
+  });
+
+  it('pages by start rank', () => {
+    for (const [k, n] of CASES) {
+      const expected = bruteForce(k, n);
+      for (const limit of [1, 3, 7]) {
+        for (let start = 0; start < expected.length + limit; start += limit) {
+          const page = PatternGenerator.generatePage(CODES.slice(0, k), n, null, limit, start);
+          expect(page.patterns).toEqual(expected.slice(start, start + limit));
+          expect(page.next).toBe(start + limit < expected.length ? page.patterns[limit - 1] : null);
+        }
+      }
+    }
+  });
+
+  it('returns an empty page for limit <= 0', () => {
+    expect(PatternGenerator.generatePage(CODES, 3, null, 0)).toEqual({ patterns: [], next: null });
+  });
+
+  it('sorts generatePatterns by string', () => {
+    for (const [k, n] of CASES) {
+      expect(PatternGenerator.generatePatterns(CODES.slice(0, k), n)).toEqual(bruteForce(k, n).sort());
+    }
+  });
+});
@@ -0,0 +1,373 @@
+import { countPatterns } from './patternCount';
+
+// One page of patterns and the cursor to resume after it (null after the last page)
+export interface PatternPage {
+  patterns: string[];
+  next: string | null;
+}
+
+/**
+ * Generates all unique juggling patterns from a set of throws with a given length.
+ *
+ * Patterns are sequences of throw tokens, and rotations of a pattern are the same
+ * pattern, so the canonical patterns are the necklaces over the selected throws:
+ * the smallest rotation of each class in the order the throws are given. They are
+ * enumerated directly over token indices (so codes like 'Od' are never split)
+ * instead of building and deduplicating every string.
+ */
+export class PatternGenerator {
+  /**
+   * Generate patterns from selected throws and desired length
+   * @param throws - Array of selected throw types
+   * @param length - Number of throws in each pattern
+   * @returns Array of unique patterns, sorted
+   */
+  public static generatePatterns(throws: string[], length: number): string[] {
+    const tokens = Array.from(new Set(throws));
+
+    if (tokens.length === 0 || length <= 0) {
+      return [];
+    }
+
+    const patterns: string[] = [];
+    const indices = new Array<number>(length).fill(0);
+
+    do {
+      patterns.push(this.joinTokens(indices, tokens));
+    } while (this.nextNecklace(indices, tokens.length));
+
+    return patterns.sort();
+  }
+
+  /**
+   * Generate one page of patterns in necklace order, resuming after the pattern
+   * `after` (the previous page's cursor) or from the rank `start`, so page N can be
+   * fetched with start = N * limit without generating the pages before it. Only the
+   * patterns of the page are generated. Necklace order compares token by token, so
+   * with the throws sorted it matches the string order of generatePatterns when no
+   * code is a prefix of another, and for the default codes (Od extends O with d,
+   * which sorts after every code's first character), but not for every code set:
+   * with O, Od and z, Oz comes before OdOd here and after it by string.
+   * @param throws - Array of selected throw types
+   * @param length - Number of throws in each pattern
+   * @param after - Last pattern of the previous page, or null to start at `start`
+   * @param limit - Maximum number of patterns in the page
+   * @param start - Rank of the first pattern when there is no cursor
+   */
+  public static generatePage(
+    throws: string[],
+    length: number,
+    after: string | null = null,
+    limit: number = 100,
+    start: number = 0
+  ): PatternPage {
+    const tokens = Array.from(new Set(throws));
+
+    if (tokens.length === 0 || length <= 0 || limit <= 0) {
+      return { patterns: [], next: null };
+    }
+
+    let indices: number[];
+    if (after === null) {
+      if (start >= countPatterns(tokens.length, length)) {
+        return { patterns: [], next: null };
+      }
+      indices = start > 0
+        ? this.unrankIndices(start, tokens.length, length)
+        : new Array<number>(length).fill(0);
+    } else {
+      indices = this.parseCursor(after, tokens, length);
+      if (!this.nextNecklace(indices, tokens.length)) {
+        return { patterns: [], next: null };
+      }
+    }
+
+    const patterns = [this.joinTokens(indices, tokens)];
+    let hasMore = this.nextNecklace(indices, tokens.length);
+
+    while (hasMore && patterns.length < limit) {
+      patterns.push(this.joinTokens(indices, tokens));
+      hasMore = this.nextNecklace(indices, tokens.length);
+    }
+
+    return { patterns, next: hasMore ? patterns[patterns.length - 1] : null };
+  }
+
+  /**
+   * Position of a canonical pattern in necklace order (the order of generatePage),
+   * computed without enumerating the patterns before it
+   */
+  public static rankPattern(pattern: string, throws: string[]): number {
+    const tokens = Array.from(new Set(throws));
+    const indices = this.tokenize(pattern, tokens);
+    if (!this.isNecklace(indices)) {
+      throw new Error(`${pattern} is not a canonical pattern`);
+    }
+    return this.countLess(indices, tokens.length);
+  }
+
+  /**
+   * Whether a pattern is one of the canonical patterns of `length` throws drawn
+   * from `throws`
+   */
+  public static isPattern(pattern: string, throws: string[], length: number): boolean {
+    try {
+      const indices = this.tokenize(pattern, Array.from(new Set(throws)));
+      return indices.length === length && this.isNecklace(indices);
+    } catch {
+      return false;
+    }
+  }
+
+  /**
+   * Canonical pattern at a position in necklace order
+   */
+  public static unrankPattern(rank: number, throws: string[], length: number): string {
+    const tokens = Array.from(new Set(throws));
+    return this.joinTokens(this.unrankIndices(rank, tokens.length, length), tokens);
+  }
+
+  /**
+   * Uniformly random canonical pattern, or null when there are none
+   */
+  public static randomPattern(
+    throws: string[],
+    length: number,
+    random: () => number = Math.random
+  ): string | null {
+    const count = countPatterns(new Set(throws).size, length);
+    if (count === 0) {
+      return null;
+    }
+    return this.unrankPattern(Math.floor(random() * count), throws, length);
+  }
+
+  /**
+   * Build the pattern at a rank token by token: each position takes the largest
+   * token that still leaves at most `rank` patterns before it
+   */
+  private static unrankIndices(rank: number, k: number, length: number): number[] {
+    if (!(rank >= 0 && rank < countPatterns(k, length))) {
+      throw new RangeError(`Pattern rank ${rank} out of range`);
+    }
+
+    const indices: number[] = [];
+    for (let position = 0; position < length; position++) {
+      for (let token = k - 1; token >= 0; token--) {
+        const candidate = [...indices, token, ...new Array<number>(length - position - 1).fill(0)];
+        if (this.countLess(candidate, k) <= rank) {
+          indices.push(token);
+          break;
+        }
+      }
+    }
+    return indices;
+  }
+
+  /**
+   * Number of canonical patterns strictly smaller than the token indices alpha
+   */
+  private static countLess(alpha: number[], k: number): number {
+    const smallerOrEqual = countPatterns(k, alpha.length) - this.countGreater(alpha, k);
+    return smallerOrEqual - (this.isNecklace(alpha) ? 1 : 0);
+  }
+
+  /**
+   * Number of canonical patterns strictly greater than alpha. A pattern is greater
+   * exactly when every rotation is, which by Burnside/Mobius reduces to counting
+   * closed walks in an automaton tracking the live matches of alpha's prefixes
+   * (see count_greater in pattern_engine.py).
+   */
+  private static countGreater(alpha: number[], k: number): number {
+    const n = alpha.length;
+    const transitions = this.beatAutomaton(alpha, k);
+    const walks = new Map<number, number>();
+
+    for (let t = 1; t <= n; t++) {
+      if (n % t === 0) {
+        walks.set(t, this.countClosedWalks(transitions, t));
+      }
+    }
+
+    let total = 0;
+    for (const t of walks.keys()) {
+      let primitive = 0;
+      for (const s of walks.keys()) {
+        if (t % s === 0) {
+          primitive += mobius(t / s) * walks.get(s)!;
+        }
+      }
+      total += primitive / t;
+    }
+    return total;
+  }
+
+  /**
+   * transitions[state][token]: next longest live match length, or -1 when reading
+   * the token makes some rotation fall below or equal alpha
+   */
+  private static beatAutomaton(alpha: number[], k: number): number[][] {
+    const n = alpha.length;
+    const borders = new Array<number>(n).fill(0);
+    for (let i = 1; i < n; i++) {
+      let b = borders[i - 1];
+      while (b > 0 && alpha[i] !== alpha[b]) {
+        b = borders[b - 1];
+      }
+      borders[i] = alpha[i] === alpha[b] ? b + 1 : b;
+    }
+
+    const transitions: number[][] = [];
+    for (let state = 0; state < n; state++) {
+      const row: number[] = [];
+      for (let token = 0; token < k; token++) {
+        let following: number | null = null;
+        let match = state;
+        while (true) {
+          if (token < alpha[match]) {
+            following = -1;
+            break;
+          }
+          if (token === alpha[match] && following === null) {
+            following = match + 1;
+          }
+          if (match === 0) {
+            break;
+          }
+          match = borders[match - 1];
+        }
+        row.push(following === null ? 0 : following === n ? -1 : following);
+      }
+      transitions.push(row);
+    }
+    return transitions;
+  }
+
+  private static countClosedWalks(transitions: number[][], length: number): number {
+    const states = transitions.length;
+    let total = 0;
+
+    for (let start = 0; start < states; start++) {
+      let counts = new Array<number>(states).fill(0);
+      counts[start] = 1;
+      for (let step = 0; step < length; step++) {
+        const following = new Array<number>(states).fill(0);
+        counts.forEach((count, state) => {
+          if (count > 0) {
+            for (const target of transitions[state]) {
+              if (target >= 0) {
+                following[target] += count;
+              }
+            }
+          }
+        });
+        counts = following;
+      }
+      total += counts[start];
+    }
+    return total;
+  }
+
+  /**
+   * Split a pattern into token indices, matching the longest throw code first
+   */
+  public static tokenize(pattern: string, tokens: string[]): number[] {
+    const byLength = tokens
+      .map((_, index) => index)
+      .sort((a, b) => tokens[b].length - tokens[a].length);
+    const indices: number[] = [];
+    let position = 0;
+
+    while (position < pattern.length) {
+      const index = byLength.find(i => pattern.startsWith(tokens[i], position));
+      if (index === undefined) {
+        throw new Error(`Pattern ${pattern} contains a throw outside ${tokens.join(', ')}`);
+      }
+      indices.push(index);
+      position += tokens[index].length;
+    }
+
+    return indices;
+  }
+
+  /**
+   * Check whether token indices are the smallest rotation of their pattern
+   */
+  public static isNecklace(indices: number[]): boolean {
+    let period = 1;
+    for (let i = 1; i < indices.length; i++) {
+      if (indices[i] < indices[i - period]) {
+        return false;
+      }
+      if (indices[i] > indices[i - period]) {
+        period = i + 1;
+      }
+    }
+    return indices.length % period === 0;
+  }
+
+  /**
+   * Parse a cursor into token indices, checking it is a canonical pattern
+   */
+  private static parseCursor(cursor: string, tokens: string[], length: number): number[] {
+    const indices = this.tokenize(cursor, tokens);
+    if (indices.length !== length || !this.isNecklace(indices)) {
+      throw new Error(`${cursor} is not a canonical pattern of length ${length}`);
+    }
+    return indices;
+  }
+
+  /**
+   * Advance a token index array in place to the next necklace over k tokens
+   * (FKM algorithm, amortized constant time per necklace)
+   * @returns false once the array held the last necklace
+   */
+  public static nextNecklace(indices: number[], k: number): boolean {
+    const n = indices.length;
+
+    while (true) {
+      let i = n - 1;
+      while (i >= 0 && indices[i] === k - 1) {
+        i--;
+      }
+      if (i < 0) {
+        return false;
+      }
+
+      indices[i]++;
+      for (let j = i + 1; j < n; j++) {
+        indices[j] = indices[j - i - 1];
+      }
+
+      // The prenecklace is a necklace when its Lyndon prefix length divides n
+      if (n % (i + 1) === 0) {
+        return true;
+      }
+    }
+  }
+
+  /**
+   * Join token indices into a pattern string
+   */
+  public static joinTokens(indices: number[], tokens: string[]): string {
+    let pattern = '';
+    for (const index of indices) {
+      pattern += tokens[index];
+    }
+    return pattern;
+  }
+}
+
+function mobius(n: number): number {
+  let result = 1;
+  for (let p = 2; p * p <= n; p++) {
+    if (n % p === 0) {
+      n /= p;
+      if (n % p === 0) {
+        return 0;
+      }
+      result = -result;
+    }
+  }
+  return n > 1 ? -result : result;
+}
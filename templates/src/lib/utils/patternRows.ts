@@ -0,0 +1,167 @@
+import { SortIndex } from './sortIndex';
+import { PatternGenerator } from './patternGenerator';
+import { countPatterns } from './patternCount';
+import { SortOrder, SortType } from '../types/types';
+import type { PatternData } from '../types/types';
+
+export interface SortConfig {
+  sortType: SortType;
+  sortOrder: SortOrder;
+}
+
+/**
+ * Read-only, sorted view of the pattern rows handed to the table
+ */
+export interface SortedPatternView {
+  readonly length: number;
+  slice(start: number, end: number): PatternData[];
+  indexOf(pattern: string): number;
+}
+
+// Parse an M-D-YYYY completion date into a sortable number (NaN when missing)
+function dateKey(date: string | null): number {
+  return date === null ? NaN : new Date(date.replace(/-/g, '/')).getTime();
+}
+
+/**
+ * Sorted view of a selection in pattern order that generates only the rows asked
+ * for: a slice unranks its first pattern and steps through the rest, and indexOf
+ * ranks the pattern, so no other pattern of the selection is generated. `throws`
+ * must be sorted; the order is necklace order (see PatternGenerator.generatePage),
+ * which can differ from the string order of generatePatterns for custom codes.
+ */
+export function patternOrderView(
+  throws: string[],
+  length: number,
+  order: SortOrder,
+  toRow: (pattern: string) => PatternData
+): SortedPatternView {
+  const count = countPatterns(throws.length, length);
+  const ascending = order === SortOrder.Ascending;
+
+  return {
+    length: count,
+    slice: (start, end) => {
+      const first = Math.max(0, start);
+      const last = Math.min(end, count);
+      if (first >= last) {
+        return [];
+      }
+      // A descending slice is the matching ascending range, reversed
+      const rank = ascending ? first : count - last;
+      const { patterns } = PatternGenerator.generatePage(throws, length, null, last - first, rank);
+      if (!ascending) {
+        patterns.reverse();
+      }
+      return patterns.map(toRow);
+    },
+    indexOf: pattern => {
+      if (!PatternGenerator.isPattern(pattern, throws, length)) {
+        return -1;
+      }
+      const rank = PatternGenerator.rankPattern(pattern, throws);
+      return ascending ? rank : count - 1 - rank;
+    }
+  };
+}
+
+/**
+ * The rows of the generated patterns plus a sort index per progress sort (sorting
+ * by pattern needs no rows, see patternOrderView). The MaxCatches and Date indexes
+ * are built the first time they are viewed and then kept up to date, so a progress
+ * change moves only that row, in O(log n). Ties keep the generated order in both
+ * directions.
+ */
+export class PatternRows {
+  private readonly rows: PatternData[];
+  private readonly ids = new Map<string, number>();
+  private readonly dateKeys: Float64Array;
+  private readonly indexes = new Map<string, SortIndex>();
+
+  constructor(rows: PatternData[]) {
+    this.rows = rows;
+    this.dateKeys = new Float64Array(rows.length);
+    rows.forEach((row, id) => {
+      this.ids.set(row.pattern, id);
+      this.dateKeys[id] = dateKey(row.dateCompleted);
+    });
+  }
+
+  public get length(): number {
+    return this.rows.length;
+  }
+
+  /**
+   * Replace the row of a pattern, moving it in every index built so far
+   */
+  public update(row: PatternData): void {
+    const id = this.ids.get(row.pattern);
+    if (id === undefined) {
+      return;
+    }
+
+    // Indexes compare the stored row, so take it out before changing it
+    for (const index of this.indexes.values()) {
+      index.remove(id);
+    }
+    this.rows[id] = row;
+    this.dateKeys[id] = dateKey(row.dateCompleted);
+    for (const index of this.indexes.values()) {
+      index.insert(id);
+    }
+  }
+
+  /**
+   * Sorted view for a progress sort configuration (MaxCatches or Date)
+   */
+  public view(config: SortConfig): SortedPatternView {
+    const rows = this.rows;
+    const ids = this.ids;
+    const index = this.index(config);
+    return {
+      length: rows.length,
+      slice: (start, end) => index.slice(start, end).map(id => rows[id]),
+      indexOf: pattern => {
+        const id = ids.get(pattern);
+        return id === undefined ? -1 : index.indexOf(id);
+      }
+    };
+  }
+
+  private index(config: SortConfig): SortIndex {
+    const key = `${config.sortType}:${config.sortOrder}`;
+    let index = this.indexes.get(key);
+
+    if (!index) {
+      index = SortIndex.build(this.rows.length, this.comparator(config));
+      this.indexes.set(key, index);
+    }
+    return index;
+  }
+
+  private comparator(config: SortConfig): (a: number, b: number) => number {
+    const direction = config.sortOrder === SortOrder.Ascending ? 1 : -1;
+
+    if (config.sortType === SortType.MaxCatches) {
+      return (a, b) => direction * (this.rows[a].maxCatches - this.rows[b].maxCatches) || a - b;
+    }
+
+    // Dates: missing dates sort after all others when ascending
+    return (a, b) => {
+      const dateA = this.dateKeys[a];
+      const dateB = this.dateKeys[b];
+      let comparison = 0;
+
+      if (isNaN(dateA) && isNaN(dateB)) {
+        comparison = 0;
+      } else if (isNaN(dateA)) {
+        comparison = 1;
+      } else if (isNaN(dateB)) {
+        comparison = -1;
+      } else {
+        comparison = dateA - dateB;
+      }
+      return direction * comparison || a - b;
+    };
+  }
+}
@@ -0,0 +1,147 @@
+import type { ProgressData, ProgressRecord } from '../types/types';
+
+// Max catches at which a pattern counts as completed
+export const COMPLETION_CATCHES = {{ completion_catches }};
+
+/**
+ * In-memory progress, backed by a Set and Maps so reading or updating one pattern
+ * costs the same however many patterns are logged. It converts to and from the
+ * ProgressData JSON shape that is stored.
+ */
+export class ProgressModel {
+  private readonly completed: Set<string>;
+  private readonly maxCatches: Map<string, number>;
+  private readonly completionDates: Map<string, string>;
+
+  constructor(
+    completed: Iterable<string> = [],
+    maxCatches: Iterable<[string, number]> = [],
+    completionDates: Iterable<[string, string]> = []
+  ) {
+    this.completed = new Set(completed);
+    this.maxCatches = new Map(maxCatches);
+    this.completionDates = new Map(completionDates);
+  }
+
+  /**
+   * Build the model from stored data. A pattern is completed when it is listed or
+   * its max catches reach the completion threshold.
+   */
+  public static fromJSON(data: Partial<ProgressData>): ProgressModel {
+    const model = new ProgressModel(
+      data.completedPatterns ?? [],
+      Object.entries(data.maxCatches ?? {}),
+      Object.entries(data.completionDates ?? {})
+    );
+
+    for (const [pattern, catches] of model.maxCatches) {
+      if (catches >= COMPLETION_CATCHES) {
+        model.completed.add(pattern);
+      }
+    }
+    return model;
+  }
+
+  /**
+   * Stored form of the progress (JSON.stringify uses this too)
+   */
+  public toJSON(): ProgressData {
+    return {
+      completedPatterns: Array.from(this.completed),
+      maxCatches: Object.fromEntries(this.maxCatches),
+      completionDates: Object.fromEntries(this.completionDates)
+    };
+  }
+
+  /**
+   * Build the model from per-pattern records
+   */
+  public static fromRecords(records: Iterable<ProgressRecord>): ProgressModel {
+    const model = new ProgressModel();
+    for (const record of records) {
+      model.applyRecord(record);
+    }
+    return model;
+  }
+
+  /**
+   * Stored record of one pattern
+   */
+  public toRecord(pattern: string): ProgressRecord {
+    return {
+      pattern,
+      maxCatches: this.getMaxCatches(pattern),
+      dateCompleted: this.getCompletionDate(pattern),
+      completed: this.isCompleted(pattern)
+    };
+  }
+
+  /**
+   * Records of every pattern with any progress
+   */
+  public toRecords(): ProgressRecord[] {
+    const patterns = new Set([
+      ...this.maxCatches.keys(),
+      ...this.completed,
+      ...this.completionDates.keys()
+    ]);
+    return Array.from(patterns, pattern => this.toRecord(pattern));
+  }
+
+  /**
+   * Replace the progress of one pattern with a stored record
+   */
+  public applyRecord(record: ProgressRecord): void {
+    this.maxCatches.set(record.pattern, record.maxCatches);
+
+    if (record.completed) {
+      this.completed.add(record.pattern);
+    } else {
+      this.completed.delete(record.pattern);
+    }
+
+    if (record.dateCompleted) {
+      this.completionDates.set(record.pattern, record.dateCompleted);
+    } else {
+      this.completionDates.delete(record.pattern);
+    }
+  }
+
+  public get size(): number {
+    return this.maxCatches.size;
+  }
+
+  public getMaxCatches(pattern: string): number {
+    return this.maxCatches.get(pattern) || 0;
+  }
+
+  public getCompletionDate(pattern: string): string | null {
+    return this.completionDates.get(pattern) || null;
+  }
+
+  public isCompleted(pattern: string): boolean {
+    return this.completed.has(pattern);
+  }
+
+  /**
+   * Set max catches for one pattern and update its completion status
+   * @param today - Completion date to record if the pattern becomes completed
+   */
+  public setMaxCatches(pattern: string, catches: number, today: string): void {
+    this.maxCatches.set(pattern, catches);
+
+    if (catches >= COMPLETION_CATCHES) {
+      this.completed.add(pattern);
+      // Keep the date of the first completion
+      if (!this.completionDates.has(pattern)) {
+        this.completionDates.set(pattern, today);
+      }
+    } else {
+      this.completed.delete(pattern);
+      // Remove completion date if catches is 0
+      if (catches === 0) {
+        this.completionDates.delete(pattern);
+      }
+    }
+  }
+}
@@ -0,0 +1,215 @@
+import type { ProgressRecord } from '../types/types';
+import { ProgressModel } from './progressModel';
+import { ProgressTracker } from './progressTracker';
+
+const DATABASE_NAME = 'juggleLog';
+const DATABASE_VERSION = 1;
+const STORE_NAME = 'progress';
+
+// How long to wait for more updates before writing them
+const WRITE_DELAY_MS = 300;
+
+function requestResult<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function transactionDone(transaction: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve();
+    transaction.onerror = () => reject(transaction.error);
+    transaction.onabort = () => reject(transaction.error);
+  });
+}
+
+function openDatabase(): Promise<IDBDatabase> {
+  if (typeof indexedDB === 'undefined') {
+    return Promise.reject(new Error('IndexedDB is not available'));
+  }
+
+  const request = indexedDB.open(DATABASE_NAME, DATABASE_VERSION);
+  request.onupgradeneeded = () => {
+    request.result.createObjectStore(STORE_NAME, { keyPath: 'pattern' });
+  };
+  return requestResult(request);
+}
+
+// Progress saved to localStorage by earlier versions, or null when there is none
+// or it cannot be read (corrupt data is treated as no saved progress)
+function loadLegacyModel(): ProgressModel | null {
+  try {
+    const legacy = ProgressTracker.loadLegacyProgress();
+    return legacy ? ProgressModel.fromJSON(legacy) : null;
+  } catch (error) {
+    console.warn('Ignoring unreadable progress in localStorage', error);
+    return null;
+  }
+}
+
+/**
+ * Saves progress as one IndexedDB record per pattern. Updates are queued and
+ * coalesced per pattern, then written together in a single transaction once
+ * updates pause (or the page is hidden), so logging a catch count never
+ * serializes the whole progress on the main thread.
+ *
+ * Progress saved to localStorage by earlier versions is migrated on load. When
+ * IndexedDB is unavailable, the whole progress is saved to localStorage instead.
+ */
+export class ProgressPersistence {
+  private database: IDBDatabase | null = null;
+  private fallback: ProgressModel | null = null;
+  private readonly pending = new Map<string, ProgressRecord>();
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  // Writes run one after another so they land in the order they were queued
+  private writes: Promise<void> = Promise.resolve();
+  private loaded = false;
+  // clear() ran before load() finished, so the saved progress must not be restored
+  private clearOnLoad = false;
+
+  /**
+   * Open the database, migrate any localStorage progress into it and read the
+   * saved progress
+   */
+  public async load(): Promise<ProgressModel> {
+    const legacy = loadLegacyModel();
+    let records: ProgressRecord[];
+
+    try {
+      this.database = await openDatabase();
+      records = await this.readAll();
+
+      if (legacy) {
+        // Records already present win: the migration ran but the cleanup did not
+        if (records.length === 0) {
+          records = legacy.toRecords();
+          await this.write(records);
+        }
+        ProgressTracker.clearLegacyProgress();
+      }
+    } catch (error) {
+      console.warn('IndexedDB unavailable, saving progress to localStorage', error);
+      this.database = null;
+      this.fallback = legacy ?? ProgressModel.fromJSON({});
+      records = this.fallback.toRecords();
+    }
+
+    if (this.clearOnLoad) {
+      this.clearOnLoad = false;
+      await this.enqueue(() => this.clearSaved()).catch(error => {
+        console.error('Failed to clear progress', error);
+      });
+      records = [];
+    }
+    this.loaded = true;
+
+    if (typeof document !== 'undefined') {
+      document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') {
+          this.flush();
+        }
+      });
+    }
+
+    // Updates queued while loading are newer than the saved progress
+    const model = ProgressModel.fromRecords(records);
+    this.pending.forEach(record => model.applyRecord(record));
+    this.flush();
+    return model;
+  }
+
+  /**
+   * Queue records to be saved. A later record for the same pattern replaces one
+   * that has not been written yet.
+   */
+  public save(records: ProgressRecord[]): void {
+    records.forEach(record => this.pending.set(record.pattern, record));
+
+    if (this.timer !== null) {
+      clearTimeout(this.timer);
+    }
+    this.timer = setTimeout(() => this.flush(), WRITE_DELAY_MS);
+  }
+
+  /**
+   * Write the queued records now
+   */
+  public flush(): Promise<void> {
+    if (this.timer !== null) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    // Until load() opens the database, updates stay queued
+    if (this.pending.size === 0 || (!this.database && !this.fallback)) {
+      return this.writes;
+    }
+
+    const batch = Array.from(this.pending.values());
+    this.pending.clear();
+    return this.enqueue(() => this.write(batch)).catch(error => {
+      console.error('Failed to save progress', error);
+      // Queue the batch again unless newer records replaced it meanwhile
+      batch.forEach(record => {
+        if (!this.pending.has(record.pattern)) {
+          this.pending.set(record.pattern, record);
+        }
+      });
+    });
+  }
+
+  /**
+   * Delete all saved progress, dropping queued records. Before load() finishes,
+   * the clear is queued like updates are and load() runs it instead of restoring
+   * the saved progress.
+   */
+  public clear(): Promise<void> {
+    if (this.timer !== null) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    this.pending.clear();
+
+    if (!this.loaded) {
+      this.clearOnLoad = true;
+      return this.writes;
+    }
+    return this.enqueue(() => this.clearSaved());
+  }
+
+  private enqueue(task: () => Promise<void>): Promise<void> {
+    const run = this.writes.then(task);
+    // Later writes still run after a failed one
+    this.writes = run.catch(() => undefined);
+    return run;
+  }
+
+  private async clearSaved(): Promise<void> {
+    if (this.database) {
+      const transaction = this.database.transaction(STORE_NAME, 'readwrite');
+      transaction.objectStore(STORE_NAME).clear();
+      await transactionDone(transaction);
+    } else if (this.fallback) {
+      this.fallback = new ProgressModel();
+      ProgressTracker.saveLegacyProgress(this.fallback.toJSON());
+    }
+  }
+
+  private async readAll(): Promise<ProgressRecord[]> {
+    const transaction = this.database!.transaction(STORE_NAME, 'readonly');
+    return requestResult(transaction.objectStore(STORE_NAME).getAll() as IDBRequest<ProgressRecord[]>);
+  }
+
+  private async write(records: ProgressRecord[]): Promise<void> {
+    if (!this.database) {
+      records.forEach(record => this.fallback!.applyRecord(record));
+      ProgressTracker.saveLegacyProgress(this.fallback!.toJSON());
+      return;
+    }
+
+    const transaction = this.database.transaction(STORE_NAME, 'readwrite');
+    const store = transaction.objectStore(STORE_NAME);
+    records.forEach(record => store.put(record));
+    await transactionDone(transaction);
+  }
+}
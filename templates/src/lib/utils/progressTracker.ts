@@ -0,0 +1,147 @@
+import type { ProgressData } from '../types/types';
+import { THROW_BUTTONS } from '../types/types';
+
+// Splits a pattern into throw codes, longest code first; any other character is a
+// token of its own
+const TOKEN_PATTERN = new RegExp(
+  THROW_BUTTONS.map(button => button.code)
+    .sort((a, b) => b.length - a.length)
+    .map(code => code.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'))
+    .concat('[\\s\\S]')
+    .join('|'),
+  'gu'
+);
+
+// Shortest run of throws whose repetition gives a pattern, and how many times it repeats
+export interface RepeatingBase {
+  base: string;
+  repetitions: number;
+}
+
+export class ProgressTracker {
+  private static readonly MAX_PATTERN_LENGTH = 6;
+  private static readonly LEGACY_STORAGE_KEY = 'juggleLogProgress';
+  private static readonly CACHE_LIMIT = 10000;
+  
+  // Memoized repeating bases by pattern, and related patterns by base
+  private static readonly baseCache = new Map<string, RepeatingBase>();
+  private static readonly relatedCache = new Map<string, string[]>();
+  
+  /**
+   * Find the repeating base of a pattern, working on throw codes so 'OdOdOd' is
+   * 'Od' three times. The last prefix-function border b gives the smallest period
+   * n - b, which divides n exactly when the pattern is a repetition, so this is
+   * linear in the pattern length. Results are cached per pattern.
+   */
+  public static getRepeatingBase(pattern: string): RepeatingBase {
+    let repeatingBase = this.baseCache.get(pattern);
+    
+    if (!repeatingBase) {
+      repeatingBase = this.computeRepeatingBase(pattern);
+      if (this.baseCache.size >= this.CACHE_LIMIT) {
+        this.baseCache.clear();
+      }
+      this.baseCache.set(pattern, repeatingBase);
+    }
+    return repeatingBase;
+  }
+  
+  /**
+   * Extract the repeating base of a pattern
+   * For example:
+   * - 'OdOdOd' returns 'Od'
+   * - 'DDD' returns 'D'
+   */
+  public static extractRepeatingBase(pattern: string): string {
+    return this.getRepeatingBase(pattern).base;
+  }
+  
+  /**
+   * Check if a pattern consists of repeating substrings
+   */
+  public static isRepeatingPattern(pattern: string): boolean {
+    return this.getRepeatingBase(pattern).repetitions > 1;
+  }
+  
+  /**
+   * Get all related patterns with the same base sequence (shared from the cache,
+   * so do not modify the array)
+   */
+  public static getRelatedPatterns(pattern: string): readonly string[] {
+    const base = this.extractRepeatingBase(pattern);
+    let relatedPatterns = this.relatedCache.get(base);
+    
+    if (!relatedPatterns) {
+      relatedPatterns = [];
+      for (let length = 1; length <= this.MAX_PATTERN_LENGTH; length++) {
+        relatedPatterns.push(base.repeat(length));
+      }
+      if (this.relatedCache.size >= this.CACHE_LIMIT) {
+        this.relatedCache.clear();
+      }
+      this.relatedCache.set(base, relatedPatterns);
+    }
+    
+    return relatedPatterns;
+  }
+  
+  private static computeRepeatingBase(pattern: string): RepeatingBase {
+    const tokens = pattern.match(TOKEN_PATTERN) ?? [];
+    const n = tokens.length;
+    
+    if (n === 0) {
+      return { base: pattern, repetitions: 1 };
+    }
+    
+    // borders[i]: length of the longest proper prefix of tokens[0..i] that is also its suffix
+    const borders = new Array<number>(n).fill(0);
+    for (let i = 1; i < n; i++) {
+      let b = borders[i - 1];
+      while (b > 0 && tokens[i] !== tokens[b]) {
+        b = borders[b - 1];
+      }
+      borders[i] = tokens[i] === tokens[b] ? b + 1 : b;
+    }
+    
+    const period = n - borders[n - 1];
+    if (n % period !== 0) {
+      return { base: pattern, repetitions: 1 };
+    }
+    return { base: tokens.slice(0, period).join(''), repetitions: n / period };
+  }
+  
+  /**
+   * Format the current date in M-D-YYYY format
+   */
+  public static getCurrentDate(): string {
+    const now = new Date();
+    const month = (now.getMonth() + 1).toString();
+    const day = now.getDate().toString();
+    const year = now.getFullYear().toString();
+    
+    return `${month}-${day}-${year}`;
+  }
+  
+  /**
+   * Load progress saved to local storage by earlier versions, or null if there is
+   * none. Progress is now kept in IndexedDB; this is only read to migrate it.
+   */
+  public static loadLegacyProgress(): ProgressData | null {
+    const storedData = localStorage.getItem(this.LEGACY_STORAGE_KEY);
+    return storedData ? JSON.parse(storedData) as ProgressData : null;
+  }
+  
+  /**
+   * Save progress to local storage, only used when IndexedDB is unavailable
+   */
+  public static saveLegacyProgress(data: ProgressData): void {
+    localStorage.setItem(this.LEGACY_STORAGE_KEY, JSON.stringify(data));
+  }
+  
+  /**
+   * Remove the local storage progress once it has been migrated
+   */
+  public static clearLegacyProgress(): void {
+    localStorage.removeItem(this.LEGACY_STORAGE_KEY);
+  }
+}
@@ -0,0 +1,94 @@
+import { describe, it, expect } from 'vitest';
+import { SortIndex } from './sortIndex';
+
+// Small deterministic generator so a failing sequence can be replayed
+function seededRandom(seed: number): () => number {
+  return () => {
+    seed = (seed * 48271) % 2147483647;
+    return (seed - 1) / 2147483646;
+  };
+}
+
+/**
+ * Random inserts, removes and re-ranks (remove, change the key, insert again) on an
+ * index, checking it against Array.prototype.sort of the items it holds after
+ * every operation. Keys come from a small range so ties are frequent; ties break
+ * on the item, as PatternRows' comparators do.
+ */
+function checkRandomOperations(seed: number, capacity: number, direction: 1 | -1, built: boolean): void {
+  const random = seededRandom(seed);
+  const keys = Array.from({ length: capacity }, () => Math.floor(random() * 5));
+  const compare = (a: number, b: number) => direction * (keys[a] - keys[b]) || a - b;
+
+  const present = new Set<number>();
+  let index: SortIndex;
+  if (built) {
+    index = SortIndex.build(capacity, compare);
+    for (let item = 0; item < capacity; item++) {
+      present.add(item);
+    }
+  } else {
+    index = new SortIndex(capacity, compare);
+  }
+
+  for (let step = 0; step < 300; step++) {
+    const item = Math.floor(random() * capacity);
+    const operation = random();
+    if (!present.has(item)) {
+      index.insert(item);
+      present.add(item);
+    } else if (operation < 0.4) {
+      index.remove(item);
+      present.delete(item);
+    } else {
+      index.remove(item);
+      keys[item] = Math.floor(random() * 5);
+      index.insert(item);
+    }
+
+    const expected = Array.from(present).sort(compare);
+    expect(index.size).toBe(expected.length);
+    expect(index.slice(0, expected.length)).toEqual(expected);
+    expected.forEach((expectedItem, position) => {
+      expect(index.at(position)).toBe(expectedItem);
+      expect(index.indexOf(expectedItem)).toBe(position);
+    });
+  }
+}
+
+describe('SortIndex', () => {
+  it('matches Array.prototype.sort over random operations', () => {
+    for (let seed = 1; seed <= 20; seed++) {
+      checkRandomOperations(seed, 40, 1, false);
+      checkRandomOperations(seed, 40, -1, false);
+    }
+  });
+
+  it('matches Array.prototype.sort after build', () => {
+    for (let seed = 1; seed <= 20; seed++) {
+      checkRandomOperations(seed, 40, 1, true);
+      checkRandomOperations(seed, 40, -1, true);
+    }
+  });
+
+  it('keeps ties in item order in both directions', () => {
+    const keys = [2, 1, 2, 1, 2, 1];
+    const ascending = SortIndex.build(keys.length, (a, b) => keys[a] - keys[b] || a - b);
+    const descending = SortIndex.build(keys.length, (a, b) => keys[b] - keys[a] || a - b);
+    expect(ascending.slice(0, keys.length)).toEqual([1, 3, 5, 0, 2, 4]);
+    expect(descending.slice(0, keys.length)).toEqual([0, 2, 4, 1, 3, 5]);
+  });
+
+  it('clamps slices and rejects positions out of range', () => {
+    const index = SortIndex.build(3, (a, b) => a - b);
+    expect(index.slice(-2, 10)).toEqual([0, 1, 2]);
+    expect(index.slice(2, 1)).toEqual([]);
+    expect(() => index.at(3)).toThrow();
+  });
+
+  it('handles an empty index', () => {
+    const index = SortIndex.build(0, (a, b) => a - b);
+    expect(index.size).toBe(0);
+    expect(index.slice(0, 10)).toEqual([]);
+  });
+});
@@ -0,0 +1,193 @@
+/**
+ * Order-statistic index over the items 0..n-1 (row ids), kept sorted by a
+ * comparator. It is a treap whose nodes are the item ids themselves, so inserting
+ * or removing one item, finding the item at a position and finding the position of
+ * an item all take O(log n) expected time.
+ *
+ * The comparator must be a total order (break ties on the id) and must not change
+ * for an item while it is in the index: remove it, change it, insert it again.
+ */
+export class SortIndex {
+  private readonly compare: (a: number, b: number) => number;
+  private readonly left: Int32Array;
+  private readonly right: Int32Array;
+  private readonly sizes: Int32Array;
+  private readonly priorities: Float64Array;
+  private root = -1;
+
+  constructor(capacity: number, compare: (a: number, b: number) => number) {
+    this.compare = compare;
+    this.left = new Int32Array(capacity).fill(-1);
+    this.right = new Int32Array(capacity).fill(-1);
+    this.sizes = new Int32Array(capacity);
+    this.priorities = new Float64Array(capacity);
+    for (let i = 0; i < capacity; i++) {
+      this.priorities[i] = Math.random();
+    }
+  }
+
+  /**
+   * Build an index holding all items 0..capacity-1 in O(n log n)
+   */
+  public static build(capacity: number, compare: (a: number, b: number) => number): SortIndex {
+    const index = new SortIndex(capacity, compare);
+    const order = Array.from({ length: capacity }, (_, i) => i).sort(compare);
+
+    // Cartesian tree over the sorted items: a stack holds the right spine
+    const spine: number[] = [];
+    for (const item of order) {
+      let last = -1;
+      while (spine.length > 0 && index.priorities[spine[spine.length - 1]] < index.priorities[item]) {
+        last = spine.pop()!;
+        index.resize(last);
+      }
+      index.left[item] = last;
+      if (spine.length > 0) {
+        index.right[spine[spine.length - 1]] = item;
+      }
+      spine.push(item);
+    }
+
+    // The bottom of the spine has the highest priority and becomes the root
+    index.root = spine.length > 0 ? spine[0] : -1;
+    while (spine.length > 0) {
+      index.resize(spine.pop()!);
+    }
+    return index;
+  }
+
+  public get size(): number {
+    return this.sizeOf(this.root);
+  }
+
+  /**
+   * Add an item (not currently in the index)
+   */
+  public insert(item: number): void {
+    this.left[item] = -1;
+    this.right[item] = -1;
+    this.sizes[item] = 1;
+    const [lower, upper] = this.split(this.root, item);
+    this.root = this.merge(this.merge(lower, item), upper);
+  }
+
+  /**
+   * Remove an item that is in the index
+   */
+  public remove(item: number): void {
+    const [lower, upper] = this.split(this.root, item);
+    const [, rest] = this.splitFirst(upper);
+    this.root = this.merge(lower, rest);
+  }
+
+  /**
+   * Item at a position (0-based) in sorted order
+   */
+  public at(position: number): number {
+    let node = this.root;
+    while (node >= 0) {
+      const leftSize = this.sizeOf(this.left[node]);
+      if (position < leftSize) {
+        node = this.left[node];
+      } else if (position === leftSize) {
+        return node;
+      } else {
+        position -= leftSize + 1;
+        node = this.right[node];
+      }
+    }
+    throw new RangeError(`Position ${position} out of range`);
+  }
+
+  /**
+   * Position of an item that is in the index
+   */
+  public indexOf(item: number): number {
+    let node = this.root;
+    let position = 0;
+    while (node >= 0) {
+      const comparison = this.compare(item, node);
+      if (comparison === 0) {
+        return position + this.sizeOf(this.left[node]);
+      }
+      if (comparison < 0) {
+        node = this.left[node];
+      } else {
+        position += this.sizeOf(this.left[node]) + 1;
+        node = this.right[node];
+      }
+    }
+    return -1;
+  }
+
+  /**
+   * Items at positions start..end-1, in order
+   */
+  public slice(start: number, end: number): number[] {
+    const items: number[] = [];
+    end = Math.min(end, this.size);
+    for (let position = Math.max(0, start); position < end; position++) {
+      items.push(this.at(position));
+    }
+    return items;
+  }
+
+  private sizeOf(node: number): number {
+    return node < 0 ? 0 : this.sizes[node];
+  }
+
+  private resize(node: number): void {
+    this.sizes[node] = 1 + this.sizeOf(this.left[node]) + this.sizeOf(this.right[node]);
+  }
+
+  // Split into the nodes ordered before `item` and the rest
+  private split(node: number, item: number): [number, number] {
+    if (node < 0) {
+      return [-1, -1];
+    }
+    if (this.compare(node, item) < 0) {
+      const [lower, upper] = this.split(this.right[node], item);
+      this.right[node] = lower;
+      this.resize(node);
+      return [node, upper];
+    }
+    const [lower, upper] = this.split(this.left[node], item);
+    this.left[node] = upper;
+    this.resize(node);
+    return [lower, node];
+  }
+
+  // Split off the first node of a tree
+  private splitFirst(node: number): [number, number] {
+    if (node < 0) {
+      return [-1, -1];
+    }
+    if (this.left[node] < 0) {
+      const rest = this.right[node];
+      this.right[node] = -1;
+      this.resize(node);
+      return [node, rest];
+    }
+    const [first, rest] = this.splitFirst(this.left[node]);
+    this.left[node] = rest;
+    this.resize(node);
+    return [first, node];
+  }
+
+  private merge(lower: number, upper: number): number {
+    if (lower < 0) {
+      return upper;
+    }
+    if (upper < 0) {
+      return lower;
+    }
+    if (this.priorities[lower] > this.priorities[upper]) {
+      this.right[lower] = this.merge(this.right[lower], upper);
+      this.resize(lower);
+      return lower;
+    }
+    this.left[upper] = this.merge(lower, this.left[upper]);
+    this.resize(upper);
+    return upper;
+  }
+}
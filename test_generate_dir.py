@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+import generate_dir
+
+# Emit the project with one extra template file and directory, then drop them and
+# re-emit staged: the swapped-in tree must keep what the scaffold never owned and
+# lose what the previous emit owned.
+
+def plain_structure():
+    def plain(tree):
+        return {name: plain(value) if isinstance(value, generate_dir.Mapping) else value
+                for name, value in tree.items()}
+    templates = generate_dir.load_templates()
+    return plain(generate_dir.build_project_structure(
+        templates, generate_dir.DEFAULT_CATALOG_MAX_LENGTH, generate_dir.load_params()))
+
+def test_staged_emit_carries_over_only_unowned_entries(tmp_path):
+    base_path = str(tmp_path / 'project')
+    structure = plain_structure()
+    structure['src']['removed.ts'] = 'export {};'
+    structure['removed-dir'] = {'owned.ts': 'export {};'}
+    generate_dir.create_structure_staged(base_path, structure)
+
+    def path(rel_path):
+        return os.path.join(base_path, *rel_path.split('/'))
+
+    with open(path('notes.txt'), 'w') as f:
+        f.write('hand-added')
+    with open(path('src/mine.ts'), 'w') as f:
+        f.write('hand-added')
+    with open(path('removed-dir/mine.txt'), 'w') as f:
+        f.write('hand-added')
+    os.makedirs(path('node_modules/svelte'))
+    with open(path('node_modules/svelte/package.json'), 'w') as f:
+        f.write('{}')
+
+    del structure['src']['removed.ts']
+    del structure['removed-dir']
+    generate_dir.create_structure_staged(base_path, structure)
+
+    for rel_path in ('notes.txt', 'src/mine.ts', 'removed-dir/mine.txt', 'node_modules/svelte/package.json'):
+        assert os.path.exists(path(rel_path)), rel_path
+    for rel_path in ('src/removed.ts', 'removed-dir/owned.ts'):
+        assert not os.path.exists(path(rel_path)), rel_path
+    assert os.listdir(path('removed-dir')) == ['mine.txt']
+
+    manifest = generate_dir.load_manifest(base_path)
+    assert 'src/removed.ts' not in manifest
+    assert {rel_path: record['hash'] for rel_path, record in manifest.items()} == {
+        rel_path: generate_dir.content_hash(data)
+        for rel_path, data in generate_dir.flatten_structure(structure).items()}
+    assert not [name for name in os.listdir(tmp_path) if name != 'project']
+
+def test_staged_emit_drops_a_directory_it_fully_owned(tmp_path):
+    base_path = str(tmp_path / 'project')
+    structure = plain_structure()
+    structure['removed-dir'] = {'nested': {'owned.ts': 'export {};'}}
+    generate_dir.create_structure_staged(base_path, structure)
+
+    del structure['removed-dir']
+    generate_dir.create_structure_staged(base_path, structure)
+    assert not os.path.exists(os.path.join(base_path, 'removed-dir'))
+
+# A hand edit that keeps the file's size is still caught by its mtime
+def test_incremental_emit_rewrites_same_size_edits(tmp_path):
+    base_path = str(tmp_path / 'project')
+    structure = plain_structure()
+    generate_dir.create_structure(base_path, structure)
+    path = os.path.join(base_path, 'package.json')
+    with open(path, 'rb') as f:
+        original = f.read()
+    with open(path, 'wb') as f:
+        f.write(original.upper())
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+
+    stats = generate_dir.create_structure(base_path, structure, incremental=True)
+    assert (stats['changed'], stats['unchanged']) == (1, len(generate_dir.flatten_structure(structure)) - 1)
+    with open(path, 'rb') as f:
+        assert f.read() == original
+    stats = generate_dir.create_structure(base_path, structure, incremental=True)
+    assert stats['changed'] == 0
+
+# Building an overlay's pack writes it (through a temporary file) inside the
+# watched overlays directory; only a change to the sources is a change
+@pytest.mark.parametrize('watcher_class', [generate_dir.InotifyWatcher, generate_dir.PollingWatcher])
+def test_watchers_ignore_overlay_packs(tmp_path, watcher_class):
+    overlay_dir = tmp_path / 'overlay'
+    overlay_dir.mkdir()
+    (overlay_dir / 'page.ts').write_text('export {};')
+    try:
+        watcher = watcher_class([str(tmp_path)])
+    except OSError as e:
+        pytest.skip(str(e))
+    try:
+        generate_dir.build_template_pack(str(overlay_dir), generate_dir.pack_path_for(str(overlay_dir)))
+        assert os.path.exists(tmp_path / 'overlay.pack')
+        assert not watcher.wait(0.2)
+
+        (overlay_dir / 'page.ts').write_text('export const changed = true;')
+        assert watcher.wait(2)
+    finally:
+        watcher.close()
+
+# Files too small to compress and manifest entries carried over from other
+# directories are neither compressed nor up to date
+def test_precompress_counts_only_current_siblings_as_up_to_date(tmp_path):
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'static').mkdir()
+    (tmp_path / 'build' / 'app.js').write_text('const x = 1;\n' * 100)
+    (tmp_path / 'build' / 'tiny.js').write_text('x')
+    (tmp_path / 'static' / 'data.json').write_text('[' + '1, ' * 200 + '1]')
+
+    manifest = generate_dir.precompress_assets(str(tmp_path), ['build', 'static'], workers=1)
+    assert (manifest['compressed'], manifest['up_to_date']) == (2, 0)
+
+    manifest = generate_dir.precompress_assets(str(tmp_path), ['build'], workers=1)
+    assert (manifest['compressed'], manifest['up_to_date']) == (0, 1)
+    assert set(manifest['files']) == {'build/app.js', 'static/data.json'}
@@ -0,0 +1,127 @@
+import io
+import json
+import os
+
+import pytest
+
+import merge_progress
+
+# The streaming tokenizer is checked against json.loads with chunks as small as one
+# character, so every string, escape, number and literal is split across chunk
+# boundaries somewhere; the merge rules are checked end to end through main().
+
+CHUNK_SIZES = [1, 2, 3, 7, merge_progress.CHUNK_SIZE]
+
+DOCUMENTS = [
+    '{}',
+    '[]',
+    '{"completedPatterns": ["SS", "SD"], "maxCatches": {"SS": 100, "SD": 3}}',
+    '{"a": "quote \\" backslash \\\\ slash \\/ tab \\t newline \\n"}',
+    '{"unicode": "caf\\u00e9 \\ud83d\\ude00 é", "empty": ""}',
+    '{"numbers": [0, -1, 12.5, -0.25, 1e3, 2E-2, 123456789012345678901234567890]}',
+    '{"literals": [true, false, null], "nested": {"a": [{"b": []}, [[]]]}}',
+    ' \n\t{ "spaced" :\t[ 1 ,\n 2 ] }\n ',
+]
+
+# The events iter_json_events yields for a parsed JSON value
+def events_of(value):
+    if isinstance(value, dict):
+        yield 'start', '{'
+        for key, item in value.items():
+            yield 'key', key
+            yield from events_of(item)
+        yield 'end', '}'
+    elif isinstance(value, list):
+        yield 'start', '['
+        for item in value:
+            yield from events_of(item)
+        yield 'end', ']'
+    else:
+        yield 'value', value
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_iter_json_events_matches_json(document, chunk_size):
+    events = list(merge_progress.iter_json_events(io.StringIO(document), chunk_size=chunk_size))
+    assert events == list(events_of(json.loads(document)))
+
+@pytest.mark.parametrize('document', [
+    '{"a": [1, 2}',
+    '{"a": tru}',
+    '{"a": "unterminated',
+    '{"a": "bad escape \\x"}',
+    '{"a": 01}',
+    '{"a": [1, 2]',
+])
+@pytest.mark.parametrize('chunk_size', [1, merge_progress.CHUNK_SIZE])
+def test_iter_json_events_rejects_malformed(document, chunk_size):
+    with pytest.raises(ValueError):
+        list(merge_progress.iter_json_events(io.StringIO(document), chunk_size=chunk_size))
+
+def test_iter_progress_entries_skips_unknown_and_invalid():
+    document = json.dumps({
+        'version': {'nested': [1, {'completedPatterns': ['X']}]},
+        'completedPatterns': ['SS', 3, {'no': 'pattern'}, 'SD'],
+        'maxCatches': {'SS': 12, 'SD': 'many', 'DD': [1], 'LL': True},
+        'completionDates': {'SS': '1-2-2024', 'SD': '', 'DD': None},
+    })
+    entries = list(merge_progress.iter_progress_entries(io.StringIO(document)))
+    assert entries == [
+        ('completed', 'SS', None),
+        ('completed', 'SD', None),
+        ('catches', 'SS', 12),
+        ('date', 'SS', '1-2-2024'),
+    ]
+
+def test_iter_progress_entries_requires_an_object():
+    with pytest.raises(ValueError):
+        list(merge_progress.iter_progress_entries(io.StringIO('["SS"]')))
+
+def run_merge(tmp_path, documents, *options):
+    paths = []
+    for i, document in enumerate(documents):
+        path = tmp_path / f"input{i}.json"
+        path.write_text(json.dumps(document), encoding='utf-8')
+        paths.append(str(path))
+    output = tmp_path / 'merged.json'
+    merge_progress.main([*paths, '-o', str(output), *options])
+    return json.loads(output.read_text(encoding='utf-8'))
+
+def test_merge_keeps_highest_catches_and_earliest_date(tmp_path):
+    merged = run_merge(tmp_path, [
+        {'maxCatches': {'SS': 5, 'SD': 40}, 'completionDates': {'SS': '3-1-2024', 'SD': 'someday'}},
+        {'maxCatches': {'SS': 12, 'SD': 7}, 'completionDates': {'SS': '12-31-2023', 'DD': '1-1-2020'}},
+        {'completionDates': {'SD': '2-2-2022', 'SS': '1-1-2025'}},
+    ])
+    assert merged['maxCatches'] == {'SD': 40, 'SS': 12}
+    assert merged['completionDates'] == {'DD': '1-1-2020', 'SD': '2-2-2022', 'SS': '12-31-2023'}
+
+def test_merge_keeps_an_unparseable_date_over_none(tmp_path):
+    merged = run_merge(tmp_path, [{'completionDates': {'SS': 'someday'}}, {'maxCatches': {'SS': 1}}])
+    assert merged['completionDates'] == {'SS': 'someday'}
+
+def test_merge_compacts_completed_patterns(tmp_path):
+    documents = [
+        {'completedPatterns': ['SS', 'SD'], 'maxCatches': {'SS': 100, 'DD': 0}},
+        {'completedPatterns': ['LL', 'SD'], 'maxCatches': {'LL': 30}},
+    ]
+    merged = run_merge(tmp_path, documents)
+    # SS is completed by its catches already; zero catches are the default
+    assert merged['completedPatterns'] == ['LL', 'SD']
+    assert merged['maxCatches'] == {'LL': 30, 'SS': 100}
+
+    merged = run_merge(tmp_path, documents, '--completion-catches', '20')
+    assert merged['completedPatterns'] == ['SD']
+
+def test_main_reports_malformed_input(tmp_path, capsys):
+    good = tmp_path / 'good.json'
+    good.write_text('{"maxCatches": {"SS": 3}}', encoding='utf-8')
+    bad = tmp_path / 'bad.json'
+    bad.write_text('{"maxCatches": {"SS": tru}}', encoding='utf-8')
+    output = tmp_path / 'merged.json'
+
+    with pytest.raises(SystemExit) as exit_info:
+        merge_progress.main([str(good), str(bad), '-o', str(output)])
+    assert exit_info.value.code == 2
+    assert f"{bad}: Unexpected" in capsys.readouterr().err
+    assert not os.path.exists(output)
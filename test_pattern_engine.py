@@ -0,0 +1,83 @@
+from itertools import product
+
+import pytest
+
+import pattern_engine
+
+# Brute-force checks of pattern_engine's counting, rank/unrank and paging: every
+# sequence of tokens is enumerated, reduced to its smallest rotation, and the
+# distinct results sorted by token index give the necklace order the engine
+# computes without enumeration. Codes include a multi-character one and are given
+# unsorted, so token order and character order differ.
+
+CODES = ['S', 'Od', 'D', 'O']
+CASES = [(k, n) for k in range(1, 5) for n in range(1, 8) if k ** n <= 4096]
+
+def brute_force(k, n):
+    necklaces = {min(seq[i:] + seq[:i] for i in range(n)) for seq in product(range(k), repeat=n)}
+    return [pattern_engine.join_tokens(necklace, CODES[:k]) for necklace in sorted(necklaces)]
+
+@pytest.mark.parametrize('k, n', CASES)
+def test_count_patterns(k, n):
+    assert pattern_engine.count_patterns(k, n) == len(brute_force(k, n))
+
+@pytest.mark.parametrize('k, n', CASES)
+def test_rank_and_unrank(k, n):
+    throws = CODES[:k]
+    for rank, pattern in enumerate(brute_force(k, n)):
+        assert pattern_engine.unrank_pattern(rank, throws, n) == pattern
+        assert pattern_engine.rank_pattern(pattern, throws) == rank
+
+def test_unrank_out_of_range():
+    with pytest.raises(IndexError):
+        pattern_engine.unrank_pattern(pattern_engine.count_patterns(2, 3), CODES[:2], 3)
+    with pytest.raises(IndexError):
+        pattern_engine.unrank_pattern(-1, CODES[:2], 3)
+
+def test_rank_rejects_non_canonical():
+    with pytest.raises(ValueError):
+        pattern_engine.rank_pattern('DS', ['S', 'D'])
+
+@pytest.mark.parametrize('k, n', CASES)
+@pytest.mark.parametrize('limit', [1, 3, 7])
+def test_generate_page_cursor(k, n, limit):
+    patterns = []
+    cursor = None
+    while True:
+        page, cursor = pattern_engine.generate_page(CODES[:k], n, after=cursor, limit=limit)
+        patterns.extend(page)
+        assert len(page) <= limit
+        if cursor is None:
+            break
+        assert cursor == page[-1]
+    assert patterns == brute_force(k, n)
+
+@pytest.mark.parametrize('k, n', CASES)
+@pytest.mark.parametrize('limit', [1, 3, 7])
+def test_generate_page_start(k, n, limit):
+    expected = brute_force(k, n)
+    for start in range(0, len(expected) + limit, limit):
+        page, cursor = pattern_engine.generate_page(CODES[:k], n, start=start, limit=limit)
+        assert page == expected[start:start + limit]
+        assert cursor == (page[-1] if start + limit < len(expected) else None)
+
+def test_generate_page_empty_limit():
+    assert pattern_engine.generate_page(CODES, 3, limit=0) == ([], None)
+
+@pytest.mark.parametrize('k, n', CASES)
+def test_generate_patterns_sorts_by_string(k, n):
+    assert pattern_engine.generate_patterns(CODES[:k], n) == sorted(brute_force(k, n))
+
+# Necklace order and string order agree for the app's default codes (see
+# iter_patterns), so the table's pattern sort matches generate_patterns and the
+# catalog; codes such as O, Od and z do not
+@pytest.mark.parametrize('length', range(1, 5))
+def test_default_codes_necklace_order_is_string_order(length):
+    throws = sorted(pattern_engine.THROW_CODES)
+    assert list(pattern_engine.iter_patterns(throws, length)) == pattern_engine.generate_patterns(throws, length)
+
+def test_prefix_codes_necklace_order_can_differ():
+    throws = sorted(['O', 'Od', 'z'])
+    patterns = list(pattern_engine.iter_patterns(throws, 2))
+    assert patterns.index('Oz') < patterns.index('OdOd')
+    assert patterns != pattern_engine.generate_patterns(throws, 2)